@@ -0,0 +1,96 @@
+r"""End-to-end benchmark of ``main.py get`` against a local mock LeetCode site.
+
+Usage::
+
+    python benchmark.py [-n <problems>] [-c <contests>] [-l <language>]... [--example-size <n>] [--repeat <r>]
+
+Each run downloads all contests from the mock site (without using the cache) and generates projects in every language.
+The benchmark reports the wall time of each run, the peak memory of the largest process (``main.py`` or the browser),
+and the time spent in the browser, which is taken from the phase trace written by ``main.py --trace``.
+"""
+import argparse
+import http.cookiejar
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import lchelper
+
+BROWSER_SPANS = {"browser.start", "browser.get", "check_login", "find_statement"}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark `main.py get` against a local mock LeetCode site")
+    parser.add_argument("-n", "--problems", type=int, default=4, help="Number of problems in each contest")
+    parser.add_argument("-c", "--contests", type=int, default=1, help="Number of contests")
+    parser.add_argument("-l", "--lang", dest="lang", action="append", choices=list(lchelper.LANGUAGES.keys()),
+                        help="Languages to generate code for (default: all)")
+    parser.add_argument("--example-size", type=int, default=10, help="Length of arrays in the examples")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of runs")
+    parser.add_argument("-j", "--jobs", type=int, default=2, help="Number of contests downloaded concurrently")
+    return parser.parse_args()
+
+
+def write_cookie(path: str, domain: str) -> None:
+    jar = http.cookiejar.LWPCookieJar()
+    jar.set_cookie(http.cookiejar.Cookie(
+        version=0, name="LEETCODE_SESSION", value="mock", port=None, port_specified=False, domain=domain,
+        domain_specified=True, domain_initial_dot=False, path="/", path_specified=True, secure=False, expires=None,
+        discard=False, comment=None, comment_url=None, rest={}))
+    jar.save(path, ignore_discard=True, ignore_expires=True)
+
+
+def main():
+    args = parse_args()
+    langs = args.lang or list(lchelper.LANGUAGES.keys())
+    contests = {f"weekly-contest-{idx + 1}": lchelper.make_mock_problems(args.problems, args.example_size, seed=idx)
+                for idx in range(args.contests)}
+    main_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+
+    with lchelper.MockLeetCodeSite(contests) as site, tempfile.TemporaryDirectory() as work_dir:
+        os.makedirs(os.path.join(work_dir, "cookies"))
+        write_cookie(os.path.join(work_dir, "cookies", "benchmark@leetcode.dat"), site.host)
+        env = os.environ.copy()
+        env["LCHELPER_SITE_URL"] = site.url
+        trace_path = os.path.join(work_dir, "trace.json")
+        command = [sys.executable, main_path, "--log-level", "warning", "--trace", trace_path,
+                   "get", "--no-cache", "-j", str(args.jobs), "-o", os.path.join(work_dir, "projects")]
+        for lang in langs:
+            command += ["-l", lang]
+        command.append(f"weekly-contest-1..{args.contests}")
+
+        print(f"Benchmarking {args.contests} contest(s) x {args.problems} problem(s) x {len(langs)} language(s), "
+              f"{args.repeat} run(s)")
+        print(f"{'Run':>3}  {'Wall':>8}  {'Browser':>8}  {'Peak RSS':>9}")
+        wall_times = []
+        for run in range(args.repeat):
+            start_time = time.perf_counter()
+            proc = subprocess.Popen(command, cwd=work_dir, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                    universal_newlines=True)
+            output = proc.stdout.read()
+            proc.stdout.close()
+            # Resources used by this run alone, i.e. by `main.py` and the processes it waited for, such as the browser.
+            _, status, rusage = os.wait4(proc.pid, 0)
+            proc.returncode = -os.WTERMSIG(status) if os.WIFSIGNALED(status) else os.WEXITSTATUS(status)
+            wall_time = time.perf_counter() - start_time
+            if proc.returncode != 0:
+                print(output)
+                raise RuntimeError(f"`main.py get` failed with return code {proc.returncode}")
+            with open(trace_path) as f:
+                spans = json.load(f)
+            browser_time = sum(span["duration"] for span in spans if span["name"] in BROWSER_SPANS)
+            # Maximum resident set size of these processes, in KB on Linux (bytes on macOS). Linux carries the peak of
+            # this process over into `main.py`, so it is never below the peak of the benchmark itself.
+            peak_rss = rusage.ru_maxrss
+            if sys.platform == "darwin":
+                peak_rss //= 1024
+            wall_times.append(wall_time)
+            print(f"{run + 1:>3}  {wall_time:>7.2f}s  {browser_time:>7.2f}s  {peak_rss / 1024:>6.1f} MB")
+        print(f"Best wall time: {min(wall_times):.2f}s, mean: {sum(wall_times) / len(wall_times):.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+r"""Throughput benchmark of the serializers that write example values as literals in generated code.
+
+Usage::
+
+    python benchmark_literals.py [-n <size>] [--repeat <r>]
+
+For each shape of example value, the benchmark reports the size of the C++ literal, and the throughput (in MB of
+output per second) of the C++ and Python serializers. The throughput of ``json.dumps``, which is implemented in C, is
+listed for reference.
+"""
+import argparse
+import json
+import random
+import time
+
+from lchelper.codegen.literals import cpp_literal, python_literal
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the literal serializers of the code generators")
+    parser.add_argument("-n", "--size", type=int, default=100000, help="Number of scalar values in each example value")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of runs; the best run is reported")
+    return parser.parse_args()
+
+
+def make_values(n: int):
+    rand = random.Random(0)
+    side = int(n ** 0.5)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    deep = 0
+    for _ in range(min(n, 100000)):
+        deep = [deep]
+    return [
+        ("flat array", [rand.randint(-10 ** 9, 10 ** 9) for _ in range(n)], "vector<int>&"),
+        ("grid", [[rand.randint(0, 100) for _ in range(side)] for _ in range(side)], "vector<vector<int>>&"),
+        ("char grid", [[rand.choice(letters) for _ in range(side)] for _ in range(side)], "vector<vector<char>>&"),
+        ("strings", ["".join(rand.choice(letters) for _ in range(10)) for _ in range(n // 10)], "vector<string>&"),
+        ("booleans", [rand.random() < 0.5 for _ in range(n)], "vector<bool>&"),
+        ("tree", [rand.randint(0, 100) if rand.random() < 0.8 else None for _ in range(n)], "TreeNode*"),
+        ("deep nesting", deep, None),
+    ]
+
+
+def throughput(fn, value, type_name, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        literal = fn(value, type_name)
+        best = min(best, time.perf_counter() - start_time)
+    return len(literal), len(literal) / best / 1e6
+
+
+def main():
+    args = parse_args()
+    print(f"{'Shape':<13}  {'Size':>10}  {'C++':>10}  {'Python':>10}  {'json':>10}")
+    for name, value, type_name in make_values(args.size):
+        size, cpp_speed = throughput(cpp_literal, value, type_name, args.repeat)
+        _, python_speed = throughput(python_literal, value, type_name, args.repeat)
+        try:
+            _, json_speed = throughput(lambda value, _: json.dumps(value), value, None, args.repeat)
+            json_column = f"{json_speed:>5.1f} MB/s"
+        except RecursionError:
+            json_column = "   n/a"
+        print(f"{name:<13}  {size / 1e6:>7.2f} MB  {cpp_speed:>5.1f} MB/s  {python_speed:>5.1f} MB/s  "
+              f"{json_column:>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,37 @@
-from .codegen import *
+import importlib
+from typing import Any, List
+
 from .common import *
-from .crawler import *
 from .logging import *
-from .parser import *
+from .runner import *
+from .tracing import *
 from . import utils
+
+# Modules that depend on heavy packages are imported on first use (PEP 562), so that commands that do not need them
+# start quickly. For instance, `get` does not import Selenium when all contests are cached. Each list must match the
+# `__all__` of its module.
+_LAZY_MODULES = {
+    ".codegen": ["create_codegen", "LANGUAGES", "ARCHIVE_FORMATS", "iter_project_files", "write_archive",
+                 "project_archive"],
+    ".compile_server": ["CompileResponse", "CompileServer", "serve_compile_requests"],
+    ".complexity": ["ComplexityEstimate", "parse_benchmark", "estimate_complexity"],
+    ".daemon": ["DEFAULT_SOCKET_PATH", "daemon_available", "serve_daemon", "forward_to_daemon", "stop_daemon"],
+    ".crawler": ["get_users", "get_cookie_path", "update_cookie", "get_problem", "get_problems", "BrowserPool"],
+    ".mock_site": ["make_mock_problems", "MockLeetCodeSite"],
+    ".parser": ["parse_problem"],
+    ".watch": ["watched_files", "watch_project"],
+}
+_LAZY_ATTRIBUTES = {name: module for module, names in _LAZY_MODULES.items() for name in names}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value  # later accesses do not go through `__getattr__`
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
@@ -1,18 +1,128 @@
-from .base import CodeGen
-from .cpp import CppCodeGen
-from .python import PythonCodeGen
+import importlib
+import io
+import time
+from typing import Any, BinaryIO, Iterable, Iterator, List, Mapping, Tuple, Type
+
+from lchelper.common import Problem
 
 __all__ = [
     "create_codegen",
     "LANGUAGES",
+    "ARCHIVE_FORMATS",
+    "iter_project_files",
+    "write_archive",
+    "project_archive",
 ]
 
+# Code generator classes, imported on first use. Maps language names to (module, class name).
+_CODEGEN_CLASSES = {
+    "cpp": (".cpp", "CppCodeGen"),
+    "python": (".python", "PythonCodeGen"),
+}
+
+
+class _LazyLanguages(Mapping[str, Type['CodeGen']]):
+    r"""Mapping from language names to code generator classes. Language names are available without importing the code
+    generators, which are imported when they are first looked up.
+    """
+
+    def __getitem__(self, lang: str) -> Type['CodeGen']:
+        module, class_name = _CODEGEN_CLASSES[lang]
+        return getattr(importlib.import_module(module, __name__), class_name)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_CODEGEN_CLASSES)
 
-def create_codegen(lang: str) -> CodeGen:
+    def __len__(self) -> int:
+        return len(_CODEGEN_CLASSES)
+
+
+LANGUAGES = _LazyLanguages()
+
+
+def create_codegen(lang: str) -> 'CodeGen':
     return LANGUAGES[lang]()
 
 
-LANGUAGES = {
-    "cpp": CppCodeGen,
-    "python": PythonCodeGen,
+# Maps archive formats to `tarfile` stream modes. The "zip" format is handled separately.
+_TAR_MODES = {
+    "tar": "w|",
+    "tar.gz": "w|gz",
 }
+ARCHIVE_FORMATS = ["zip"] + list(_TAR_MODES.keys())
+
+
+def iter_project_files(problems: List[Problem], langs: List[str], site: str, name: str,
+                       debug: bool = False) -> Iterator[Tuple[str, bytes]]:
+    r"""Generate projects for the problems in each language, without touching the filesystem. This produces the same
+    files as ``main.py get``, and files are generated lazily, one problem at a time.
+
+    :param problems: List of problem descriptions to generate code for.
+    :param langs: Languages to generate projects for.
+    :param site: The LeetCode site where problems are crawled.
+    :param name: Name of the projects. The project of each language is stored under ``<name>_<lang>/``.
+    :param debug: If ``True``, exceptions will not be caught.
+    :return: An iterator over tuples of (file path, file contents). Paths use ``/`` as the separator.
+    """
+    for lang in langs:
+        codegen = create_codegen(lang)
+        for path, contents in codegen.generate_project(problems, site, debug=debug):
+            yield f"{name}_{lang}/{path}", contents
+
+
+def write_archive(files: Iterable[Tuple[str, bytes]], fileobj: BinaryIO, archive_format: str = "zip") -> None:
+    r"""Write files into an archive. Tar archives are written as a stream, so ``fileobj`` does not need to be seekable
+    (e.g. a socket or ``sys.stdout.buffer``).
+
+    :param files: An iterator over tuples of (file path, file contents), e.g. as returned by
+        :func:`iter_project_files`.
+    :param fileobj: A writable binary stream to write the archive to.
+    :param archive_format: Format of the archive. Available options are listed in :data:`ARCHIVE_FORMATS`.
+    """
+    if archive_format not in ARCHIVE_FORMATS:
+        raise ValueError(f"Unsupported archive format '{archive_format}'")
+    import tarfile  # archive modules are only imported when needed, to keep startup fast
+    import zipfile
+    timestamp = time.time()
+    if archive_format == "zip":
+        with zipfile.ZipFile(fileobj, "w", zipfile.ZIP_DEFLATED) as archive:
+            date_time = time.localtime(timestamp)[:6]
+            for path, contents in files:
+                info = zipfile.ZipInfo(path, date_time)
+                info.compress_type = zipfile.ZIP_DEFLATED
+                info.external_attr = 0o644 << 16
+                archive.writestr(info, contents)
+    else:
+        with tarfile.open(fileobj=fileobj, mode=_TAR_MODES[archive_format]) as archive:
+            for path, contents in files:
+                info = tarfile.TarInfo(path)
+                info.size = len(contents)
+                info.mtime = int(timestamp)
+                archive.addfile(info, io.BytesIO(contents))
+
+
+def project_archive(problems: List[Problem], langs: List[str], site: str, name: str,
+                    archive_format: str = "zip", debug: bool = False) -> bytes:
+    r"""Generate projects for the problems in each language, and return them as an in-memory archive.
+
+    :param problems: List of problem descriptions to generate code for.
+    :param langs: Languages to generate projects for.
+    :param site: The LeetCode site where problems are crawled.
+    :param name: Name of the projects. The project of each language is stored under ``<name>_<lang>/``.
+    :param archive_format: Format of the archive. Available options are listed in :data:`ARCHIVE_FORMATS`.
+    :param debug: If ``True``, exceptions will not be caught.
+    :return: Contents of the archive.
+    """
+    buffer = io.BytesIO()
+    write_archive(iter_project_files(problems, langs, site, name, debug=debug), buffer, archive_format)
+    return buffer.getvalue()
+
+
+def __getattr__(name: str) -> Any:
+    if name == "CodeGen":
+        from .base import CodeGen
+        return CodeGen
+    for module, class_name in _CODEGEN_CLASSES.values():
+        if name == class_name:
+            return getattr(importlib.import_module(module, __name__), class_name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
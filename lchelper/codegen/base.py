@@ -1,42 +1,36 @@
 import abc
+import json
 import os
 import shutil
 import traceback
 from datetime import datetime
-from typing import Dict, Iterable, List, Tuple, TypeVar, Union
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar, Union
 
 from lchelper.common import *
 from lchelper.logging import log
 from lchelper.parser import parse_problem
+from lchelper.tracing import trace_span
 
 __all__ = [
     "Code",
     "Signature",
+    "ConstantPool",
     "CodeGen",
 ]
 
-Transformer_code = """import in_place
-
-f = open('in.txt')
-
-with in_place.InPlace('in.txt') as file:
-    for line in file:
-        line = line.replace('[', '{')
-        line = line.replace(']', '}')
-        line = line.replace('null', 'INT_MIN')
-        file.write(line)
-"""
-
 Boilerplate_Code = r"""#include <type_traits>
 #include <algorithm>
 #include <bitset>
+#include <chrono>
 #include <complex>
 #include <fstream>
 #include <functional>
 #include <iomanip>
 #include <ios>
 #include <iostream>
+#include <iterator>
 #include <map>
+#include <memory>
 #include <numeric>
 #include <queue>
 #include <random>
@@ -65,12 +59,67 @@ Boilerplate_Code = r"""#include <type_traits>
 using namespace std;
 
 
+// Pool allocator for nodes of `Size` bytes. Nodes are carved out of large chunks instead of being allocated one by one,
+// and deleted nodes are kept in a free list for reuse. Chunks are only released when the program exits.
+template <std::size_t Size>
+class _NodePool {
+  public:
+    static void *allocate() {
+        _NodePool &pool = instance();
+        if (pool.free_list != nullptr) {
+            void *p = pool.free_list;
+            pool.free_list = *static_cast<void **>(p);
+            return p;
+        }
+        if (pool.used == kChunkNodes) {
+            pool.chunks.emplace_back(new char[kChunkNodes * Size]);
+            pool.used = 0;
+        }
+        return pool.chunks.back().get() + Size * pool.used++;
+    }
+
+    static void deallocate(void *p) {
+        _NodePool &pool = instance();
+        *static_cast<void **>(p) = pool.free_list;
+        pool.free_list = p;
+    }
+
+  private:
+    static_assert(Size >= sizeof(void *), "nodes must be large enough to hold a free list pointer");
+    static constexpr std::size_t kChunkNodes = 4096;
+    std::vector<std::unique_ptr<char[]>> chunks;
+    std::size_t used = kChunkNodes;
+    void *free_list = nullptr;
+
+    static _NodePool &instance() {
+        static _NodePool pool;
+        return pool;
+    }
+};
+
+// Nodes are allocated from pools, unless heap usage is measured (see `LCHELPER_MEMORY` in `_testing.h`), in which case
+// allocations of individual nodes are counted.
+#ifdef LCHELPER_MEMORY
+#define _NODE_POOL_ALLOCATOR(Node)
+#else
+#define _NODE_POOL_ALLOCATOR(Node) \
+    static void *operator new(std::size_t size) { \
+        return size == sizeof(Node) ? _NodePool<sizeof(Node)>::allocate() : ::operator new(size); \
+    } \
+    static void operator delete(void *p, std::size_t size) { \
+        if (p == nullptr) return; \
+        if (size == sizeof(Node)) _NodePool<sizeof(Node)>::deallocate(p); \
+        else ::operator delete(p); \
+    }
+#endif
+
 struct ListNode {
     int val;
     ListNode *next;
     ListNode() : val(0), next(nullptr) {}
     ListNode(int x) : val(x), next(nullptr) {}
     ListNode(int x, ListNode *next) : val(x), next(next) {}
+    _NODE_POOL_ALLOCATOR(ListNode)
 };
 
 struct TreeNode {
@@ -78,73 +127,100 @@ struct TreeNode {
     TreeNode *left;
     TreeNode *right;
     TreeNode(int x) : val(x), left(NULL), right(NULL) {}
+    // Subtrees are deleted iteratively, so that deleting deep trees does not overflow the stack.
     ~TreeNode() {
-        if (left != NULL) delete left;
-        if (right != NULL) delete right;
+        std::vector<TreeNode *> stack;
+        for (TreeNode *child : {left, right})
+            if (child != NULL) stack.push_back(child);
+        while (!stack.empty()) {
+            TreeNode *node = stack.back();
+            stack.pop_back();
+            for (TreeNode *child : {node->left, node->right})
+                if (child != NULL) stack.push_back(child);
+            node->left = node->right = NULL;
+            delete node;
+        }
     }
+    _NODE_POOL_ALLOCATOR(TreeNode)
 };
 
 const int NONE = INT_MIN;
 
-TreeNode *_construct_tree(const vector<int> &parent) {
-    queue<TreeNode *> q;
-    int ptr = 0;
+inline TreeNode *_construct_tree(const vector<int> &parent) {
+    if (parent.empty() || parent[0] == NONE) return nullptr;
+    // Nodes are created in level order, so the node list doubles as the queue of nodes waiting for children.
+    vector<TreeNode *> nodes;
+    nodes.reserve(parent.size());
+    nodes.push_back(new TreeNode(parent[0]));
+    size_t ptr = 1;
 
     auto _add_node = [&]() -> TreeNode * {
         if (ptr >= parent.size()) return nullptr;
         int val = parent[ptr++];
         if (val == NONE) return nullptr;
-        auto *p = new TreeNode(val);
-        q.push(p);
-        return p;
+        nodes.push_back(new TreeNode(val));
+        return nodes.back();
     };
 
-    TreeNode *root = _add_node();
-    while (!q.empty()) {
-        if (ptr >= parent.size()) break;
-        TreeNode *p = q.front();
-        q.pop();
+    for (size_t front = 0; front < nodes.size() && ptr < parent.size(); ++front) {
+        TreeNode *p = nodes[front];
         p->left = _add_node();
         p->right = _add_node();
     }
-    return root;
+    return nodes[0];
+}
+
+inline ListNode *_construct_list(const vector<int> &values) {
+    ListNode *head = nullptr;
+    for (int i = (int) values.size() - 1; i >= 0; --i) head = new ListNode(values[i], head);
+    return head;
 }
 
-void printTree(const std::string& prefix, const TreeNode* node, bool isLeft) {
-    if(node != nullptr) {
-        std::cerr << prefix;
+inline void printTree(const std::string& prefix, const TreeNode* node, bool isLeft) {
+    // Nodes are visited in pre-order using an explicit stack, so that printing deep trees does not overflow the stack.
+    std::vector<std::tuple<std::string, const TreeNode*, bool>> stack = {{prefix, node, isLeft}};
+    while (!stack.empty()) {
+        std::string node_prefix;
+        const TreeNode* current;
+        bool current_is_left;
+        std::tie(node_prefix, current, current_is_left) = std::move(stack.back());
+        stack.pop_back();
+        if (current == nullptr) continue;
 
-        std::cerr << (isLeft ? "├──" : "└──" );
+        std::cerr << node_prefix;
+
+        std::cerr << (current_is_left ? "├──" : "└──" );
 
         // print the value of the node
-        std::cerr << node->val << std::endl;
+        std::cerr << current->val << std::endl;
 
         // enter the next tree level - left and right branch
-        printTree( prefix + (isLeft ? "│   " : "    "), node->left, true);
-        printTree( prefix + (isLeft ? "│   " : "    "), node->right, false);
-    }
-}
-
-void __print(int x) {cerr << x;}
-void __print(long x) {cerr << x;}
-void __print(long long x) {cerr << x;}
-void __print(unsigned x) {cerr << x;}
-void __print(unsigned long x) {cerr << x;}
-void __print(unsigned long long x) {cerr << x;}
-void __print(float x) {cerr << x;}
-void __print(double x) {cerr << x;}
-void __print(long double x) {cerr << x;}
-void __print(char x) {cerr << '\'' << x << '\'';}
-void __print(const char *x) {cerr << '\"' << x << '\"';}
-void __print(const string &x) {cerr << '\"' << x << '\"';}
-void __print(bool x) {cerr << (x ? "true" : "false");}
-void __print(TreeNode* node) { cerr << endl; printTree("", node, false); }
+        std::string child_prefix = node_prefix + (current_is_left ? "│   " : "    ");
+        stack.emplace_back(child_prefix, current->right, false);
+        stack.emplace_back(std::move(child_prefix), current->left, true);
+    }
+}
+
+inline void __print(int x) {cerr << x;}
+inline void __print(long x) {cerr << x;}
+inline void __print(long long x) {cerr << x;}
+inline void __print(unsigned x) {cerr << x;}
+inline void __print(unsigned long x) {cerr << x;}
+inline void __print(unsigned long long x) {cerr << x;}
+inline void __print(float x) {cerr << x;}
+inline void __print(double x) {cerr << x;}
+inline void __print(long double x) {cerr << x;}
+inline void __print(char x) {cerr << '\'' << x << '\'';}
+inline void __print(const char *x) {cerr << '\"' << x << '\"';}
+inline void __print(const string &x) {cerr << '\"' << x << '\"';}
+inline void __print(bool x) {cerr << (x ? "true" : "false");}
+inline void __print(TreeNode* node) { cerr << endl; printTree("", node, false); }
 
 template<typename T, typename V>
 void __print(const pair<T, V> &x) {cerr << '{'; __print(x.first); cerr << ','; __print(x.second); cerr << '}';}
 template<typename T>
 void __print(const T &x) {int f = 0; cerr << '{'; for (auto &i: x) cerr << (f++ ? "," : ""), __print(i); cerr << "}";}
-void _print() {cerr << "]\n";}
+inline void _print() {cerr << "]\n";}
 template <typename T, typename... V>
 void _print(T t, V... v) {__print(t); if (sizeof...(v)) cerr << ", "; _print(v...);}
 #ifdef JONATHAN_DEBUG
@@ -159,6 +235,8 @@ Testing_Code = r"""#ifndef TESTING_H
 
 #include "_boilerplate.hpp"
 
+#include <filesystem>
+
 template <typename T>
 void print(const T &x) { std::cerr << x; }
 
@@ -172,9 +250,36 @@ void print(const std::vector<T> &vec) {
     std::cerr << "}";
 }
 
-void print(TreeNode* node) { cerr << endl; printTree("", node, false); }
+// Trees with more nodes than this are printed in LeetCode syntax instead of being drawn, since the drawing of a deep
+// tree grows quadratically with its depth.
+const int _MAX_DRAWN_TREE_NODES = 64;
+
+inline void print(TreeNode* node) {
+    // Collect nodes in level order, with null children of non-null nodes.
+    std::vector<const TreeNode*> nodes = {node};
+    int num_nodes = 0;
+    for (size_t i = 0; i < nodes.size(); ++i) {
+        if (nodes[i] == nullptr) continue;
+        ++num_nodes;
+        nodes.push_back(nodes[i]->left);
+        nodes.push_back(nodes[i]->right);
+    }
+    if (num_nodes <= _MAX_DRAWN_TREE_NODES) {
+        cerr << endl;
+        printTree("", node, false);
+        return;
+    }
+    while (!nodes.empty() && nodes.back() == nullptr) nodes.pop_back();
+    std::cerr << "[";
+    for (size_t i = 0; i < nodes.size(); ++i) {
+        if (i > 0) std::cerr << ",";
+        if (nodes[i] == nullptr) std::cerr << "null";
+        else std::cerr << nodes[i]->val;
+    }
+    std::cerr << "]";
+}
 
-void print(ListNode* node) {
+inline void print(ListNode* node) {
     std::cerr << "{";
     for (ListNode* thru = node; thru; thru = thru->next) {
         std::cerr << thru->val;
@@ -183,17 +288,26 @@ void print(ListNode* node) {
     std::cerr << "}";
 }
 
-bool isSameTree(const TreeNode* root1, const TreeNode* root2) {
-    if (!root1 && !root2) return true;
-    if ((!root1 && root2) || (!root2 && root1) || (root1->val != root2->val)) return false;
-    bool left = isSameTree(root1->left, root2->left);
-    bool right = isSameTree(root1->right, root2->right);
-    return left&&right;
+inline bool isSameTree(const TreeNode* root1, const TreeNode* root2) {
+    // Pairs of corresponding nodes are compared using an explicit stack, so that comparing deep trees does not overflow
+    // the stack. The stack keeps its capacity between calls, so that repeated comparisons do not allocate.
+    static thread_local std::vector<std::pair<const TreeNode*, const TreeNode*>> stack;
+    stack.clear();
+    stack.emplace_back(root1, root2);
+    while (!stack.empty()) {
+        const TreeNode *a = stack.back().first, *b = stack.back().second;
+        stack.pop_back();
+        if (!a && !b) continue;
+        if (!a || !b || a->val != b->val) return false;
+        stack.emplace_back(a->right, b->right);
+        stack.emplace_back(a->left, b->left);
+    }
+    return true;
 }
 
 
 template <>
-void print(const bool &x) { std::cerr << (x ? "true" : "false"); }
+inline void print(const bool &x) { std::cerr << (x ? "true" : "false"); }
 
 template <typename T>
 inline bool _test(const T &a, const T &b) {
@@ -212,17 +326,313 @@ inline bool _test(TreeNode* a, TreeNode* b) {
     return isSameTree(a, b);
 }
 
+inline bool _test(ListNode* a, ListNode* b) {
+    for (; a && b; a = a->next, b = b->next)
+        if (a->val != b->val) return false;
+    return !a && !b;
+}
+
+#ifndef LCHELPER_TIME_BUDGET_US
+#define LCHELPER_TIME_BUDGET_US 1000000
+#endif
+
+// Per-example time budget in microseconds. Can be overridden at runtime by the `LCHELPER_TIME_BUDGET_US` environment
+// variable.
+inline long long _time_budget_us() {
+    static const long long budget = [] {
+        const char *env = std::getenv("LCHELPER_TIME_BUDGET_US");
+        return env != nullptr ? std::atoll(env) : (long long) LCHELPER_TIME_BUDGET_US;
+    }();
+    return budget;
+}
+
+struct _Timer {
+    std::chrono::steady_clock::time_point start;
+    _Timer() : start(std::chrono::steady_clock::now()) {}
+    long long elapsed_us() const {
+        return std::chrono::duration_cast<std::chrono::microseconds>(std::chrono::steady_clock::now() - start).count();
+    }
+    long long elapsed_ns() const {
+        return std::chrono::duration_cast<std::chrono::nanoseconds>(std::chrono::steady_clock::now() - start).count();
+    }
+};
+
+// If the `LCHELPER_RSS_FILE` environment variable is set, the peak resident set size of the program is written to that
+// file in bytes at exit. It is taken from `VmHWM` (Linux only), which, unlike `getrusage`, does not include the memory
+// of the process that started the program.
+inline void _write_peak_rss() {
+    const char *path = std::getenv("LCHELPER_RSS_FILE");
+    if (path == nullptr) return;
+    std::ifstream status("/proc/self/status");
+    std::string line;
+    while (std::getline(status, line))
+        if (line.compare(0, 6, "VmHWM:") == 0) {
+            std::ofstream(path) << std::atoll(line.c_str() + 6) * 1024 << std::endl;
+            return;
+        }
+}
+
+static const int _peak_rss_registered = std::atexit(_write_peak_rss);
+
+#ifdef LCHELPER_MEMORY
+#include <cstddef>
+#include <new>
+
+// Heap usage counters in bytes, maintained by the replaced global allocation functions below.
+static long long _heap_current = 0, _heap_peak = 0, _heap_allocs = 0;
+
+void *operator new(std::size_t size) {
+    // The size of each allocation is stored in front of the returned block, keeping the alignment of `malloc`.
+    char *block = static_cast<char *>(std::malloc(size + alignof(std::max_align_t)));
+    if (block == nullptr) throw std::bad_alloc();
+    *reinterpret_cast<std::size_t *>(block) = size;
+    _heap_current += size;
+    _heap_allocs += 1;
+    if (_heap_current > _heap_peak) _heap_peak = _heap_current;
+    return block + alignof(std::max_align_t);
+}
+
+void operator delete(void *p) noexcept {
+    if (p == nullptr) return;
+    char *block = static_cast<char *>(p) - alignof(std::max_align_t);
+    _heap_current -= *reinterpret_cast<std::size_t *>(block);
+    std::free(block);
+}
+
+void *operator new[](std::size_t size) { return operator new(size); }
+void operator delete[](void *p) noexcept { operator delete(p); }
+void operator delete(void *p, std::size_t) noexcept { operator delete(p); }
+void operator delete[](void *p, std::size_t) noexcept { operator delete(p); }
+#endif  // LCHELPER_MEMORY
+
+// Heap usage of a single example, measured when compiled with `-DLCHELPER_MEMORY`. Construct it before the input
+// arguments, and call `start()` right before calling the solution.
+struct _Memory {
+    bool measured = false;
+    long long base = 0, input_bytes = 0, allocs_base = 0;
+#ifdef LCHELPER_MEMORY
+    _Memory() : base(_heap_current) {}
+    void start() {
+        input_bytes = std::max(_heap_current - base, 0LL);
+        base = _heap_current;
+        _heap_peak = _heap_current;
+        allocs_base = _heap_allocs;
+        measured = true;
+    }
+    long long peak_bytes() const { return _heap_peak - base; }
+    long long allocs() const { return _heap_allocs - allocs_base; }
+#else
+    void start() {}
+    long long peak_bytes() const { return 0; }
+    long long allocs() const { return 0; }
+#endif
+};
+
+// Values are printed in full only if the `LCHELPER_FULL_OUTPUT` environment variable is set. Otherwise, containers are
+// truncated to a bounded number of elements, and mismatches are reported with a window of elements around them.
+inline bool _full_output() {
+    static const bool full = [] {
+        const char *env = std::getenv("LCHELPER_FULL_OUTPUT");
+        return env != nullptr && std::strcmp(env, "") != 0 && std::strcmp(env, "0") != 0;
+    }();
+    return full;
+}
+
+const std::size_t _MAX_PRINTED_ITEMS = 8;  // maximum number of elements printed per container
+const std::size_t _DIFF_WINDOW = 3;  // number of elements printed on each side of a mismatch
+
 template <typename T>
-inline void test(const char *msg, const T &a, const T &b) {
-    if (_test(a, b)) {
-        std::cerr << msg << "\033[1;32m [OK]\033[0m" << std::endl;
-        std::cerr << "Expected: ";
-        print(a);
-        std::cerr << std::endl << "Received: ";
-        print(b);
-        std::cerr << std::endl;
+void _print_bounded(const T &x) { print(x); }
+
+inline void _print_bounded(const std::string &str) {
+    if (str.size() <= _MAX_PRINTED_ITEMS * 8) std::cerr << str;
+    else std::cerr << str.substr(0, _MAX_PRINTED_ITEMS * 8) << "... (" << str.size() << " characters)";
+}
+
+template <typename T>
+void _print_bounded(const std::vector<T> &vec) {
+    std::cerr << "{";
+    for (std::size_t i = 0; i < vec.size() && i < _MAX_PRINTED_ITEMS; ++i) {
+        if (i > 0) std::cerr << ", ";
+        _print_bounded(vec[i]);
+    }
+    if (vec.size() > _MAX_PRINTED_ITEMS) std::cerr << ", ... (" << vec.size() << " elements)";
+    std::cerr << "}";
+}
+
+inline void _print_bounded(ListNode *node) {
+    std::cerr << "{";
+    std::size_t count = 0;
+    for (; node && count < _MAX_PRINTED_ITEMS; node = node->next, ++count)
+        std::cerr << (count > 0 ? " -> " : "") << node->val;
+    if (node) std::cerr << " -> ...";
+    std::cerr << "}";
+}
+
+inline void _print_bounded(TreeNode *node) {
+    // Print the first nodes of the LeetCode representation.
+    std::vector<const TreeNode *> nodes = {node};
+    for (std::size_t i = 0; i < nodes.size() && nodes.size() <= _MAX_PRINTED_ITEMS * 2; ++i)
+        if (nodes[i] != nullptr) {
+            nodes.push_back(nodes[i]->left);
+            nodes.push_back(nodes[i]->right);
+        }
+    bool truncated = nodes.size() > _MAX_PRINTED_ITEMS * 2;
+    if (truncated) nodes.resize(_MAX_PRINTED_ITEMS * 2);
+    else while (!nodes.empty() && nodes.back() == nullptr) nodes.pop_back();
+    std::cerr << "[";
+    for (std::size_t i = 0; i < nodes.size(); ++i) {
+        if (i > 0) std::cerr << ",";
+        if (nodes[i] == nullptr) std::cerr << "null";
+        else std::cerr << nodes[i]->val;
+    }
+    std::cerr << (truncated ? ",...]" : "]");
+}
+
+// Print the value in full or bounded, depending on `LCHELPER_FULL_OUTPUT`.
+template <typename T>
+void _print_result(const T &x) {
+    if (_full_output()) print(x);
+    else _print_bounded(x);
+}
+
+template <typename T>
+void _print_window(const std::vector<T> &vec, std::size_t center) {
+    std::size_t lo = center > _DIFF_WINDOW ? center - _DIFF_WINDOW : 0;
+    std::size_t hi = std::min(vec.size(), center + _DIFF_WINDOW + 1);
+    std::cerr << "{" << (lo > 0 ? "..., " : "");
+    for (std::size_t i = lo; i < hi; ++i) {
+        if (i > lo) std::cerr << ", ";
+        _print_bounded(vec[i]);
+    }
+    std::cerr << (hi < vec.size() ? ", ...}" : "}");
+}
+
+inline void _print_window(const std::string &str, std::size_t center) {
+    std::size_t lo = center > _DIFF_WINDOW * 4 ? center - _DIFF_WINDOW * 4 : 0;
+    std::size_t hi = std::min(str.size(), center + _DIFF_WINDOW * 4 + 1);
+    std::cerr << '"' << (lo > 0 ? "..." : "") << str.substr(lo, hi - lo) << (hi < str.size() ? "..." : "") << '"';
+}
+
+// Find the first difference between the expected and received values, stopping at the first mismatch. If the values
+// differ, `path` is set to the index path of the mismatch (e.g. `[3][1]`), and the mismatch is printed by `report()`.
+template <typename T>
+bool _diff(const T &a, const T &b, std::string &path, std::function<void()> &report) {
+    if (_test(a, b)) return false;
+    report = [&a, &b] {
+        std::cerr << "expected ";
+        _print_bounded(a);
+        std::cerr << ", received ";
+        _print_bounded(b);
+    };
+    return true;
+}
+
+template <typename T>
+bool _diff(const std::vector<T> &a, const std::vector<T> &b, std::string &path, std::function<void()> &report);
+inline bool _diff(const std::string &a, const std::string &b, std::string &path, std::function<void()> &report);
+
+template <typename Seq>
+bool _diff_sequence(const Seq &a, const Seq &b, std::string &path, std::function<void()> &report) {
+    std::size_t n = std::min(a.size(), b.size());
+    for (std::size_t i = 0; i < n; ++i) {
+        std::string inner_path;
+        if (_diff(a[i], b[i], inner_path, report)) {
+            path = "[" + std::to_string(i) + "]" + inner_path;
+            if (inner_path.empty()) {
+                // The elements differ, so show their neighbors for context.
+                report = [&a, &b, i] {
+                    std::cerr << "expected ";
+                    _print_window(a, i);
+                    std::cerr << ", received ";
+                    _print_window(b, i);
+                };
+            }
+            return true;
+        }
+    }
+    if (a.size() == b.size()) return false;
+    report = [&a, &b, n] {
+        std::cerr << "expected length " << a.size() << ", received length " << b.size() << ", extra elements ";
+        _print_window(a.size() > b.size() ? a : b, n);
+    };
+    return true;
+}
+
+template <typename T>
+bool _diff(const std::vector<T> &a, const std::vector<T> &b, std::string &path, std::function<void()> &report) {
+    return _diff_sequence(a, b, path, report);
+}
+
+inline bool _diff(const std::string &a, const std::string &b, std::string &path, std::function<void()> &report) {
+    return _diff_sequence(a, b, path, report);
+}
+
+inline bool _diff(ListNode *a, ListNode *b, std::string &path, std::function<void()> &report) {
+    std::size_t idx = 0;
+    for (; a && b; a = a->next, b = b->next, ++idx)
+        if (a->val != b->val) break;
+    if (!a && !b) return false;
+    path = "[" + std::to_string(idx) + "]";
+    report = [a, b] {
+        std::cerr << "expected " << (a ? std::to_string(a->val) : "end of list") << ", received "
+                  << (b ? std::to_string(b->val) : "end of list");
+    };
+    return true;
+}
+
+inline bool _diff(TreeNode *a, TreeNode *b, std::string &path, std::function<void()> &report) {
+    // Nodes are compared in level order, and the mismatch is identified by its position in the LeetCode representation.
+    std::vector<std::pair<TreeNode *, TreeNode *>> queue = {{a, b}};
+    std::size_t idx = 0;
+    for (std::size_t front = 0; front < queue.size(); ++front) {
+        TreeNode *x = queue[front].first, *y = queue[front].second;
+        if (!x && !y) {
+            ++idx;
+            continue;
+        }
+        if (!x || !y || x->val != y->val) {
+            path = "[" + std::to_string(idx) + "] (level order)";
+            report = [x, y] {
+                std::cerr << "expected " << (x ? std::to_string(x->val) : "null") << ", received "
+                          << (y ? std::to_string(y->val) : "null");
+            };
+            return true;
+        }
+        ++idx;
+        queue.emplace_back(x->left, y->left);
+        queue.emplace_back(x->right, y->right);
+    }
+    return false;
+}
+
+template <typename T>
+inline void test(const char *msg, const T &a, const T &b, long long elapsed_us, const _Memory &memory = _Memory()) {
+    // Heap usage is read before the comparison, as comparing and reporting mismatches allocate memory.
+    long long peak_bytes = memory.peak_bytes(), allocs = memory.allocs();
+    std::string path;
+    std::function<void()> report;
+    bool wrong = _diff(a, b, path, report);
+    if (!wrong) {
+        std::cerr << msg << "\033[1;32m [OK]\033[0m";
     } else {
-        std::cerr << msg << "\033[1;31m [WRONG]\033[0m" << std::endl;
+        std::cerr << msg << "\033[1;31m [WRONG]\033[0m";
+    }
+    if (elapsed_us >= 0) {
+        std::cerr << " (" << elapsed_us << " us)";
+        if (memory.measured)
+            std::cerr << " [MEM peak " << peak_bytes << " B, " << allocs << " allocs, input "
+                      << memory.input_bytes << " B]";
+        if (elapsed_us > _time_budget_us())
+            std::cerr << "\033[1;33m [SLOW]\033[0m exceeds budget of " << _time_budget_us() << " us";
+    }
+    std::cerr << std::endl;
+    if (wrong) {
+        std::cerr << "First mismatch at " << (path.empty() ? "the top level" : path) << ": ";
+        report();
+        std::cerr << std::endl;
+    }
+    if (_full_output()) {
         std::cerr << "Expected: ";
         print(a);
         std::cerr << std::endl << "Received: ";
@@ -231,6 +641,696 @@ inline void test(const char *msg, const T &a, const T &b) {
     }
 }
 
+template <typename T>
+inline void test(const char *msg, const T &a, const T &b) {
+    test(msg, a, b, -1);
+}
+
+// Reader for values in LeetCode syntax (e.g. `[[1,2],[3]]`, `"abc"`, `[1,null,2]`, `true`), used to run custom test
+// cases. Input files are streamed through a buffer of whole lines that is parsed in place, so files with many cases
+// are never loaded at once. Values may span lines, but tokens (numbers, strings, and words) may not. Values may be
+// separated by whitespace or commas, and may be prefixed by their names, as in `nums = [1,2], k = 3`.
+class _Reader {
+  public:
+    explicit _Reader(const std::string &path) : source(path == "-" ? "<stdin>" : path) {
+        if (path == "-") {
+            stream = &std::cin;
+        } else {
+            file.open(path, std::ios::binary);
+            if (file) stream = &file;
+        }
+        ptr = buffer.c_str();
+        refill();
+    }
+
+    // Read values from data in memory, e.g. examples embedded in the generated code. `source` names the data in errors.
+    _Reader(const char *data, const std::string &source) : source(source), buffer(data) {
+        ptr = buffer.c_str();
+    }
+
+    void skip_space() {
+        while (true) {
+            while (*ptr != '\0' && std::isspace(static_cast<unsigned char>(*ptr))) ++ptr;
+            if (*ptr != '\0' || !refill()) return;
+        }
+    }
+
+    // Skip whitespace, commas, and an optional `name =` prefix before a top-level value.
+    void skip_separators() {
+        while (true) {
+            while (*ptr != '\0' && (std::isspace(static_cast<unsigned char>(*ptr)) || *ptr == ',')) ++ptr;
+            if (*ptr != '\0' || !refill()) break;
+        }
+        if (std::isalpha(static_cast<unsigned char>(*ptr)) || *ptr == '_') {
+            const char *p = ptr;
+            while (std::isalnum(static_cast<unsigned char>(*p)) || *p == '_') ++p;
+            while (*p != '\0' && std::isspace(static_cast<unsigned char>(*p))) ++p;
+            if (*p == '=') {
+                ptr = p + 1;
+                skip_space();
+            }
+        }
+    }
+
+    bool at_end() {
+        skip_separators();
+        return *ptr == '\0';
+    }
+
+    // Accept a label followed by a colon before a top-level value, e.g. `Output:`.
+    bool accept_label(const char *label) {
+        skip_separators();
+        std::size_t len = std::strlen(label);
+        if (std::strncmp(ptr, label, len) != 0) return false;
+        const char *p = ptr + len;
+        while (*p == ' ' || *p == '\t') ++p;
+        if (*p != ':') return false;
+        ptr = p + 1;
+        return true;
+    }
+
+    bool accept(char c) {
+        skip_space();
+        if (*ptr != c) return false;
+        ++ptr;
+        return true;
+    }
+
+    void expect(char c) {
+        if (!accept(c)) fail(std::string("expected '") + c + "'");
+    }
+
+    bool accept_word(const char *word) {
+        skip_space();
+        std::size_t len = std::strlen(word);
+        if (std::strncmp(ptr, word, len) != 0 || std::isalnum(static_cast<unsigned char>(ptr[len]))) return false;
+        ptr += len;
+        return true;
+    }
+
+    long long read_integer() {
+        skip_space();
+        if (accept_word("null")) return NONE;
+        char *end;
+        long long value = std::strtoll(ptr, &end, 10);
+        if (end == ptr) fail("expected an integer");
+        ptr = end;
+        return value;
+    }
+
+    double read_double() {
+        skip_space();
+        char *end;
+        double value = std::strtod(ptr, &end);
+        if (end == ptr) fail("expected a number");
+        ptr = end;
+        return value;
+    }
+
+    std::string read_string() {
+        skip_space();
+        char quote = *ptr;
+        if (quote != '"' && quote != '\'') fail("expected a string");
+        std::string value;
+        for (++ptr; *ptr != quote; ++ptr) {
+            if (*ptr == '\0') fail("unterminated string");
+            if (*ptr == '\\') {
+                ++ptr;
+                switch (*ptr) {
+                    case 'n': value += '\n'; break;
+                    case 't': value += '\t'; break;
+                    case '\0': fail("unterminated string");
+                    default: value += *ptr;
+                }
+            } else {
+                // Copy the run of plain characters at once.
+                const char *start = ptr;
+                while (ptr[1] != quote && ptr[1] != '\\' && ptr[1] != '\0') ++ptr;
+                value.append(start, ptr + 1);
+            }
+        }
+        ++ptr;
+        return value;
+    }
+
+    // Read the text of a top-level value without parsing it, e.g. to parse it later with another reader.
+    std::string read_raw() {
+        skip_separators();
+        std::string value;
+        const char *start = ptr;
+        int depth = 0;
+        char quote = '\0';
+        while (true) {
+            char c = *ptr;
+            if (c == '\0') {
+                value.append(start, ptr);
+                bool more = refill();
+                start = ptr;
+                if (!more) break;
+                continue;
+            }
+            if (quote != '\0') {
+                if (c == '\\' && ptr[1] != '\0') ++ptr;
+                else if (c == quote) quote = '\0';
+            } else if (c == '"' || c == '\'') {
+                quote = c;
+            } else if (c == '[') {
+                ++depth;
+            } else if (c == ']') {
+                if (depth == 0) break;
+                if (--depth == 0) {
+                    ++ptr;
+                    break;
+                }
+            } else if (depth == 0 && (c == ',' || std::isspace(static_cast<unsigned char>(c)))) {
+                break;
+            }
+            ++ptr;
+        }
+        value.append(start, ptr);
+        if (value.empty() || depth > 0 || quote != '\0') fail("expected a value");
+        return value;
+    }
+
+    [[noreturn]] void fail(const std::string &message) {
+        int line = lines_read + 1 + (int) std::count(buffer.c_str(), ptr, '\n');
+        std::cerr << source << ":" << line << ": " << message << std::endl;
+        std::exit(1);
+    }
+
+  private:
+    static constexpr std::size_t CHUNK_SIZE = 1 << 16;
+
+    std::string source;
+    std::ifstream file;
+    std::istream *stream = nullptr;  // `nullptr` for data in memory, or once the input is exhausted
+    std::string buffer;
+    const char *ptr;
+    int lines_read = 0;  // number of lines dropped from the buffer
+
+    // Replace the buffer, which must have been parsed entirely, with the next lines of input. Returns whether any input
+    // was read. The buffer always ends at a line break, so tokens are never split across refills.
+    bool refill() {
+        if (stream == nullptr) return false;
+        lines_read += (int) std::count(buffer.begin(), buffer.end(), '\n');
+        buffer.clear();
+        std::string line;
+        while (buffer.size() < CHUNK_SIZE && std::getline(*stream, line)) {
+            buffer += line;
+            buffer += '\n';
+        }
+        if (buffer.empty()) stream = nullptr;
+        ptr = buffer.c_str();
+        return !buffer.empty();
+    }
+};
+
+inline void _read_value(_Reader &in, int &x) { x = (int) in.read_integer(); }
+inline void _read_value(_Reader &in, long &x) { x = (long) in.read_integer(); }
+inline void _read_value(_Reader &in, long long &x) { x = in.read_integer(); }
+inline void _read_value(_Reader &in, double &x) { x = in.read_double(); }
+inline void _read_value(_Reader &in, std::string &x) { x = in.read_string(); }
+
+inline void _read_value(_Reader &in, bool &x) {
+    if (in.accept_word("true")) x = true;
+    else if (in.accept_word("false")) x = false;
+    else in.fail("expected a boolean");
+}
+
+inline void _read_value(_Reader &in, char &x) {
+    std::string value = in.read_string();
+    if (value.size() != 1) in.fail("expected a single character");
+    x = value[0];
+}
+
+inline void _read_value(_Reader &in, TreeNode *&x);
+inline void _read_value(_Reader &in, ListNode *&x);
+
+template <typename T>
+void _read_value(_Reader &in, std::vector<T> &x) {
+    x.clear();
+    in.expect('[');
+    if (in.accept(']')) return;
+    do {
+        T value;
+        _read_value(in, value);
+        x.push_back(std::move(value));
+    } while (in.accept(','));
+    in.expect(']');
+}
+
+inline void _read_value(_Reader &in, TreeNode *&x) {
+    std::vector<int> values;
+    _read_value(in, values);
+    x = _construct_tree(values);
+}
+
+inline void _read_value(_Reader &in, ListNode *&x) {
+    std::vector<int> values;
+    _read_value(in, values);
+    x = _construct_list(values);
+}
+
+// Read a top-level value, i.e., an argument of a custom test case.
+template <typename T>
+inline void _read(_Reader &in, T &x) {
+    in.skip_separators();
+    _read_value(in, x);
+}
+
+// Path of the custom test case file `in.txt` next to the given source file, falling back to the working directory if
+// the source file was compiled with a path relative to another directory.
+inline std::string _custom_input_path(const std::string &source_file) {
+    std::size_t pos = source_file.find_last_of("/\\");
+    if (pos == std::string::npos) return "in.txt";
+    std::string path = source_file.substr(0, pos + 1) + "in.txt";
+    return std::ifstream(path).good() ? path : "in.txt";
+}
+
+// Files holding the custom test cases at `path`: the file itself, or the files in a directory in order of their names.
+// Hidden files and `.out` files, which hold expected outputs, are skipped.
+inline std::vector<std::string> _custom_case_files(const std::string &path) {
+    std::error_code error;
+    if (path == "-" || !std::filesystem::is_directory(path, error)) return {path};
+    std::vector<std::string> files;
+    for (const auto &entry : std::filesystem::directory_iterator(path, error)) {
+        std::string name = entry.path().filename().string();
+        if (entry.is_regular_file(error) && name[0] != '.' && entry.path().extension() != ".out")
+            files.push_back(entry.path().string());
+    }
+    std::sort(files.begin(), files.end());
+    return files;
+}
+
+// Find the expected output of a custom test case after its arguments were read: the next value in `out` if the case
+// file has a matching `.out` file, or a value labeled `Output:` in the case file itself. Returns the reader positioned
+// at the expected output, or `nullptr` if the case has none.
+inline _Reader *_expected_output(_Reader &in, _Reader *out) {
+    if (out != nullptr) return out->at_end() ? nullptr : out;
+    return in.accept_label("Output") ? &in : nullptr;
+}
+
+// Run custom test cases from `path`: a file with any number of cases ("-" for standard input), or a directory of such
+// files. Cases may be prefixed with `Input:`, and may be followed by their expected outputs labeled with `Output:`.
+// Expected outputs of the cases in a `.in` file may instead be listed in order in the `.out` file of the same name.
+// `run_case` reads a case and runs the solution on it. Cases are streamed, so only a single case is held in memory. A
+// missing or empty file contains no cases.
+template <typename F>
+inline int _run_custom(const std::string &path, F run_case) {
+    std::vector<std::string> files = _custom_case_files(path);
+    int idx = 0;
+    for (const std::string &file : files) {
+        _Reader in(file);
+        std::unique_ptr<_Reader> out;
+        std::filesystem::path out_path(file);
+        if (out_path.extension() == ".in" && std::filesystem::exists(out_path.replace_extension(".out")))
+            out.reset(new _Reader(out_path.string()));
+        while (!in.at_end()) {
+            in.accept_label("Input");
+            std::string name = "Custom - " + std::to_string(idx++);
+            if (files.size() > 1 || file != path) name += " (" + file + ")";
+            run_case(in, out.get(), name);
+        }
+    }
+    return 0;
+}
+
+// A function that reads the arguments of an interaction from `in` and its expected output from `out`, and calls the
+// corresponding method of the object (or constructs the object).
+template <typename Obj>
+using _ReplayMethod = void (*)(std::unique_ptr<Obj> &obj, _Reader &in, _Reader &out, const char *msg);
+
+// Replay the interactions of an example of an interactive problem. `input` holds the list of function names followed by
+// the list of argument lists, and `output` the list of expected outputs, both in LeetCode syntax. Each interaction is
+// dispatched through the method table `methods`, so the code size does not depend on the number of interactions.
+template <typename Obj>
+inline void _replay(const char *name, const char *input, const char *output,
+                    const std::unordered_map<std::string, _ReplayMethod<Obj>> &methods) {
+    _Reader in(input, name), out(output, name);
+    std::vector<std::string> functions;
+    _read(in, functions);
+    in.skip_separators();
+    in.expect('[');
+    out.skip_separators();
+    out.expect('[');
+    std::unique_ptr<Obj> obj;
+    for (std::size_t i = 0; i < functions.size(); ++i) {
+        if (i > 0) {
+            in.expect(',');
+            out.expect(',');
+        }
+        in.expect('[');
+        auto method = methods.find(functions[i]);
+        if (method == methods.end()) in.fail("unknown function '" + functions[i] + "'");
+        std::string msg = std::string(name) + " - Interaction " + std::to_string(i);
+        method->second(obj, in, out, msg.c_str());
+        in.expect(']');
+    }
+    in.expect(']');
+    out.expect(']');
+}
+
+// Skip the expected output of constructors and functions returning `void`, which is `null`.
+inline void _skip_null(_Reader &in) {
+    if (!in.accept_word("null")) in.fail("expected null");
+}
+
+inline void _report_custom(const std::string &name, long long elapsed_us) {
+    std::cerr << name << " (" << elapsed_us << " us)";
+    if (elapsed_us > _time_budget_us())
+        std::cerr << "\033[1;33m [SLOW]\033[0m exceeds budget of " << _time_budget_us() << " us";
+    std::cerr << std::endl << "Output: ";
+}
+
+#if defined(LCHELPER_STRESS) || defined(LCHELPER_BENCH)
+
+inline long long _env_int(const char *name, long long default_value) {
+    const char *env = std::getenv(name);
+    return env != nullptr ? std::atoll(env) : default_value;
+}
+
+// Trees and linked lists are generated and shrunk in their LeetCode array representation, and are constructed anew for
+// each call since solutions may modify their inputs.
+struct _TreeInput { std::vector<int> values; };
+struct _ListInput { std::vector<int> values; };
+
+// Random input generator. Sizes and values are configured through `LCHELPER_STRESS_*` environment variables.
+struct _Gen {
+    std::mt19937_64 rng;
+    int min_size, max_size;
+    int grid_min_size, grid_max_size;  // range for the number of rows and columns in grids
+    long long min_value, max_value;
+    std::string alphabet;
+
+    explicit _Gen(unsigned long long seed)
+            : rng(seed),
+              min_size((int) _env_int("LCHELPER_STRESS_MIN_SIZE", 1)),
+              max_size((int) _env_int("LCHELPER_STRESS_MAX_SIZE", 10)),
+              grid_min_size(min_size), grid_max_size(max_size),
+              min_value(_env_int("LCHELPER_STRESS_MIN_VALUE", 0)),
+              max_value(_env_int("LCHELPER_STRESS_MAX_VALUE", 10)) {
+        const char *env = std::getenv("LCHELPER_STRESS_ALPHABET");
+        alphabet = env != nullptr && *env ? env : "abc";
+    }
+
+    long long value() { return std::uniform_int_distribution<long long>(min_value, max_value)(rng); }
+    int size() { return std::uniform_int_distribution<int>(min_size, max_size)(rng); }
+    int grid_size() { return std::uniform_int_distribution<int>(grid_min_size, grid_max_size)(rng); }
+    bool coin(double p) { return std::bernoulli_distribution(p)(rng); }
+    char letter() { return alphabet[std::uniform_int_distribution<size_t>(0, alphabet.size() - 1)(rng)]; }
+
+    // The value that shrinking moves towards: zero if it's within range, otherwise the closest bound.
+    long long shrink_target() const { return std::min(std::max(0LL, min_value), max_value); }
+};
+
+// Forward declarations, so that overloads for nested types can find each other.
+template <typename T> void _random(_Gen &g, std::vector<T> &x);
+template <typename T> void _random(_Gen &g, std::vector<std::vector<T>> &x);
+template <typename T> std::vector<std::vector<T>> _shrink(const _Gen &g, const std::vector<T> &x);
+template <typename T>
+std::vector<std::vector<std::vector<T>>> _shrink(const _Gen &g, const std::vector<std::vector<T>> &x);
+template <typename T> void _print_lc(std::ostream &out, const std::vector<T> &x);
+
+inline void _random(_Gen &g, int &x) { x = (int) g.value(); }
+inline void _random(_Gen &g, long &x) { x = (long) g.value(); }
+inline void _random(_Gen &g, long long &x) { x = g.value(); }
+inline void _random(_Gen &g, double &x) {
+    x = std::uniform_real_distribution<double>((double) g.min_value, (double) g.max_value)(g.rng);
+}
+inline void _random(_Gen &g, bool &x) { x = g.coin(0.5); }
+inline void _random(_Gen &g, char &x) { x = g.letter(); }
+inline void _random(_Gen &g, std::string &x) {
+    x.resize(g.size());
+    for (char &c : x) c = g.letter();
+}
+inline void _random(_Gen &g, _TreeInput &x) {
+    int n = g.size();
+    x.values.resize(n);
+    for (int i = 0; i < n; ++i) x.values[i] = i > 0 && g.coin(0.2) ? NONE : (int) g.value();
+}
+inline void _random(_Gen &g, _ListInput &x) {
+    x.values.resize(g.size());
+    for (int &v : x.values) v = (int) g.value();
+}
+template <typename T>
+void _random(_Gen &g, std::vector<T> &x) {
+    x.resize(g.size());
+    for (size_t i = 0; i < x.size(); ++i) {
+        T elem;
+        _random(g, elem);
+        x[i] = elem;
+    }
+}
+// Nested vectors are generated as rectangular grids.
+template <typename T>
+void _random(_Gen &g, std::vector<std::vector<T>> &x) {
+    int rows = g.grid_size(), cols = g.grid_size();
+    x.assign(rows, std::vector<T>(cols));
+    for (auto &row : x)
+        for (int j = 0; j < cols; ++j) {
+            T elem;
+            _random(g, elem);
+            row[j] = elem;
+        }
+}
+
+// Each `_shrink` overload returns a list of "smaller" candidates for the value.
+template <typename T>
+std::vector<T> _shrink_number(const _Gen &g, T x) {
+    T target = (T) g.shrink_target();
+    // The midpoint is computed in a wider type, as `x - target` overflows for values near the limits of `T`.
+    T midpoint = (T) (x - ((__int128) x - target) / 2);
+    std::vector<T> candidates;
+    for (T c : {target, midpoint, (T) (x > target ? x - 1 : x + 1)})
+        if (c != x && std::find(candidates.begin(), candidates.end(), c) == candidates.end())
+            candidates.push_back(c);
+    if (x == target) candidates.clear();
+    return candidates;
+}
+inline std::vector<int> _shrink(const _Gen &g, const int &x) { return _shrink_number(g, x); }
+inline std::vector<long> _shrink(const _Gen &g, const long &x) { return _shrink_number(g, x); }
+inline std::vector<long long> _shrink(const _Gen &g, const long long &x) { return _shrink_number(g, x); }
+inline std::vector<double> _shrink(const _Gen &g, const double &x) {
+    double target = (double) g.shrink_target();
+    return x == target ? std::vector<double>() : std::vector<double>{target, std::trunc(x)};
+}
+inline std::vector<bool> _shrink(const _Gen &g, const bool &x) {
+    return x ? std::vector<bool>{false} : std::vector<bool>();
+}
+inline std::vector<char> _shrink(const _Gen &g, const char &x) {
+    return x == g.alphabet[0] ? std::vector<char>() : std::vector<char>{g.alphabet[0]};
+}
+
+// Candidates with a chunk of elements removed, from large chunks to single elements.
+template <typename Seq>
+void _shrink_remove_chunks(const _Gen &g, const Seq &x, std::vector<Seq> &candidates) {
+    int n = (int) x.size();
+    for (int chunk = n / 2; n > 0; chunk /= 2) {
+        chunk = std::max(chunk, 1);
+        if (n - chunk >= g.min_size)
+            for (int start = 0; start + chunk <= n; start += chunk) {
+                Seq y(x.begin(), x.begin() + start);
+                y.insert(y.end(), x.begin() + start + chunk, x.end());
+                candidates.push_back(y);
+            }
+        if (chunk == 1) break;
+    }
+}
+inline std::vector<std::string> _shrink(const _Gen &g, const std::string &x) {
+    std::vector<std::string> candidates;
+    _shrink_remove_chunks(g, x, candidates);
+    for (size_t i = 0; i < x.size(); ++i)
+        if (x[i] != g.alphabet[0]) {
+            std::string y = x;
+            y[i] = g.alphabet[0];
+            candidates.push_back(y);
+        }
+    return candidates;
+}
+template <typename T>
+std::vector<std::vector<T>> _shrink(const _Gen &g, const std::vector<T> &x) {
+    std::vector<std::vector<T>> candidates;
+    _shrink_remove_chunks(g, x, candidates);
+    for (size_t i = 0; i < x.size(); ++i)
+        for (const T &c : _shrink(g, (T) x[i])) {
+            std::vector<T> y = x;
+            y[i] = c;
+            candidates.push_back(y);
+        }
+    return candidates;
+}
+// Grids are shrunk by removing rows or columns, so that they stay rectangular.
+template <typename T>
+std::vector<std::vector<std::vector<T>>> _shrink(const _Gen &g, const std::vector<std::vector<T>> &x) {
+    std::vector<std::vector<std::vector<T>>> candidates;
+    _shrink_remove_chunks(g, x, candidates);
+    int cols = x.empty() ? 0 : (int) x[0].size();
+    for (int j = 0; j < cols && cols - 1 >= g.min_size; ++j) {
+        std::vector<std::vector<T>> y = x;
+        for (auto &row : y) row.erase(row.begin() + j);
+        candidates.push_back(y);
+    }
+    for (size_t i = 0; i < x.size(); ++i)
+        for (size_t j = 0; j < x[i].size(); ++j)
+            for (const T &c : _shrink(g, (T) x[i][j])) {
+                std::vector<std::vector<T>> y = x;
+                y[i][j] = c;
+                candidates.push_back(y);
+            }
+    return candidates;
+}
+inline std::vector<_TreeInput> _shrink(const _Gen &g, const _TreeInput &x) {
+    std::vector<std::vector<int>> removed;
+    _shrink_remove_chunks(g, x.values, removed);
+    std::vector<_TreeInput> candidates;
+    for (const auto &values : removed)
+        if (values.empty() || values[0] != NONE) candidates.push_back({values});
+    for (size_t i = 1; i < x.values.size(); ++i)  // remove subtrees
+        if (x.values[i] != NONE) {
+            _TreeInput y = x;
+            y.values[i] = NONE;
+            candidates.push_back(y);
+        }
+    for (size_t i = 0; i < x.values.size(); ++i)
+        if (x.values[i] != NONE)
+            for (int c : _shrink(g, x.values[i])) {
+                _TreeInput y = x;
+                y.values[i] = c;
+                candidates.push_back(y);
+            }
+    return candidates;
+}
+inline std::vector<_ListInput> _shrink(const _Gen &g, const _ListInput &x) {
+    std::vector<_ListInput> candidates;
+    for (const auto &values : _shrink(g, x.values)) candidates.push_back({values});
+    return candidates;
+}
+
+template <size_t I = 0, typename... Ts>
+void _shrink_tuple(const _Gen &g, const std::tuple<Ts...> &x, std::vector<std::tuple<Ts...>> &candidates) {
+    if constexpr (I < sizeof...(Ts)) {
+        for (const auto &c : _shrink(g, std::get<I>(x))) {
+            std::tuple<Ts...> y = x;
+            std::get<I>(y) = c;
+            candidates.push_back(y);
+        }
+        _shrink_tuple<I + 1>(g, x, candidates);
+    }
+}
+
+// Print values in LeetCode syntax, so that inputs can be copied to custom test cases.
+template <typename T>
+void _print_lc(std::ostream &out, const T &x) { out << x; }
+inline void _print_lc(std::ostream &out, const bool &x) { out << (x ? "true" : "false"); }
+inline void _print_lc(std::ostream &out, const char &x) { out << '"' << x << '"'; }
+inline void _print_lc(std::ostream &out, const std::string &x) { out << '"' << x << '"'; }
+inline void _print_lc(std::ostream &out, const _ListInput &x) { _print_lc(out, x.values); }
+inline void _print_lc(std::ostream &out, const _TreeInput &x) {
+    size_t n = x.values.size();
+    while (n > 0 && x.values[n - 1] == NONE) --n;
+    out << "[";
+    for (size_t i = 0; i < n; ++i) {
+        if (i > 0) out << ",";
+        if (x.values[i] == NONE) out << "null";
+        else out << x.values[i];
+    }
+    out << "]";
+}
+template <typename T>
+void _print_lc(std::ostream &out, const std::vector<T> &x) {
+    out << "[";
+    for (size_t i = 0; i < x.size(); ++i) {
+        if (i > 0) out << ",";
+        _print_lc(out, (T) x[i]);
+    }
+    out << "]";
+}
+
+template <typename... Ts>
+void _print_stress_input(const std::vector<std::string> &names, const std::tuple<Ts...> &args) {
+    size_t idx = 0;
+    std::apply([&](const auto &...xs) {
+        ((std::cerr << names[idx++] << " = ", _print_lc(std::cerr, xs), std::cerr << std::endl), ...);
+    }, args);
+}
+
+// Run `check(args, verbose)` on random inputs until it returns `false`, i.e. when the solution disagrees with the brute
+// force. The failing input is then greedily shrunk to a minimal reproducer, which is printed in LeetCode syntax.
+template <typename Args, typename Check>
+int _stress(long long iterations, Check check) {
+    unsigned long long seed = (unsigned long long) _env_int("LCHELPER_STRESS_SEED", (long long) std::random_device()());
+    _Gen g(seed);
+    Args args;
+    for (long long it = 0; it < iterations; ++it) {
+        std::apply([&](auto &...xs) { (_random(g, xs), ...); }, args);
+        if (check(args, false)) continue;
+
+        long long budget = _env_int("LCHELPER_STRESS_SHRINK_LIMIT", 10000);
+        for (bool progress = true; progress && budget > 0;) {
+            progress = false;
+            std::vector<Args> candidates;
+            _shrink_tuple(g, args, candidates);
+            for (const Args &c : candidates) {
+                if (--budget < 0) break;
+                if (!check(c, false)) {
+                    args = c;
+                    progress = true;
+                    break;
+                }
+            }
+        }
+        std::cerr << "Stress test\033[1;31m [WRONG]\033[0m mismatch on random input " << it + 1
+                  << " (seed " << seed << "), minimized input:" << std::endl;
+        check(args, true);
+        return 1;
+    }
+    std::cerr << "Stress test\033[1;32m [OK]\033[0m passed " << iterations << " random inputs (seed " << seed << ")"
+              << std::endl;
+    return 0;
+}
+
+#endif  // LCHELPER_STRESS || LCHELPER_BENCH
+
+#ifdef LCHELPER_BENCH
+
+// Prevent the compiler from optimizing away computation of the value.
+template <typename T>
+inline void _do_not_optimize(const T &x) { asm volatile("" : : "g"(&x) : "memory"); }
+
+// Time `run(args)` on random inputs of geometrically growing sizes between `min_n` and `max_n`. Arrays, strings,
+// trees, and lists have `n` elements, while grids have about `n` cells. Each size is measured several times and the
+// fastest run is reported. Larger sizes are skipped once a run exceeds the time limit.
+template <typename Args, typename Run>
+int _bench(long long min_n, long long max_n, Run run) {
+    unsigned long long seed = (unsigned long long) _env_int("LCHELPER_STRESS_SEED", (long long) std::random_device()());
+    int points = (int) std::max(2LL, _env_int("LCHELPER_BENCH_POINTS", 8));
+    int repeats = (int) std::max(1LL, _env_int("LCHELPER_BENCH_REPEATS", 3));
+    long long time_limit_ns = _env_int("LCHELPER_BENCH_TIME_LIMIT_US", 2000000) * 1000;
+    _Gen g(seed);
+    Args args;
+    long long prev_n = 0;
+    for (int i = 0; i < points; ++i) {
+        long long n = std::llround(min_n * std::pow((double) max_n / min_n, (double) i / (points - 1)));
+        if (n == prev_n) continue;
+        prev_n = n;
+        g.min_size = g.max_size = (int) n;
+        g.grid_min_size = g.grid_max_size = std::max(1, (int) std::lround(std::sqrt((double) n)));
+        long long best = LLONG_MAX;
+        for (int r = 0; r < repeats; ++r) {
+            std::apply([&](auto &...xs) { (_random(g, xs), ...); }, args);
+            best = std::min(best, run(args));
+        }
+        std::cerr << "Benchmark n=" << n << " time_ns=" << best << std::endl;
+        if (best > time_limit_ns) {
+            std::cerr << "Benchmark stopped: time limit of " << time_limit_ns / 1000 << " us exceeded" << std::endl;
+            break;
+        }
+    }
+    return 0;
+}
+
+#endif  // LCHELPER_BENCH
+
 #endif  // TESTING_H
 """
 
@@ -268,7 +1368,54 @@ def get_problem_file_dir(idx: int, problem: Problem) -> str:
     return f"{chr(ord('A') + idx)}_{problem.name}"
 
 
+class ConstantPool:
+    r"""Constants shared by the test functions of a problem. Long literals (e.g. large arrays) that occur more than once
+    in the examples are declared once, and referenced by name wherever they are used.
+
+    Literals are counted with :meth:`add` before generating code, and then looked up with :meth:`get`.
+    """
+
+    def __init__(self, name_format: str, min_length: int):
+        r"""Create an empty pool.
+
+        :param name_format: Format of constant names, e.g. ``"_const{}"``, where ``{}`` is replaced by an index.
+        :param min_length: Literals shorter than this are never shared.
+        """
+        self.name_format = name_format
+        self.min_length = min_length
+        self._counts: Dict[Tuple[str, str], int] = {}
+        self._names: Dict[Tuple[str, str], str] = {}
+
+    def add(self, type_name: str, literal: str) -> None:
+        r"""Count an occurrence of a literal of the given type."""
+        if len(literal) >= self.min_length:
+            key = (type_name, literal)
+            self._counts[key] = self._counts.get(key, 0) + 1
+
+    def get(self, type_name: str, literal: str) -> Optional[str]:
+        r"""Return the name of the constant for a literal, or ``None`` if the literal is not shared."""
+        key = (type_name, literal)
+        if self._counts.get(key, 0) < 2:
+            return None
+        name = self._names.get(key)
+        if name is None:
+            name = self._names[key] = self.name_format.format(len(self._names))
+        return name
+
+    def constants(self) -> List[Tuple[str, str, str]]:
+        r"""Return the constants that were looked up, as tuples of (name, type, literal), in order of first use."""
+        return [(name, type_name, literal) for (type_name, literal), name in self._names.items()]
+
+
 class CodeGen(abc.ABC):
+    # Examples of interactive problems with at least this many interactions are tested by replaying the interactions
+    # from data in a loop, instead of generating statements for each interaction. This keeps the size (and compile time)
+    # of generated code constant for design problems with long sequences of operations.
+    REPLAY_MIN_INTERACTIONS = 32
+    # Literals in examples that are at least this long, and occur more than once, are shared as constants. See
+    # :class:`ConstantPool`.
+    POOL_MIN_LENGTH = 64
+
     @property
     @abc.abstractmethod
     def language(self) -> str:
@@ -316,12 +1463,14 @@ class CodeGen(abc.ABC):
         return ""
 
     @classmethod
-    def write_and_backup(cls, path: str, contents: str) -> None:
+    def write_and_backup(cls, path: str, contents: Union[str, bytes]) -> None:
         r"""Check if there is already a file at the given path, create a backup if there is, and then write contents to
         the file.
         """
+        if isinstance(contents, str):
+            contents = contents.encode()
         if os.path.exists(path):
-            with open(path, "r") as f:
+            with open(path, "rb") as f:
                 original_contents = f.read()
             if original_contents != contents:
                 # Only create backup if contents differ.
@@ -332,7 +1481,7 @@ class CodeGen(abc.ABC):
                 dest_path = f"{file_name}_{timestamp}{file_ext}"
                 shutil.move(path, dest_path)
                 log(f"File '{path}' is modified, backup created at '{dest_path}'", "warning")
-        with open(path, "w") as f:
+        with open(path, "wb") as f:
             f.write(contents)
 
     def replace_section(self, code: Code, replacements: Dict[str, Code], *, ignore_errors: bool = False) -> Code:
@@ -379,6 +1528,56 @@ class CodeGen(abc.ABC):
         """
         raise NotImplementedError
 
+    @classmethod
+    def example_values(cls, signature: Signature) -> Iterator[Tuple[Any, str]]:
+        r"""Iterate over the values in the examples of a problem: arguments, and expected outputs of functions that
+        return a value.
+
+        :param signature: The parsed signature of the problem.
+        :return: An iterator over tuples of (value, type name).
+        """
+        if isinstance(signature, InteractiveProblemSignature):
+            func_map = {func_sig.name: func_sig for func_sig in signature.functions}
+            for example in signature.examples:
+                for ex in example:
+                    func_sig = func_map[ex.function]
+                    for type_name, arg_name in func_sig.arguments:
+                        yield ex.input[arg_name], type_name
+                    if ex.function != signature.class_name and func_sig.return_type != "void":
+                        yield ex.output, func_sig.return_type
+        else:
+            func_sig = signature.function
+            for example in signature.examples:
+                yield example.output, func_sig.return_type
+                for type_name, arg_name in func_sig.arguments:
+                    yield example.input[arg_name], type_name
+
+    def use_replay(self, signature: InteractiveProblemSignature) -> bool:
+        r"""Whether examples of the interactive problem should be tested by replaying interactions from data. See
+        :attr:`REPLAY_MIN_INTERACTIONS`.
+        """
+        return any(len(example) >= self.REPLAY_MIN_INTERACTIONS for example in signature.examples)
+
+    @classmethod
+    def replay_data(cls, signature: InteractiveProblemSignature, example: List[Interaction]) -> Tuple[str, str, str]:
+        r"""Encode the interactions of an example as data in LeetCode syntax, the same format as custom test cases.
+
+        :param signature: The parsed signature of the problem.
+        :param example: The interactions of the example.
+        :return: A tuple of three values: the list of function names, the list of argument lists, and the list of
+            expected outputs (``null`` for the constructor and functions returning ``void``).
+        """
+        func_map = {func_sig.name: func_sig for func_sig in signature.functions}
+        functions, arguments, outputs = [], [], []
+        for ex in example:
+            func_sig = func_map[ex.function]
+            functions.append(ex.function)
+            arguments.append([ex.input[arg_name] for _, arg_name in func_sig.arguments])
+            returns_value = ex.function != signature.class_name and func_sig.return_type != "void"
+            outputs.append(ex.output if returns_value else None)
+        return tuple(json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+                     for value in (functions, arguments, outputs))
+
     def generate_additional_files(self, project_path: str, problems: List[Problem],
                                   signatures: List[Signature]) -> None:
         r"""Generate additional files that the project requires, besides those in :attr:`EXTRA_FILES` that are written
@@ -399,88 +1598,112 @@ class CodeGen(abc.ABC):
         """
         return f"{chr(ord('A') + idx)}_{problem.name}/{problem.name}{self.code_extension}"
 
-    def create_project(self, project_path: str, problems: List[Problem], site: str, debug: bool = False) -> None:
-        r"""Create the folder for the project and generate code and supporting files.
+    def _problem_code(self, template: Code, problem: Problem, site: str) -> str:
+        with trace_span("generate_code", "codegen", problem=problem.name, language=self.language):
+            problem_signature = parse_problem(problem, site)
+            solution_code, test_code = self.generate_code(problem, problem_signature)
+            problem_code = self.replace_section(template, {
+                "SOLUTION CLASS": solution_code,
+                "TEST": test_code,
+            })
+        return "\n".join(problem_code) + "\n"
+
+    def _template(self) -> Code:
+        template = self.template_code.strip().split("\n")
+        user_template = self.user_template_code.strip().split("\n")
+        return self.replace_section(template, {"USER TEMPLATE": user_template})
+
+    def _extra_files(self) -> Iterator[Tuple[str, bytes]]:
+        for tmpl_name, tmpl_code in self.extra_files.items():
+            yield tmpl_name, (tmpl_code.strip() + "\n").encode()
+
+    def generate_project(self, problems: List[Problem], site: str,
+                         debug: bool = False) -> Iterator[Tuple[str, bytes]]:
+        r"""Generate code and supporting files for a project, without touching the filesystem. Files are generated
+        lazily, one problem at a time.
 
-        :param project_path: Path to the project folder.
         :param problems: List of problem descriptions to generate code for.
         :param site: The LeetCode site where problems are crawled. Different sites may have slightly different syntax
             (or language-dependent markings).
-        :param debug: If ``True``, exceptions will not be caught. This is probably only useful when the ``--debug``
-            flag is set, in which case the Python debugger is hooked to handle exceptions.
+        :param debug: If ``True``, exceptions will not be caught. Otherwise, problems that fail to generate are logged
+            and skipped.
+        :return: An iterator over tuples of (file path relative to the project folder, file contents). Paths use ``/``
+            as the separator.
         """
-        if not os.path.exists(project_path):
-            os.makedirs(project_path)
-        template = self.template_code.strip().split("\n")
-        user_template = self.user_template_code.strip().split("\n")
-        template = self.replace_section(template, {"USER TEMPLATE": user_template})
-
-        signatures = []
+        template = self._template()
         for idx, problem in enumerate(problems):
             try:
-                problem_signature = parse_problem(problem, site)
-                signatures.append(problem_signature)
-                solution_code, test_code = self.generate_code(problem, problem_signature)
-                problem_code = self.replace_section(template, {
-                    "SOLUTION CLASS": solution_code,
-                    "TEST": test_code,
-                })
-                code_dir_path = os.path.join(project_path, get_problem_dir(idx, problem))
-                if not os.path.exists(code_dir_path):
-                    os.makedirs(code_dir_path)
-                in_txt_path = os.path.join(project_path, get_problem_file_dir(idx, problem)+'/in.txt')
-                code_path = os.path.join(project_path, self.get_problem_file_name(idx, problem))
-                boilerplate_path = os.path.join(project_path, get_problem_file_dir(idx, problem)+'/_boilerplate.hpp')
-                testing_path = os.path.join(project_path, get_problem_file_dir(idx, problem) + '/_testing.h')
-                transformer_path = os.path.join(project_path, get_problem_file_dir(idx, problem) + '/transformer.py')
-                self.write_and_backup(in_txt_path, "")
-                self.write_and_backup(transformer_path, Transformer_code)
-                self.write_and_backup(boilerplate_path, Boilerplate_Code)
-                self.write_and_backup(testing_path, Testing_Code)
-                self.write_and_backup(code_path, "\n".join(problem_code) + "\n")
+                code = self._problem_code(template, problem, site)
             except Exception as e:
                 if debug:
                     raise
                 traceback.print_exc()
                 log(f"Exception occurred while processing \"{problem.name}\". exception:{e}")
-
-        # for tmpl_name, tmpl_code in self.extra_files.items():
-        #     with open(os.path.join(project_path, tmpl_name), "w") as f:
-        #         f.write(tmpl_code.strip() + "\n")
-
-    def create_project_single_problem(self, project_path: str, problem: Problem, site: str, debug: bool = False) -> None:
-        if not os.path.exists(project_path):
-            os.makedirs(project_path)
-        template = self.template_code.strip().split("\n")
-        user_template = self.user_template_code.strip().split("\n")
-        template = self.replace_section(template, {"USER TEMPLATE": user_template})
-
-        signatures = []
+                continue
+            problem_dir = get_problem_dir(idx, problem)
+            yield f"{problem_dir}/in.txt", b""
+            yield f"{problem_dir}/_boilerplate.hpp", Boilerplate_Code.encode()
+            yield f"{problem_dir}/_testing.h", Testing_Code.encode()
+            yield self.get_problem_file_name(idx, problem), code.encode()
+        yield from self._extra_files()
+
+    def generate_single_problem_project(self, problem: Problem, site: str,
+                                       debug: bool = False) -> Iterator[Tuple[str, bytes]]:
+        r"""Generate code and supporting files for a project containing a single problem, without touching the
+        filesystem. Files are stored directly under the project folder.
+
+        :param problem: The problem description to generate code for.
+        :param site: The LeetCode site where the problem is crawled.
+        :param debug: If ``True``, exceptions will not be caught.
+        :return: An iterator over tuples of (file path relative to the project folder, file contents).
+        """
         try:
-            problem_signature = parse_problem(problem, site)
-            signatures.append(problem_signature)
-            solution_code, test_code = self.generate_code(problem, problem_signature)
-            problem_code = self.replace_section(template, {
-                "SOLUTION CLASS": solution_code,
-                "TEST": test_code,
-            })
-            in_txt_path = os.path.join(project_path, 'in.txt')
-            problem_name = '_'.join(problem.name.strip().lower().split(' '))
-            code_path = os.path.join(project_path, f'{problem_name}.cc')
-            transformer_path = os.path.join(project_path, 'transformer.py')
-            boilerplate_path = os.path.join(project_path, '_boilerplate.hpp')
-            testing_path = os.path.join(project_path, '_testing.h')
-            self.write_and_backup(boilerplate_path, Boilerplate_Code)
-            self.write_and_backup(testing_path, Testing_Code)
-            self.write_and_backup(in_txt_path, "")
-            self.write_and_backup(transformer_path, Transformer_code)
-
-            self.write_and_backup(code_path, "\n".join(problem_code) + "\n")
+            code = self._problem_code(self._template(), problem, site)
         except Exception:
             if debug:
                 raise
             traceback.print_exc()
             log(f"Exception occurred while processing \"{problem.name}\"", "error")
-        # for tmpl_name, tmpl_code in self.extra_files.items():
-        #     with open(os.path.join(project_path, tmpl_name), "w") as f:
-        #         f.write(tmpl_code.strip() + "\n")
+        else:
+            problem_name = '_'.join(problem.name.strip().lower().split(' '))
+            yield "_boilerplate.hpp", Boilerplate_Code.encode()
+            yield "_testing.h", Testing_Code.encode()
+            yield "in.txt", b""
+            yield f"{problem_name}.cc", code.encode()
+        yield from self._extra_files()
+
+    def write_files(self, project_path: str, files: Iterable[Tuple[str, bytes]]) -> None:
+        r"""Write generated files to the project folder, creating folders as needed. Existing files that were modified
+        are backed up (see :meth:`write_and_backup`).
+
+        :param project_path: Path to the project folder.
+        :param files: An iterator over tuples of (file path relative to the project folder, file contents), as
+            returned by :meth:`generate_project`.
+        """
+        created_dirs = set()
+        for path, contents in files:
+            with trace_span("write_file", "codegen", path=path, language=self.language):
+                file_path = os.path.join(project_path, *path.split("/"))
+                directory = os.path.dirname(file_path)
+                if directory not in created_dirs:
+                    os.makedirs(directory, exist_ok=True)
+                    created_dirs.add(directory)
+                self.write_and_backup(file_path, contents)
+
+    def create_project(self, project_path: str, problems: List[Problem], site: str, debug: bool = False) -> None:
+        r"""Create the folder for the project and generate code and supporting files.
+
+        :param project_path: Path to the project folder.
+        :param problems: List of problem descriptions to generate code for.
+        :param site: The LeetCode site where problems are crawled. Different sites may have slightly different syntax
+            (or language-dependent markings).
+        :param debug: If ``True``, exceptions will not be caught. This is probably only useful when the ``--debug``
+            flag is set, in which case the Python debugger is hooked to handle exceptions.
+        """
+        os.makedirs(project_path, exist_ok=True)
+        self.write_files(project_path, self.generate_project(problems, site, debug))
+
+    def create_project_single_problem(self, project_path: str, problem: Problem, site: str,
+                                      debug: bool = False) -> None:
+        os.makedirs(project_path, exist_ok=True)
+        self.write_files(project_path, self.generate_single_problem_project(problem, site, debug))
@@ -2,7 +2,9 @@ import os
 from collections import defaultdict
 from typing import Any, Dict, List, Optional, Tuple, Union
 
-from lchelper.codegen.base import Code, CodeGen, Signature
+from lchelper.codegen.base import Code, CodeGen, ConstantPool, Signature
+from lchelper.codegen.literals import cpp_literal
+from lchelper.codegen.types import CppType, parse_cpp_type
 from lchelper.common import *
 from lchelper.logging import log
 from lchelper.utils import remove_affix
@@ -13,6 +15,8 @@ __all__ = [
 
 
 class CppCodeGen(CodeGen):
+    STRESS_TYPES = {"int", "long", "long long", "double", "bool", "char", "string"}
+
     @property
     def language(self) -> str:
         return "C++"
@@ -76,42 +80,45 @@ const int RANGE = 1e9+7;
         # Generate solution code as the crawled template.
         solution_code = problem.code.copy()
 
-        def to_str(val: Any, type_name_input=None) -> str:
-            if isinstance(val, list):
-                type_name_input = type_name_input
-                if type_name_input.startswith('vector<'):
-                    type_name_input = type_name_input[7:-1]
-                return "{" + ", ".join(to_val(x, type_name_input) for x in val) + "}"
-            if isinstance(val, str):
-                if type_name_input is None or type_name_input == 'string':
-                    return f'"{val}"'
-                return f"'{val}'"
-            if isinstance(val, bool):  # bool is a subtype of int
-                return "true" if val else "false"
-            if isinstance(val, (int, float)):
-                return str(val)
-            if val is None:
-                return "INT_MIN"
-            # log(f"val:{val}, type_name_input:{type_name_input}")
-            assert False
-
-        def to_tree(parent: List[Optional[int]]) -> str:
-            return f"_construct_tree({{{', '.join('NONE' if x is None else str(x) for x in parent)}}})"
-
-        def to_val(val: Any, type_name: str) -> str:
-            type_name_no_ref = remove_cv_ref(type_name)
-            type_name_no_space = type_name_no_ref.replace(' ', '')
-            if type_name_no_space == "TreeNode*":
+        def to_str(val: Any, type_name: Union[str, CppType, None] = None) -> str:
+            return cpp_literal(val, type_name)
+
+        def to_literal(val: Any, type_name: str) -> Tuple[str, str, str]:
+            # Return the type of the literal for a value, the literal, and code that builds the value from the literal
+            # (with `{}` standing for the literal). Trees and linked lists are built from their array representation.
+            typ = parse_cpp_type(type_name).value_type
+            if typ.is_tree:
+                if not isinstance(val, list):
+                    val = [val]
+                return "vector<int>", f"{{{', '.join('NONE' if x is None else str(x) for x in val)}}}", \
+                       "_construct_tree({})"
+            if typ.is_linked_list:
                 if not isinstance(val, list):
                     val = [val]
-                return to_tree(val)
-            return to_str(val, type_name_no_space)
+                return "vector<int>", f"{{{', '.join(str(x) for x in val)}}}", "_construct_list({})"
+            return str(typ), cpp_literal(val, typ), "{}"
+
+        # Long literals that occur more than once in the examples are declared once as constants.
+        pool = ConstantPool("_const{}", self.POOL_MIN_LENGTH)
+        literals: Dict[Tuple[int, str], Tuple[str, str, str]] = {}
+
+        def example_literal(val: Any, type_name: str) -> Tuple[str, str, str]:
+            key = (id(val), type_name)
+            if key not in literals:
+                literals[key] = to_literal(val, type_name)
+            return literals[key]
+
+        def example_val(val: Any, type_name: str) -> str:
+            # Return code for a value in an example, which may refer to a shared constant.
+            literal_type, literal, builder = example_literal(val, type_name)
+            name = pool.get(literal_type, literal)
+            return builder.format(literal if name is None else name)
 
         def to_args(input: Dict[str, Any], func_sig: FunctionSignature) -> List[str]:
             # Return list of assignments.
             assignments = []
             for type_name, arg_name in func_sig.arguments:
-                assignments.append(assign(f"{func_sig.name}_{arg_name}", to_val(input[arg_name], type_name)))
+                assignments.append(assign(f"{func_sig.name}_{arg_name}", example_val(input[arg_name], type_name)))
             return assignments
 
         def call(func_name: str, args: List[str]) -> str:
@@ -123,21 +130,52 @@ const int RANGE = 1e9+7;
             else:
                 return f"{class_name} {obj_name};"
 
-        def remove_cv_ref(typ: str) -> str:
-            while True:
-                if typ.startswith("const"):
-                    typ = typ[len("const"):]
-                elif typ.startswith("volatile"):
-                    typ = typ[len("volatile"):]
-                elif typ.endswith("&"):
-                    typ = typ[:-1]
-                else:
-                    break
-                typ = typ.strip()
-            return typ
+        def value_type(type_name: str) -> str:
+            # Return the type of variables that store values of the type, i.e., without `const` and references.
+            return str(parse_cpp_type(type_name).value_type)
+
+        def stress_type(typ: CppType) -> Optional[str]:
+            # Return the type used to generate random values of the argument type in stress tests, or `None` if random
+            # values of the type cannot be generated.
+            typ = typ.value_type
+            if typ.is_tree:
+                return "_TreeInput"
+            if typ.is_linked_list:
+                return "_ListInput"
+            if typ.is_vector:
+                inner_type = stress_type(typ.element)
+                if inner_type is None or inner_type.startswith("_"):
+                    return None
+                return f"vector<{inner_type}>"
+            if str(typ) in self.STRESS_TYPES:
+                return str(typ)
+            return None
+
+        def string_literal(data: str) -> str:
+            # Use raw string literals where possible, so that data in LeetCode syntax is not escaped.
+            if ')"' not in data:
+                return f'R"({data})"'
+            return '"' + data.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+        def readable(typ: CppType) -> bool:
+            # Whether values of the type can be read from custom test cases by `_read` in the testing code.
+            typ = typ.value_type
+            if typ.is_tree or typ.is_linked_list:
+                return True
+            if typ.is_vector:
+                return readable(typ.element)
+            return str(typ) in self.STRESS_TYPES
+
+        def read_args(func_sig: FunctionSignature, prefix: str = "") -> List[str]:
+            # Return statements that declare the arguments and read them from the custom test case reader `_in`.
+            statements = []
+            for type_name, arg_name in func_sig.arguments:
+                statements.append(decl(type_name, prefix + arg_name))
+                statements.append(f"_read(_in, {prefix + arg_name});")
+            return statements
 
         def decl(type_name: str, obj_name: Union[str, List[str]]) -> str:
-            type_name = remove_cv_ref(type_name)
+            type_name = value_type(type_name)
             if isinstance(obj_name, list):
                 return f"{type_name} {', '.join(obj_name)};"
             return f"{type_name} {obj_name};"
@@ -146,38 +184,99 @@ const int RANGE = 1e9+7;
             return f"{obj_name} = {value};"
 
         def decl_assign(ret_type: str, obj_name: str, value: str) -> str:
-            ret_type = remove_cv_ref(ret_type)
+            ret_type = value_type(ret_type)
             return f"{ret_type} {obj_name} = {value};"
 
+        for val, type_name in self.example_values(signature):
+            pool.add(*example_literal(val, type_name)[:2])
+
         # Generate test code as a function per example.
         test_functions = []
         instance_name = "_sol"
         if isinstance(signature, InteractiveProblemSignature):
             func_map: Dict[str, FunctionSignature] = {func_sig.name: func_sig for func_sig in signature.functions}
+            returns_value = {func_sig.name: func_sig.name != signature.class_name and func_sig.return_type != "void"
+                             for func_sig in signature.functions}
+            args_readable = all(readable(parse_cpp_type(type_name)) for func_sig in signature.functions
+                                for type_name, _ in func_sig.arguments)
+            replayable = args_readable and all(readable(parse_cpp_type(func_sig.return_type))
+                                               for func_sig in signature.functions if returns_value[func_sig.name])
+            replay = replayable and self.use_replay(signature)
+            if replayable:
+                # Generate a method table that reads the arguments and expected output of an interaction and calls the
+                # function. Long examples, and custom test cases with expected outputs, are replayed through the table.
+                entries = []
+                for func_sig in signature.functions:
+                    args = [arg_name for _, arg_name in func_sig.arguments]
+                    if func_sig.name == signature.class_name:
+                        stmts = [*read_args(func_sig), "_skip_null(_out);",
+                                 f"_obj.reset(new {call(signature.class_name, args)});"]
+                    elif not returns_value[func_sig.name]:
+                        stmts = [*read_args(func_sig), "_skip_null(_out);", f"_obj->{call(func_sig.name, args)};"]
+                    else:
+                        stmts = [decl(func_sig.return_type, "_ret_ans"),
+                                 "_read_value(_out, _ret_ans);",
+                                 "_Memory _memory;",
+                                 *read_args(func_sig),
+                                 "_memory.start();",
+                                 "_Timer _timer;",
+                                 decl_assign(func_sig.return_type, "_ret", f"_obj->{call(func_sig.name, args)}"),
+                                 'test(_msg, _ret_ans, _ret, _timer.elapsed_us(), _memory);']
+                    entries.extend([
+                        f"{{{to_str(func_sig.name)}, [](std::unique_ptr<{signature.class_name}> &_obj, _Reader &_in, "
+                        f"_Reader &_out, const char *_msg) {{",
+                        *["    " + line for line in stmts],
+                        "}},"])
+                test_functions.append([
+                    "void replay_example(const char *_name, const char *_input, const char *_output) {",
+                    f"    static const std::unordered_map<std::string, _ReplayMethod<{signature.class_name}>> "
+                    f"_methods = {{",
+                    *["        " + line for line in entries],
+                    "    };",
+                    "    _replay(_name, _input, _output, _methods);",
+                    "}"])
             for idx, example in enumerate(signature.examples):
+                if replay:
+                    functions, arguments, outputs = self.replay_data(signature, example)
+                    test_functions.append([
+                        f"void test_example_{idx}() {{",
+                        f"    replay_example({to_str(f'Example - {idx}')},",
+                        f"                   {string_literal(functions)}",
+                        f"                   {string_literal(arguments)},",
+                        f"                   {string_literal(outputs)});",
+                        "}"])
+                    continue
                 statements = []
                 for ex_idx, ex in enumerate(example):
                     func_sig = func_map[ex.function]
-                    statements.extend(to_args(ex.input, func_sig))
                     args = [f"{func_sig.name}_{arg_name}" for _, arg_name in func_sig.arguments]
                     if ex.function == signature.class_name:
+                        statements.extend(to_args(ex.input, func_sig))
                         ctor_stmt = ctor(signature.class_name, instance_name, args)
                         statements.append(ctor_stmt)
                     else:
                         ret_name = f"_ret{ex_idx}"
                         if func_sig.return_type != "void":
                             ret_ans_var = f"_ret_ans{ex_idx}"
+                            timer_name = f"_timer{ex_idx}"
+                            memory_name = f"_memory{ex_idx}"
                             stmts = [
-                                decl_assign(func_sig.return_type, ret_ans_var, to_val(ex.output, func_sig.return_type)),
+                                decl_assign(func_sig.return_type, ret_ans_var,
+                                            example_val(ex.output, func_sig.return_type)),
+                                f"_Memory {memory_name};",
+                                *to_args(ex.input, func_sig),
+                                f"{memory_name}.start();",
+                                f"_Timer {timer_name};",
                                 decl_assign(func_sig.return_type, ret_name,
                                             f"{instance_name}.{call(ex.function, args)}"),
                                 # f"cout << \"Expected: \" << {ret_ans_var} << \" My Answer: \", {ret_name});"
                                 # f"cout << \" Expected:\" << {ret_ans_var} << \" My Answer:\" << {ret_name} << endl;"
                                 call("test", [to_str(f"Example - {idx} - Interaction {ex_idx}"),
-                                              ret_ans_var, ret_name]) + ";",
+                                              ret_ans_var, ret_name, f"{timer_name}.elapsed_us()", memory_name]) + ";",
                             ]
                             statements.extend(stmts)
                         else:
+                            statements.extend(to_args(ex.input, func_sig))
                             stmt = f"{instance_name}.{call(ex.function, args)};"
                             statements.append(stmt)
                 declarations = defaultdict(list)
@@ -191,27 +290,96 @@ const int RANGE = 1e9+7;
                     "}"]
                 test_functions.append(test_fn)
 
+            # Generate code for custom test cases, which consist of a list of function names followed by a list of
+            # argument lists, as on LeetCode, optionally followed by the list of expected outputs. The lists are read
+            # as text first, since the expected outputs come after all arguments. Cases with expected outputs are
+            # replayed, while the outputs of other cases are printed.
+            custom_code = []
+            if args_readable:
+                branches = []
+                for func_sig in signature.functions:
+                    args = [arg_name for _, arg_name in func_sig.arguments]
+                    if func_sig.name == signature.class_name:
+                        stmts = [f"_obj.reset(new {call(signature.class_name, args)});", 'std::cerr << "null";']
+                    elif func_sig.return_type == "void":
+                        stmts = [f"_obj->{call(func_sig.name, args)};", 'std::cerr << "null";']
+                    else:
+                        stmts = [decl_assign(func_sig.return_type, "_ret", f"_obj->{call(func_sig.name, args)}"),
+                                 "_print_result(_ret);"]
+                    branches.extend([
+                        f"{'if' if len(branches) == 0 else '} else if'} (_functions[_i] == {to_str(func_sig.name)}) {{",
+                        *["    " + line for line in read_args(func_sig) + stmts]])
+                if replayable:
+                    expected_stmts = ["_Reader *_expected = _expected_output(_file, _out);",
+                                      "if (_expected != nullptr) {",
+                                      "    replay_example(_name.c_str(), _input.c_str(), "
+                                      "_expected->read_raw().c_str());",
+                                      "    return;",
+                                      "}"]
+                else:
+                    expected_stmts = ["if (_expected_output(_file, _out) != nullptr)",
+                                      '    _file.fail("expected outputs are not supported for this problem");']
+                custom_code = [
+                    "void custom_case(_Reader &_file, _Reader *_out, const std::string &_name) {",
+                    "    std::string _input = _file.read_raw();",
+                    '    _input += " " + _file.read_raw();',
+                    *["    " + line for line in expected_stmts],
+                    "    _Reader _in(_input.c_str(), _name);",
+                    "    vector<string> _functions;",
+                    "    _read(_in, _functions);",
+                    "    _in.skip_separators();",
+                    "    _in.expect('[');",
+                    f"    std::unique_ptr<{signature.class_name}> _obj;",
+                    "    _Timer _timer;",
+                    '    std::cerr << _name << std::endl << "Output: [";',
+                    "    for (size_t _i = 0; _i < _functions.size(); ++_i) {",
+                    "        if (_i > 0) {",
+                    "            _in.expect(',');",
+                    '            std::cerr << ", ";',
+                    "        }",
+                    "        _in.expect('[');",
+                    *["        " + line for line in branches],
+                    "        } else {",
+                    '            _in.fail("unknown function \'" + _functions[_i] + "\'");',
+                    "        }",
+                    "        _in.expect(']');",
+                    "    }",
+                    "    _in.expect(']');",
+                    '    std::cerr << "]" << std::endl << "Finished in " << _timer.elapsed_us() << " us" << std::endl;',
+                    "}"]
+                test_functions.append(custom_code)
+
             main_code = [
-                "int main() {",
+                "int main(int argc, char **argv) {",
+                *(['    if (argc > 1 && std::string(argv[1]) == "custom")',
+                   "        return _run_custom(argc > 2 ? argv[2] : _custom_input_path(__FILE__), custom_case);"]
+                  if custom_code else []),
                 *["    " + f"test_example_{idx}();" for idx in range(len(signature.examples))],
+                *(["    return _run_custom(_custom_input_path(__FILE__), custom_case);"] if custom_code else []),
                 "}"]
         else:
             func_sig = signature.function
             for idx, example in enumerate(signature.examples):
-                statements = []
+                ret_name = "_ret"
+                ret_ans_var = "_ret_ans"
+                # The expected answer is constructed first, so that heap usage of the arguments can be measured.
+                statements = [
+                    decl_assign(func_sig.return_type, ret_ans_var, example_val(example.output, func_sig.return_type)),
+                    "_Memory _memory;",
+                ]
                 for type_name, arg_name in func_sig.arguments:
                     # log(f"type_name:{type_name}, arg_name:{arg_name}, example.input[arg_name]:{example.input[arg_name]},"
                     #     f" example:{example}")
-                    stmt = decl_assign(type_name, arg_name, to_val(example.input[arg_name], type_name))
+                    stmt = decl_assign(type_name, arg_name, example_val(example.input[arg_name], type_name))
                     statements.append(stmt)
                 args = [arg_name for _, arg_name in func_sig.arguments]
-                ret_name = "_ret"
-                ret_ans_var = "_ret_ans"
                 stmts = [
-                    decl_assign(func_sig.return_type, ret_ans_var, to_val(example.output, func_sig.return_type)),
+                    "_memory.start();",
+                    "_Timer _timer;",
                     decl_assign(func_sig.return_type, ret_name, f"{instance_name}.{call(func_sig.name, args)}"),
                     # f"debug(\"Expected: \", {ret_ans_var}, \"My Answer: \", {ret_name});"
-                    call("test", [to_str(f"Example - {idx}"), ret_ans_var, ret_name]) + ";",
+                    call("test", [to_str(f"Example - {idx}"), ret_ans_var, ret_name, "_timer.elapsed_us()",
+                                  "_memory"]) + ";",
                     # f"cout << \" Expected:\" << {ret_ans_var} << \" My Answer:\" << {ret_name} << endl;"
                 ]
                 statements.extend(stmts)
@@ -222,12 +390,136 @@ const int RANGE = 1e9+7;
                     "}"]
                 test_functions.append(test_fn)
 
+            # Generate stress test and benchmark code, which run the solution on random inputs. Stress tests compare
+            # the solution against a brute-force version, while benchmarks time the solution on growing input sizes.
+            random_types = [stress_type(parse_cpp_type(type_name)) for type_name, _ in func_sig.arguments]
+            arg_names = [arg_name for _, arg_name in func_sig.arguments]
+
+            def construct_args(prefix: str) -> List[str]:
+                # Return statements that construct arguments from the tuple of random values `_args`.
+                statements = []
+                for arg_idx, ((type_name, arg_name), typ) in enumerate(zip(func_sig.arguments, random_types)):
+                    value = f"std::get<{arg_idx}>(_args)"
+                    if typ == "_TreeInput":
+                        value = f"_construct_tree({value}.values)"
+                    elif typ == "_ListInput":
+                        value = f"_construct_list({value}.values)"
+                    statements.append(decl_assign(type_name, prefix + arg_name, value))
+                return statements
+
+            if all(typ is not None for typ in random_types):
+                brute_force_code = [
+                    "class BruteForce {" if line.startswith("class Solution") else line for line in problem.code]
+                brute_force_args = ["_brute_" + arg_name for arg_name in arg_names]
+                random_code = [
+                    "#if defined(LCHELPER_STRESS) || defined(LCHELPER_BENCH)",
+                    f"using _RandomArgs = std::tuple<{', '.join(random_types)}>;",
+                    "#endif",
+                    "",
+                    "#ifdef LCHELPER_STRESS",
+                    "// Implement a brute-force solution here, and run `./<problem> stress [iterations]` after",
+                    "// compiling with `-DLCHELPER_STRESS` to compare the solutions on random inputs.",
+                    *brute_force_code,
+                    "",
+                    "bool stress_check(const _RandomArgs &_args, bool _verbose) {",
+                    *["    " + line for line in construct_args("")],
+                    "    " + decl_assign(func_sig.return_type, "_ret", f"Solution().{call(func_sig.name, arg_names)}"),
+                    *["    " + line for line in construct_args("_brute_")],
+                    "    " + decl_assign(func_sig.return_type, "_ret_ans",
+                                        f"BruteForce().{call(func_sig.name, brute_force_args)}"),
+                    "    if (_verbose) {",
+                    f"        _print_stress_input({{{', '.join(to_str(name) for name in arg_names)}}}, _args);",
+                    '        std::cerr << "Expected (brute force): ";',
+                    "        print(_ret_ans);",
+                    '        std::cerr << std::endl << "Received: ";',
+                    "        print(_ret);",
+                    "        std::cerr << std::endl;",
+                    "    }",
+                    "    return _test(_ret_ans, _ret);",
+                    "}",
+                    "#endif  // LCHELPER_STRESS",
+                    "",
+                    "#ifdef LCHELPER_BENCH",
+                    "long long bench_run(const _RandomArgs &_args) {",
+                    *["    " + line for line in construct_args("")],
+                    "    Solution _sol;",
+                    "    _Timer _timer;",
+                    "    " + decl_assign(func_sig.return_type, "_ret", f"_sol.{call(func_sig.name, arg_names)}"),
+                    "    long long _elapsed = _timer.elapsed_ns();",
+                    "    _do_not_optimize(_ret);",
+                    "    return _elapsed;",
+                    "}",
+                    "#endif  // LCHELPER_BENCH"]
+            else:
+                random_code = [
+                    "#if defined(LCHELPER_STRESS) || defined(LCHELPER_BENCH)",
+                    '#error "Random inputs are not supported for the argument types of this problem"',
+                    "#endif"]
+            test_functions.append(random_code)
+
+            # Generate code for custom test cases, which list the arguments of each case in order, as on LeetCode,
+            # optionally followed by the expected output.
+            custom_code = []
+            if all(readable(parse_cpp_type(type_name)) for type_name, _ in func_sig.arguments):
+                if func_sig.return_type == "void":
+                    # Solutions that return nothing modify their first argument in-place.
+                    result_type = func_sig.arguments[0][0] if len(arg_names) > 0 else None
+                    result = arg_names[0] if len(arg_names) > 0 else None
+                    call_stmts = [f"_sol.{call(func_sig.name, arg_names)};"]
+                else:
+                    result_type, result = func_sig.return_type, "_ret"
+                    call_stmts = [decl_assign(func_sig.return_type, "_ret", f"_sol.{call(func_sig.name, arg_names)}")]
+                if result_type is not None and readable(parse_cpp_type(result_type)):
+                    expected_stmts = [decl(result_type, "_ret_ans"),
+                                      "_Reader *_expected = _expected_output(_in, _out);",
+                                      "if (_expected != nullptr) _read(*_expected, _ret_ans);"]
+                    check_stmts = ["if (_expected != nullptr) {",
+                                   f"    test(_name.c_str(), _ret_ans, {result}, _elapsed_us);",
+                                   "    return;",
+                                   "}"]
+                else:
+                    expected_stmts = ["if (_expected_output(_in, _out) != nullptr)",
+                                      '    _in.fail("expected outputs are not supported for this problem");']
+                    check_stmts = []
+                custom_code = [
+                    "void custom_case(_Reader &_in, _Reader *_out, const std::string &_name) {",
+                    *["    " + line for line in read_args(func_sig) + expected_stmts],
+                    "    Solution _sol;",
+                    "    _Timer _timer;",
+                    *["    " + line for line in call_stmts],
+                    "    long long _elapsed_us = _timer.elapsed_us();",
+                    *["    " + line for line in check_stmts],
+                    "    _report_custom(_name, _elapsed_us);",
+                    *([f"    _print_result({result});"] if result is not None else []),
+                    "    std::cerr << std::endl;",
+                    "}"]
+                test_functions.append(custom_code)
+
             main_code = [
-                "int main() {",
+                "int main(int argc, char **argv) {",
+                *(['    if (argc > 1 && std::string(argv[1]) == "custom")',
+                   "        return _run_custom(argc > 2 ? argv[2] : _custom_input_path(__FILE__), custom_case);"]
+                  if custom_code else []),
+                "#ifdef LCHELPER_STRESS",
+                '    if (argc > 1 && std::string(argv[1]) == "stress")',
+                "        return _stress<_RandomArgs>(argc > 2 ? std::atoll(argv[2]) : 1000, stress_check);",
+                "#endif",
+                "#ifdef LCHELPER_BENCH",
+                '    if (argc > 1 && std::string(argv[1]) == "bench")',
+                "        return _bench<_RandomArgs>(argc > 2 ? std::atoll(argv[2]) : 1000,",
+                "                                   argc > 3 ? std::atoll(argv[3]) : 100000, bench_run);",
+                "#endif",
                 "    Solution _sol;",
                 *[f"    test_example_{idx}(_sol);" for idx in range(len(signature.examples))],
+                *(["    return _run_custom(_custom_input_path(__FILE__), custom_case);"] if custom_code else []),
                 "}"]
 
+        constants = pool.constants()
+        if len(constants) > 0:
+            test_functions.insert(0, ["// Values shared by several examples.",
+                                      *[f"const {type_name} {name} = {literal};"
+                                        for name, type_name, literal in constants]])
+
         test_code = self.list_join(test_functions + [main_code], ["", ""])
         return solution_code, test_code
 
@@ -0,0 +1,162 @@
+import abc
+from typing import Any, List, Optional, Union
+
+from lchelper.codegen.types import CppType, parse_cpp_type
+
+__all__ = [
+    "cpp_literal",
+    "python_literal",
+]
+
+# Kinds of types, which determine how values are written.
+_OTHER, _VECTOR, _TREE, _LINKED, _CHAR = range(5)
+
+# Element types of lists that are written with a single `join`.
+_NUMBER_TYPES = {int, float}
+
+
+def _type_kind(typ: Optional[CppType]) -> int:
+    if typ is None:
+        return _OTHER
+    if typ.is_vector:
+        return _VECTOR
+    if typ.is_tree:
+        return _TREE
+    if typ.is_linked_list:
+        return _LINKED
+    if typ.name == "char" and typ.pointers == 0:
+        return _CHAR
+    return _OTHER
+
+
+def _escape(s: str, quote: str) -> str:
+    if "\\" in s or quote in s or "\n" in s:
+        s = s.replace("\\", "\\\\").replace(quote, "\\" + quote).replace("\n", "\\n")
+    return s
+
+
+class _LiteralWriter(abc.ABC):
+    r"""Writes values as literals into a single buffer. Nested lists are traversed with an explicit stack instead of
+    recursion, so values can be nested arbitrarily deep. Pieces of the literal are appended to a list and joined once.
+    """
+
+    open_list: str
+    close_list: str
+    null: str
+    true: str
+    false: str
+
+    def write(self, value: Any, typ: Optional[CppType]) -> str:
+        buffer: List[str] = []
+        # Items are either pieces of output to write as-is, or (value, type) pairs to serialize.
+        stack: List[Any] = [(value, typ)]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, str):
+                buffer.append(item)
+                continue
+            value, typ = item
+            kind = _type_kind(typ)
+            if kind == _TREE or kind == _LINKED:
+                self.write_nodes(buffer, value if isinstance(value, list) else [value], kind)
+            elif isinstance(value, list):
+                buffer.append(self.open_list)
+                element_type = typ.element if kind == _VECTOR else None
+                element_kind = _type_kind(element_type)
+                element_types = set(map(type, value))
+                if element_kind != _TREE and element_kind != _LINKED and list not in element_types:
+                    # Fast path for flat lists, which are the bulk of most examples.
+                    if element_types <= _NUMBER_TYPES:
+                        buffer.append(", ".join(map(str, value)))
+                    else:
+                        buffer.append(", ".join([self.scalar(x, element_kind, element_type) for x in value]))
+                    buffer.append(self.close_list)
+                    continue
+                stack.append(self.close_list)
+                for idx in range(len(value) - 1, -1, -1):
+                    stack.append((value[idx], element_type))
+                    if idx > 0:
+                        stack.append(", ")
+            else:
+                buffer.append(self.scalar(value, kind, typ))
+        return "".join(buffer)
+
+    def scalar(self, value: Any, kind: int, typ: Optional[CppType]) -> str:
+        if isinstance(value, str):
+            return self.string(value, kind)
+        if isinstance(value, bool):  # bool is a subtype of int
+            return self.true if value else self.false
+        if isinstance(value, (int, float)):
+            return str(value)
+        if value is None:
+            return self.null
+        raise ValueError(f"Cannot write value {value!r} of type '{typ}' as a literal")
+
+    @abc.abstractmethod
+    def write_nodes(self, buffer: List[str], values: List[Optional[int]], kind: int) -> None:
+        r"""Append the construction of a tree or a linked list from its LeetCode representation to the buffer."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def string(self, value: str, kind: int) -> str:
+        r"""The literal for a string, or for a character if ``kind`` is that of characters."""
+        raise NotImplementedError
+
+
+class _CppLiteralWriter(_LiteralWriter):
+    open_list, close_list = "{", "}"
+    null, true, false = "INT_MIN", "true", "false"
+
+    def write_nodes(self, buffer: List[str], values: List[Optional[int]], kind: int) -> None:
+        buffer.append("_construct_tree({" if kind == _TREE else "_construct_list({")
+        buffer.append(", ".join("NONE" if x is None else str(x) for x in values))
+        buffer.append("})")
+
+    def string(self, value: str, kind: int) -> str:
+        if kind == _CHAR:
+            return "'" + _escape(value, "'") + "'"
+        return '"' + _escape(value, '"') + '"'
+
+
+class _PythonLiteralWriter(_LiteralWriter):
+    open_list, close_list = "[", "]"
+    null, true, false = "None", "True", "False"
+
+    def write_nodes(self, buffer: List[str], values: List[Optional[int]], kind: int) -> None:
+        buffer.append("_construct_tree([" if kind == _TREE else "_construct_list([")
+        buffer.append(", ".join("None" if x is None else str(x) for x in values))
+        buffer.append("])")
+
+    def string(self, value: str, kind: int) -> str:
+        return '"' + _escape(value, '"') + '"'
+
+
+_cpp_writer = _CppLiteralWriter()
+_python_writer = _PythonLiteralWriter()
+
+
+def _parse_type(type_name: Union[str, CppType, None]) -> Optional[CppType]:
+    return parse_cpp_type(type_name) if isinstance(type_name, str) else type_name
+
+
+def cpp_literal(value: Any, type_name: Union[str, CppType, None] = None) -> str:
+    r"""Write a value in an example as a C++ literal.
+
+    :param value: The value, as parsed from the example: a list, string, number, boolean, or ``None``.
+    :param type_name: The C++ type of the value. Vectors are written as braced initializer lists, with elements written
+        according to their types. Strings of type ``char`` are written as character literals, and other strings as
+        string literals. Trees and linked lists are constructed from their LeetCode representation. ``None`` is written
+        as ``INT_MIN`` (``NONE`` in trees).
+    :return: The literal.
+    """
+    return _cpp_writer.write(value, _parse_type(type_name))
+
+
+def python_literal(value: Any, type_name: Union[str, CppType, None] = None) -> str:
+    r"""Write a value in an example as a Python literal.
+
+    :param value: The value, as parsed from the example: a list, string, number, boolean, or ``None``.
+    :param type_name: The C++ type of the value, which determines how trees and linked lists are constructed.
+    :return: The literal.
+    """
+    return _python_writer.write(value, _parse_type(type_name))
@@ -2,7 +2,9 @@ import os
 from collections import defaultdict
 from typing import Any, Dict, List, Optional, Tuple, Union
 
-from lchelper.codegen.base import Code, CodeGen, Signature
+from lchelper.codegen.base import Code, CodeGen, ConstantPool, Signature
+from lchelper.codegen.literals import python_literal
+from lchelper.codegen.types import CppType, parse_cpp_type
 from lchelper.common import *
 from lchelper.utils import remove_affix
 
@@ -11,6 +13,746 @@ __all__ = [
 ]
 
 
+Runtime_Code = r"""# Runtime support shared by all problems in a generated Python project: LeetCode data
+# structures and the testing harness. Each problem file imports everything from this module.
+import atexit
+import json
+import os
+import random
+import re
+import reprlib
+import signal
+import sys
+import time
+from collections import deque
+from typing import Any, List, Optional, Tuple
+
+__all__ = [
+    "TreeNode",
+    "ListNode",
+    "_construct_tree",
+    "_construct_list",
+    "_serialize_tree",
+    "_serialize_list",
+    "_equal",
+    "_Timer",
+    "_Memory",
+    "_run_example",
+    "evaluate",
+    "_replay",
+    "_Reader",
+    "_custom_input_path",
+    "_run_custom",
+    "_custom_call",
+    "_custom_replay",
+    "_Gen",
+    "_clone",
+    "_print_stress_input",
+    "_stress",
+    "_bench",
+]
+
+
+class TreeNode:
+    def __init__(self, val=0, left=None, right=None):
+        self.val = val
+        self.left = left
+        self.right = right
+
+    def __repr__(self):
+        return json.dumps(_serialize_tree(self), separators=(",", ":"))
+
+
+class ListNode:
+    def __init__(self, val=0, next=None):
+        self.val = val
+        self.next = next
+
+    def __repr__(self):
+        return json.dumps(_serialize_list(self), separators=(",", ":"))
+
+
+# Trees and linked lists are built from and serialized to their LeetCode representations, i.e. level-order lists with
+# `None` for missing children, and lists of values. All helpers are iterative, so deep trees and long lists do not hit
+# the recursion limit.
+def _construct_tree(values: List[Optional[int]]) -> Optional[TreeNode]:
+    if len(values) == 0 or values[0] is None:
+        return None
+    root = TreeNode(values[0])
+    queue = deque([root])
+    ptr = 1
+    while queue and ptr < len(values):
+        node = queue.popleft()
+        if values[ptr] is not None:
+            node.left = TreeNode(values[ptr])
+            queue.append(node.left)
+        ptr += 1
+        if ptr < len(values) and values[ptr] is not None:
+            node.right = TreeNode(values[ptr])
+            queue.append(node.right)
+        ptr += 1
+    return root
+
+
+def _construct_list(values: List[int]) -> Optional[ListNode]:
+    head = None
+    for val in reversed(values):
+        head = ListNode(val, head)
+    return head
+
+
+def _serialize_tree(root: Optional[TreeNode]) -> List[Optional[int]]:
+    values = []
+    queue = deque([root])
+    while queue:
+        node = queue.popleft()
+        if node is None:
+            values.append(None)
+        else:
+            values.append(node.val)
+            queue.append(node.left)
+            queue.append(node.right)
+    while len(values) > 0 and values[-1] is None:
+        values.pop()
+    return values
+
+
+def _serialize_list(head: Optional[ListNode]) -> List[int]:
+    values = []
+    while head is not None:
+        values.append(head.val)
+        head = head.next
+    return values
+
+
+# Compare answers structurally: trees and linked lists are compared node by node, and lists element by element.
+def _equal(a, b) -> bool:
+    stack = [(a, b)]
+    while stack:
+        a, b = stack.pop()
+        if isinstance(a, TreeNode) and isinstance(b, TreeNode):
+            if a.val != b.val:
+                return False
+            stack.append((a.left, b.left))
+            stack.append((a.right, b.right))
+        elif isinstance(a, ListNode) and isinstance(b, ListNode):
+            while a is not None and b is not None:
+                if a.val != b.val:
+                    return False
+                a, b = a.next, b.next
+            if a is not None or b is not None:
+                return False
+        elif isinstance(a, (list, tuple)) and isinstance(b, (list, tuple)):
+            if len(a) != len(b):
+                return False
+            stack.extend(zip(a, b))
+        elif isinstance(a, (TreeNode, ListNode)) or isinstance(b, (TreeNode, ListNode)):
+            return False
+        elif a != b:
+            return False
+    return True
+
+
+# Per-example time budget in microseconds; examples running longer are flagged as [SLOW].
+_TIME_BUDGET_US = int(os.environ.get("LCHELPER_TIME_BUDGET_US", "1000000"))
+# Per-example time limit in seconds; examples running longer are aborted. Zero means no limit.
+_TIME_LIMIT = float(os.environ.get("LCHELPER_TIME_LIMIT", "0"))
+# Profiling mode, either "cprofile" or "tracemalloc". Empty means no profiling.
+_PROFILE = os.environ.get("LCHELPER_PROFILE", "")
+_PROFILE_TOP = int(os.environ.get("LCHELPER_PROFILE_TOP", "10"))
+# Whether to measure heap usage of each example through `tracemalloc`.
+_MEMORY = os.environ.get("LCHELPER_MEMORY", "") not in ("", "0")
+
+
+# If the `LCHELPER_RSS_FILE` environment variable is set, the peak resident set size of the program is written to that
+# file in bytes at exit. It is taken from `VmHWM` (Linux only), which, unlike `ru_maxrss`, does not include the memory
+# of the process that started the program.
+def _write_peak_rss():
+    path = os.environ.get("LCHELPER_RSS_FILE")
+    if path is None or not os.path.exists("/proc/self/status"):
+        return
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                with open(path, "w") as out:
+                    out.write(f"{int(line.split()[1]) * 1024}\n")
+                return
+
+
+atexit.register(_write_peak_rss)
+
+
+class _Timer:
+    def __init__(self):
+        self.start = time.perf_counter()
+
+    def elapsed_us(self) -> int:
+        return int((time.perf_counter() - self.start) * 1000000)
+
+
+# Heap usage of a single example, measured if `LCHELPER_MEMORY` is set. Construct it before the input arguments, and
+# call `start()` right before calling the solution. Python does not expose a count of all allocations, so `allocs` is
+# the number of memory blocks allocated by the solution that are still alive when the example is evaluated.
+class _Memory:
+    def __init__(self):
+        self.measured = False
+        if _MEMORY:
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            self.base = tracemalloc.get_traced_memory()[0]
+
+    def start(self):
+        if _MEMORY:
+            import tracemalloc
+            current = tracemalloc.get_traced_memory()[0]
+            self.input_bytes = max(current - self.base, 0)
+            self.blocks = sys.getallocatedblocks()
+            # Forget existing traces, which also resets the peak; `tracemalloc.reset_peak` requires Python 3.9.
+            tracemalloc.clear_traces()
+            self.measured = True
+
+    def report(self) -> str:
+        import tracemalloc
+        peak = tracemalloc.get_traced_memory()[1]
+        allocs = max(sys.getallocatedblocks() - self.blocks, 0)
+        return f" [MEM peak {peak} B, {allocs} allocs, input {self.input_bytes} B]"
+
+
+# Raised inside the solution when it exceeds the time limit. Like `KeyboardInterrupt`, it is not an `Exception`, so that
+# `except Exception` clauses in the solution do not swallow it.
+class _TimeLimitExceeded(BaseException):
+    pass
+
+
+def _raise_time_limit(signum, frame):
+    raise _TimeLimitExceeded
+
+
+def _run_example(msg: str, fn, *args):
+    use_alarm = _TIME_LIMIT > 0 and hasattr(signal, "setitimer")
+    profiler = None
+    if _PROFILE == "cprofile":
+        import cProfile
+        profiler = cProfile.Profile()
+    elif _PROFILE == "tracemalloc":
+        import tracemalloc
+        tracemalloc.start()
+        snapshot = tracemalloc.take_snapshot()
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _raise_time_limit)
+        signal.setitimer(signal.ITIMER_REAL, _TIME_LIMIT)
+    timer = _Timer()
+    try:
+        if profiler is not None:
+            profiler.enable()
+        fn(*args)
+    except _TimeLimitExceeded:
+        print(f"{msg} [TLE] exceeds time limit of {_TIME_LIMIT} s")
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+        if profiler is not None:
+            profiler.disable()
+    elapsed_us = timer.elapsed_us()
+
+    if profiler is not None:
+        import pstats
+        print(f"{msg} finished in {elapsed_us} us, hotspots:")
+        pstats.Stats(profiler, stream=sys.stdout).sort_stats("tottime").print_stats(_PROFILE_TOP)
+    elif _PROFILE == "tracemalloc":
+        import tracemalloc
+        _, peak = tracemalloc.get_traced_memory()
+        ignore_self = [tracemalloc.Filter(False, tracemalloc.__file__)]
+        stats = tracemalloc.take_snapshot().filter_traces(ignore_self).compare_to(
+            snapshot.filter_traces(ignore_self), "lineno")
+        tracemalloc.stop()
+        print(f"{msg} finished in {elapsed_us} us, peak traced memory: {peak} bytes, allocation hotspots:")
+        for stat in stats[:_PROFILE_TOP]:
+            print(f"    {stat}")
+
+
+# Values are printed in full only if the `LCHELPER_FULL_OUTPUT` environment variable is set. Otherwise, containers are
+# truncated, and mismatches are reported with a window of elements around them.
+_FULL_OUTPUT = os.environ.get("LCHELPER_FULL_OUTPUT", "") not in ("", "0")
+_DIFF_WINDOW = 3  # number of elements printed on each side of a mismatch
+_bounded_repr = reprlib.Repr()
+_bounded_repr.maxlist = _bounded_repr.maxtuple = 8
+_bounded_repr.maxstring = _bounded_repr.maxother = 64
+
+
+def _window(seq, idx: int) -> str:
+    lo, hi = max(idx - _DIFF_WINDOW, 0), min(idx + _DIFF_WINDOW + 1, len(seq))
+    if isinstance(seq, str):
+        lo, hi = max(idx - _DIFF_WINDOW * 4, 0), min(idx + _DIFF_WINDOW * 4 + 1, len(seq))
+        return repr(("..." if lo > 0 else "") + seq[lo:hi] + ("..." if hi < len(seq) else ""))
+    items = [_bounded_repr.repr(x) for x in seq[lo:hi]]
+    return "[" + ", ".join((["..."] if lo > 0 else []) + items + (["..."] if hi < len(seq) else [])) + "]"
+
+
+# Find the first difference between the expected and received values, stopping at the first mismatch. Returns `None` if
+# the values are equal, or a tuple of the index path of the mismatch (e.g. "[3][1]") and a bounded description of it.
+def _diff(a, b) -> Optional[Tuple[str, str]]:
+    # Each entry is (expected, received, path, (expected parent, received parent, index) or `None`). Length checks of
+    # lists are pushed below their elements, so that mismatches are found in order.
+    stack = [(a, b, "", None)]
+    while stack:
+        a, b, path, parent = stack.pop()
+        if parent == "length":
+            if len(a) != len(b):
+                n = min(len(a), len(b))
+                return path, (f"expected length {len(a)}, received length {len(b)}, "
+                              f"extra elements {_window(a if len(a) > len(b) else b, n)}")
+        elif isinstance(a, TreeNode) and isinstance(b, TreeNode):
+            # Nodes are compared in level order, and identified by their position in the LeetCode representation.
+            queue = deque([(a, b)])
+            idx = 0
+            while queue:
+                x, y = queue.popleft()
+                if x is None and y is None:
+                    idx += 1
+                    continue
+                if x is None or y is None or x.val != y.val:
+                    return (f"{path}[{idx}] (level order)",
+                            f"expected {'null' if x is None else repr(x.val)}, "
+                            f"received {'null' if y is None else repr(y.val)}")
+                idx += 1
+                queue.append((x.left, y.left))
+                queue.append((x.right, y.right))
+        elif isinstance(a, ListNode) and isinstance(b, ListNode):
+            idx = 0
+            while a is not None and b is not None and a.val == b.val:
+                a, b, idx = a.next, b.next, idx + 1
+            if a is not None or b is not None:
+                return (f"{path}[{idx}]", f"expected {'end of list' if a is None else repr(a.val)}, "
+                                          f"received {'end of list' if b is None else repr(b.val)}")
+        elif isinstance(a, str) and isinstance(b, str):
+            if a != b:
+                idx = next((i for i, (x, y) in enumerate(zip(a, b)) if x != y), min(len(a), len(b)))
+                if idx == min(len(a), len(b)):
+                    stack.append((a, b, path, "length"))
+                    continue
+                return f"{path}[{idx}]", f"expected {_window(a, idx)}, received {_window(b, idx)}"
+        elif isinstance(a, (list, tuple)) and isinstance(b, (list, tuple)):
+            stack.append((a, b, path, "length"))
+            stack.extend((x, y, f"{path}[{idx}]", (a, b, idx)) for idx, x, y in
+                         reversed([(idx, x, y) for idx, (x, y) in enumerate(zip(a, b))]))
+        elif not _equal(a, b):
+            if parent is not None:
+                parent_a, parent_b, idx = parent
+                return path, f"expected {_window(parent_a, idx)}, received {_window(parent_b, idx)}"
+            return path, f"expected {_bounded_repr.repr(a)}, received {_bounded_repr.repr(b)}"
+    return None
+
+
+def evaluate(msg: str, a, b, elapsed_us: Optional[int] = None, memory: Optional[_Memory] = None):
+    # Memory is reported first, so that allocations made here are not included in the peak.
+    memory_report = memory.report() if memory is not None and memory.measured else ""
+    timing = ""
+    if elapsed_us is not None:
+        timing = f" ({elapsed_us} us){memory_report}"
+        if elapsed_us > _TIME_BUDGET_US:
+            timing += f" [SLOW] exceeds budget of {_TIME_BUDGET_US} us"
+    mismatch = _diff(a, b)
+    if mismatch is None:
+        print(f"{msg} [OK]{timing}")
+    else:
+        print(f"{msg} [WRONG]{timing}")
+        path, detail = mismatch
+        print(f"First mismatch at {path or 'the top level'}: {detail}")
+    if _FULL_OUTPUT:
+        print(f"Expected: {a!r}")
+        print(f"Received: {b!r}")
+
+
+# Builders for values in interactions replayed from data, by kind: "tree" and "linked" values are given as lists.
+_REPLAY_BUILDERS = {
+    "value": lambda value: value,
+    "tree": lambda value: _construct_tree(value if isinstance(value, list) else [value]),
+    "linked": lambda value: _construct_list(value if isinstance(value, list) else [value]),
+}
+
+
+# Replay the interactions of an example of an interactive problem. `data` is a JSON list holding the list of function
+# names, the list of argument lists, and the list of expected outputs. Each interaction is dispatched through the method
+# table `methods`, which maps function names to the kinds of the arguments and the return value ("void" if nothing is
+# returned), so the code size does not depend on the number of interactions.
+def _replay(msg: str, cls, methods, data: str):
+    _replay_values(msg, cls, methods, *json.loads(data))
+
+
+# Replay interactions given as the lists of function names, argument lists, and expected outputs. If `outputs` is
+# `None`, the outputs are printed instead of being checked.
+def _replay_values(msg: str, cls, methods, functions: List[str], arguments: List[List[Any]],
+                   outputs: Optional[List[Any]]):
+    obj = None
+    results = []
+    start = _Timer()
+    for idx, (function, args) in enumerate(zip(functions, arguments)):
+        if function not in methods:
+            raise ValueError(f"{msg}: unknown function {function!r}")
+        arg_kinds, ret_kind = methods[function]
+        if function == cls.__name__:
+            obj = cls(*[_REPLAY_BUILDERS[kind](arg) for kind, arg in zip(arg_kinds, args)])
+            results.append(None)
+        elif ret_kind == "void":
+            getattr(obj, function)(*[_REPLAY_BUILDERS[kind](arg) for kind, arg in zip(arg_kinds, args)])
+            results.append(None)
+        elif outputs is None:
+            results.append(getattr(obj, function)(*[_REPLAY_BUILDERS[kind](arg) for kind, arg in zip(arg_kinds, args)]))
+        else:
+            expected = _REPLAY_BUILDERS[ret_kind](outputs[idx])
+            memory = _Memory()
+            args = [_REPLAY_BUILDERS[kind](arg) for kind, arg in zip(arg_kinds, args)]
+            memory.start()
+            timer = _Timer()
+            ret = getattr(obj, function)(*args)
+            evaluate(f"{msg} - Interaction {idx}", expected, ret, timer.elapsed_us(), memory)
+    if outputs is None:
+        _report_custom(msg, start.elapsed_us(), results)
+
+
+_CHUNK_SIZE = 1 << 16
+# Whitespace, commas, and an optional `name =` prefix before a top-level value.
+_SEPARATOR_REGEX = re.compile(r"[\s,]*(?:[A-Za-z_]\w*\s*=(?!=)\s*)?")
+_DECODER = json.JSONDecoder()
+
+
+# Reader for values in LeetCode syntax (e.g. `[[1,2],[3]]`, `"abc"`, `[1,null,2]`, `true`), used to run custom test
+# cases. Input is read in chunks of whole lines, so files with many cases are streamed instead of being loaded at once.
+# Values are parsed as JSON, and may span lines. Values may be separated by whitespace or commas, and may be prefixed by
+# their names, as in `nums = [1,2], k = 3`.
+class _Reader:
+    def __init__(self, path: str):
+        self.source = "<stdin>" if path == "-" else path
+        if path == "-":
+            self.file = sys.stdin
+        else:
+            self.file = open(path) if os.path.isfile(path) else None
+        self.buffer = ""
+        self.pos = 0
+        self.lines_read = 0  # number of lines dropped from the buffer
+
+    def _fill(self) -> bool:
+        # Drop the parsed part of the buffer and read more lines. At least as much is read as is left in the buffer, so
+        # that values spanning many lines are parsed in linear time.
+        if self.file is None:
+            return False
+        lines = self.file.readlines(max(_CHUNK_SIZE, len(self.buffer) - self.pos))
+        if len(lines) == 0:
+            if self.file is not sys.stdin:
+                self.file.close()
+            self.file = None
+            return False
+        self.lines_read += self.buffer.count("\n", 0, self.pos)
+        self.buffer = self.buffer[self.pos:] + "".join(lines)
+        self.pos = 0
+        return True
+
+    def skip_separators(self):
+        while True:
+            self.pos = _SEPARATOR_REGEX.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer) or not self._fill():
+                return
+
+    def at_end(self) -> bool:
+        self.skip_separators()
+        return self.pos >= len(self.buffer)
+
+    # Accept a label followed by a colon before a top-level value, e.g. `Output:`.
+    def accept_label(self, label: str) -> bool:
+        self.skip_separators()
+        match = re.compile(re.escape(label) + r"[ \t]*:").match(self.buffer, self.pos)
+        if match is None:
+            return False
+        self.pos = match.end()
+        return True
+
+    def read(self):
+        self.skip_separators()
+        while True:
+            try:
+                value, self.pos = _DECODER.raw_decode(self.buffer, self.pos)
+                return value
+            except json.JSONDecodeError as e:
+                # The value may continue on the following lines.
+                if e.pos < len(self.buffer.rstrip()) or not self._fill():
+                    self.fail(f"expected a value: {e.msg}")
+
+    def fail(self, message: str):
+        line = self.lines_read + self.buffer.count("\n", 0, self.pos) + 1
+        sys.exit(f"{self.source}:{line}: {message}")
+
+
+# Path of the custom test case file `in.txt` next to the given source file.
+def _custom_input_path(source_file: str) -> str:
+    return os.path.join(os.path.dirname(os.path.abspath(source_file)), "in.txt")
+
+
+# Files holding the custom test cases at `path`: the file itself, or the files in a directory in order of their names.
+# Hidden files and `.out` files, which hold expected outputs, are skipped.
+def _custom_case_files(path: str) -> List[str]:
+    if path == "-" or not os.path.isdir(path):
+        return [path]
+    return [os.path.join(path, name) for name in sorted(os.listdir(path))
+            if not name.startswith(".") and not name.endswith(".out") and os.path.isfile(os.path.join(path, name))]
+
+
+# Find the expected output of a custom test case after its arguments were read: the next value in `out` if the case file
+# has a matching `.out` file, or a value labeled `Output:` in the case file itself. Returns the reader positioned at the
+# expected output, or `None` if the case has none.
+def _expected_output(reader: _Reader, out: Optional[_Reader]) -> Optional[_Reader]:
+    if out is not None:
+        return None if out.at_end() else out
+    return reader if reader.accept_label("Output") else None
+
+
+# Run custom test cases from `path`: a file with any number of cases ("-" for standard input), or a directory of such
+# files. Cases may be prefixed with `Input:`, and may be followed by their expected outputs labeled with `Output:`.
+# Expected outputs of the cases in a `.in` file may instead be listed in order in the `.out` file of the same name.
+# `run_case(reader, out, name)` reads a case and runs the solution on it. Cases are streamed, so only a single case is
+# held in memory. A missing or empty file contains no cases.
+def _run_custom(path: str, run_case) -> int:
+    files = _custom_case_files(path)
+    idx = 0
+    for file in files:
+        reader = _Reader(file)
+        out_path = os.path.splitext(file)[0] + ".out"
+        out = _Reader(out_path) if file.endswith(".in") and os.path.isfile(out_path) else None
+        while not reader.at_end():
+            reader.accept_label("Input")
+            name = f"Custom - {idx}" + (f" ({file})" if len(files) > 1 or file != path else "")
+            run_case(reader, out, name)
+            idx += 1
+    return 0
+
+
+def _report_custom(name: str, elapsed_us: int, value):
+    timing = f" ({elapsed_us} us)"
+    if elapsed_us > _TIME_BUDGET_US:
+        timing += f" [SLOW] exceeds budget of {_TIME_BUDGET_US} us"
+    print(f"{name}{timing}")
+    print(f"Output: {value!r}" if _FULL_OUTPUT else f"Output: {_bounded_repr.repr(value)}")
+
+
+# Run a custom test case of a function problem: read the arguments, whose kinds are listed in `arg_kinds`, and call `fn`
+# on them. The result (the first argument if `ret_kind` is "void", since such solutions modify it in-place) is checked
+# against the expected output if the case has one, and printed otherwise.
+def _custom_call(name: str, fn, arg_kinds: List[str], ret_kind: str, reader: _Reader, out: Optional[_Reader]):
+    args = [_REPLAY_BUILDERS[kind](reader.read()) for kind in arg_kinds]
+    result_kind = ret_kind if ret_kind != "void" else (arg_kinds[0] if len(arg_kinds) > 0 else None)
+    expected_reader = _expected_output(reader, out)
+    if expected_reader is not None:
+        if result_kind is None:
+            reader.fail("expected outputs are not supported for this problem")
+        expected = _REPLAY_BUILDERS[result_kind](expected_reader.read())
+    timer = _Timer()
+    ret = fn(*args)
+    elapsed_us = timer.elapsed_us()
+    result = ret if ret_kind != "void" else (args[0] if len(args) > 0 else None)
+    if expected_reader is not None:
+        evaluate(name, expected, result, elapsed_us)
+    else:
+        _report_custom(name, elapsed_us, result)
+
+
+# Run a custom test case of an interactive problem: the list of function names and the list of argument lists, followed
+# by the list of expected outputs if the case has one. See `_replay`.
+def _custom_replay(name: str, cls, methods, reader: _Reader, out: Optional[_Reader]):
+    functions, arguments = reader.read(), reader.read()
+    expected_reader = _expected_output(reader, out)
+    _replay_values(name, cls, methods, functions, arguments,
+                   None if expected_reader is None else expected_reader.read())
+
+
+# Random input generator for stress tests. Sizes and values are configured through `LCHELPER_STRESS_*` environment
+# variables. Values are described by specs: "int", "float", "bool", "char", "str", "tree" (in LeetCode level-order
+# representation), "linked" (linked lists, as lists of values), or ("list", <spec>).
+class _Gen:
+    def __init__(self, seed: int):
+        self.rng = random.Random(seed)
+        self.min_size = int(os.environ.get("LCHELPER_STRESS_MIN_SIZE", "1"))
+        self.max_size = int(os.environ.get("LCHELPER_STRESS_MAX_SIZE", "10"))
+        self.min_value = int(os.environ.get("LCHELPER_STRESS_MIN_VALUE", "0"))
+        self.max_value = int(os.environ.get("LCHELPER_STRESS_MAX_VALUE", "10"))
+        self.grid_min_size, self.grid_max_size = self.min_size, self.max_size  # range for numbers of rows and columns
+        self.alphabet = os.environ.get("LCHELPER_STRESS_ALPHABET") or "abc"
+        # The value that shrinking moves towards: zero if it's within range, otherwise the closest bound.
+        self.target = min(max(0, self.min_value), self.max_value)
+
+    def size(self) -> int:
+        return self.rng.randint(self.min_size, self.max_size)
+
+    def grid_size(self) -> int:
+        return self.rng.randint(self.grid_min_size, self.grid_max_size)
+
+    def random(self, spec):
+        rng = self.rng
+        if spec == "int":
+            return rng.randint(self.min_value, self.max_value)
+        if spec == "float":
+            return rng.uniform(self.min_value, self.max_value)
+        if spec == "bool":
+            return rng.random() < 0.5
+        if spec == "char":
+            return rng.choice(self.alphabet)
+        if spec == "str":
+            return "".join(rng.choices(self.alphabet, k=self.size()))
+        if spec == "linked":
+            return self.random(("list", "int"))
+        if spec == "tree":
+            return [rng.randint(self.min_value, self.max_value) if idx == 0 or rng.random() >= 0.2 else None
+                    for idx in range(self.size())]
+        inner_spec = spec[1]
+        if inner_spec == "int":
+            return [rng.randint(self.min_value, self.max_value) for _ in range(self.size())]
+        if isinstance(inner_spec, tuple):  # nested lists are generated as rectangular grids
+            rows, cols = self.grid_size(), self.grid_size()
+            return [[self.random(inner_spec[1]) for _ in range(cols)] for _ in range(rows)]
+        return [self.random(inner_spec) for _ in range(self.size())]
+
+    def _remove_chunks(self, seq):
+        n = len(seq)
+        chunk = n // 2
+        while n > 0:
+            chunk = max(chunk, 1)
+            if n - chunk >= self.min_size:
+                for start in range(0, n - chunk + 1, chunk):
+                    yield seq[:start] + seq[(start + chunk):]
+            if chunk == 1:
+                break
+            chunk //= 2
+
+    def shrink(self, spec, value):
+        # Generate "smaller" candidates for the value.
+        if spec in ("int", "float"):
+            if value != self.target:
+                half = value - (value - self.target) // 2 if spec == "int" else float(int(value))
+                step = value - 1 if value > self.target else value + 1
+                for candidate in dict.fromkeys([self.target, half, step]):
+                    if candidate != value:
+                        yield candidate
+        elif spec == "bool":
+            if value:
+                yield False
+        elif spec == "char":
+            if value != self.alphabet[0]:
+                yield self.alphabet[0]
+        elif spec == "str":
+            yield from self._remove_chunks(value)
+            for idx, ch in enumerate(value):
+                if ch != self.alphabet[0]:
+                    yield value[:idx] + self.alphabet[0] + value[(idx + 1):]
+        elif spec == "linked":
+            yield from self.shrink(("list", "int"), value)
+        elif spec == "tree":
+            for candidate in self._remove_chunks(value):
+                if len(candidate) == 0 or candidate[0] is not None:
+                    yield candidate
+            for idx in range(1, len(value)):  # remove subtrees
+                if value[idx] is not None:
+                    yield value[:idx] + [None] + value[(idx + 1):]
+            for idx, x in enumerate(value):
+                if x is not None:
+                    for candidate in self.shrink("int", x):
+                        yield value[:idx] + [candidate] + value[(idx + 1):]
+        elif isinstance(spec[1], tuple):  # grids are shrunk by removing rows or columns to keep them rectangular
+            yield from self._remove_chunks(value)
+            cols = len(value[0]) if len(value) > 0 else 0
+            if cols - 1 >= self.min_size:
+                for col in range(cols):
+                    yield [row[:col] + row[(col + 1):] for row in value]
+            for i, row in enumerate(value):
+                for j, x in enumerate(row):
+                    for candidate in self.shrink(spec[1][1], x):
+                        new_row = row[:j] + [candidate] + row[(j + 1):]
+                        yield value[:i] + [new_row] + value[(i + 1):]
+        else:
+            yield from self._remove_chunks(value)
+            for idx, x in enumerate(value):
+                for candidate in self.shrink(spec[1], x):
+                    yield value[:idx] + [candidate] + value[(idx + 1):]
+
+
+def _clone(value):
+    if isinstance(value, list):
+        return [_clone(x) for x in value]
+    return value
+
+
+def _print_stress_input(names: List[str], args: List[Any]):
+    for name, value in zip(names, args):
+        print(f"{name} = {json.dumps(value, separators=(',', ':'))}")
+
+
+def _check_safe(check, args, verbose: bool) -> bool:
+    try:
+        return check(args, verbose)
+    except Exception as e:
+        if verbose:
+            print(f"Exception raised: {e!r}")
+        return False
+
+
+# Run `check(args, verbose)` on random inputs until it returns `False`, i.e. when the solution disagrees with the brute
+# force. The failing input is then greedily shrunk to a minimal reproducer, which is printed in LeetCode syntax.
+def _stress(specs, check, iterations: int) -> int:
+    seed = int(os.environ.get("LCHELPER_STRESS_SEED") or random.randrange(2 ** 32))
+    gen = _Gen(seed)
+    for it in range(iterations):
+        args = [gen.random(spec) for spec in specs]
+        if _check_safe(check, args, False):
+            continue
+
+        budget = int(os.environ.get("LCHELPER_STRESS_SHRINK_LIMIT", "10000"))
+        progress = True
+        while progress and budget > 0:
+            progress = False
+            for idx, spec in enumerate(specs):
+                for candidate in gen.shrink(spec, args[idx]):
+                    budget -= 1
+                    if budget < 0:
+                        break
+                    new_args = args[:idx] + [candidate] + args[(idx + 1):]
+                    if not _check_safe(check, new_args, False):
+                        args = new_args
+                        progress = True
+                        break
+                if progress or budget < 0:
+                    break
+        print(f"Stress test [WRONG] mismatch on random input {it + 1} (seed {seed}), minimized input:")
+        _check_safe(check, args, True)
+        return 1
+    print(f"Stress test [OK] passed {iterations} random inputs (seed {seed})")
+    return 0
+
+
+# Time `run(args)` on random inputs of geometrically growing sizes between `min_n` and `max_n`. Arrays, strings, and
+# trees have `n` elements, while grids have about `n` cells. Each size is measured several times and the fastest run is
+# reported. Larger sizes are skipped once a run exceeds the time limit.
+def _bench(specs, run, min_n: int, max_n: int) -> int:
+    seed = int(os.environ.get("LCHELPER_STRESS_SEED") or random.randrange(2 ** 32))
+    points = max(2, int(os.environ.get("LCHELPER_BENCH_POINTS", "8")))
+    repeats = max(1, int(os.environ.get("LCHELPER_BENCH_REPEATS", "3")))
+    time_limit_ns = int(os.environ.get("LCHELPER_BENCH_TIME_LIMIT_US", "2000000")) * 1000
+    gen = _Gen(seed)
+    prev_n = 0
+    for idx in range(points):
+        n = round(min_n * (max_n / min_n) ** (idx / (points - 1)))
+        if n == prev_n:
+            continue
+        prev_n = n
+        gen.min_size = gen.max_size = n
+        gen.grid_min_size = gen.grid_max_size = max(1, round(n ** 0.5))
+        best = min(run([gen.random(spec) for spec in specs]) for _ in range(repeats))
+        print(f"Benchmark n={n} time_ns={best}")
+        if best > time_limit_ns:
+            print(f"Benchmark stopped: time limit of {time_limit_ns // 1000} us exceeded")
+            break
+    return 0
+"""
+
+
 class PythonCodeGen(CodeGen):
     @property
     def language(self) -> str:
@@ -24,16 +766,22 @@ class PythonCodeGen(CodeGen):
     def line_comment_symbol(self) -> str:
         return "#"
 
+    @property
+    def extra_files(self) -> Dict[str, str]:
+        return {"_runtime.py": Runtime_Code}
+
     @property
     def template_code(self) -> str:
         return r"""
+import os
+import sys
+import time
 from typing import *
 
-class TreeNode:
-    def __init__(self, x):
-        self.val = x
-        self.left = None
-        self.right = None
+# Data structures and the testing harness are shared by all problems in the project, and are stored in `_runtime.py`
+# under the project folder. The project folder is searched first, so that other modules of the same name do not win.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from _runtime import *
 
 # BEGIN SUBMIT
 
@@ -52,40 +800,6 @@ class TreeNode:
 # END STATEMENT
 
 
-def _construct_tree(parent: List[Optional[int]]) -> Optional[TreeNode]:
-    from queue import Queue
-    q: 'Queue[TreeNode]' = Queue()
-    ptr = 0
-
-    def _add_node() -> Optional[TreeNode]:
-        nonlocal ptr
-        if ptr >= len(parent):
-            return None
-        val = parent[ptr]
-        ptr += 1
-        if val is None:
-            return None
-        p = TreeNode(val)
-        q.put(p)
-        return p
-
-    root = _add_node()
-    while not q.empty():
-        p = q.get()
-        p.left = _add_node()
-        p.right = _add_node()
-    return root
-
-
-def evaluate(msg: str, a, b):
-    if a == b:
-        print(f"{msg} [OK]")
-    else:
-        print(f"{msg} [WRONG]")
-        print(f"Expected: {a!r}")
-        print(f"Received: {b!r}")
-
-
 # BEGIN TEST
 
 # END TEST
@@ -100,12 +814,49 @@ def evaluate(msg: str, a, b):
         "void": "None",
     }
 
-    def _convert_cpp_type(self, type_name: str) -> str:
-        type_name = type_name.strip().rstrip("*&")
-        if type_name.startswith("vector<") and type_name.endswith(">"):
-            inner_type_name = type_name[len("vector<"):-len(">")]
-            return f"List[{self._convert_cpp_type(inner_type_name)}]"
-        return self.TYPE_MAP.get(type_name, type_name)
+    # Generic C++ containers, mapped to Python type hints.
+    CONTAINER_MAP = {
+        "vector": "List",
+        "pair": "Tuple",
+        "map": "Dict",
+        "unordered_map": "Dict",
+        "set": "Set",
+        "unordered_set": "Set",
+    }
+
+    def _convert_cpp_type(self, type_name: Union[str, CppType]) -> str:
+        typ = parse_cpp_type(type_name) if isinstance(type_name, str) else type_name
+        if typ.name in self.CONTAINER_MAP and len(typ.args) > 0:
+            return f"{self.CONTAINER_MAP[typ.name]}[{', '.join(self._convert_cpp_type(arg) for arg in typ.args)}]"
+        return self.TYPE_MAP.get(typ.name, typ.name)
+
+    STRESS_SPECS = {
+        "int": "int",
+        "long": "int",
+        "long long": "int",
+        "double": "float",
+        "bool": "bool",
+        "char": "char",
+        "string": "str",
+    }
+
+    def _stress_spec(self, type_name: Union[str, CppType]) -> Optional[str]:
+        r"""Return the spec (as Python code) used to generate random values of the type in stress tests, or ``None`` if
+        random values of the type cannot be generated.
+        """
+        typ = (parse_cpp_type(type_name) if isinstance(type_name, str) else type_name).value_type
+        if typ.is_tree:
+            return '"tree"'
+        if typ.is_linked_list:
+            return '"linked"'
+        if typ.is_vector:
+            inner_spec = self._stress_spec(typ.element)
+            if inner_spec is None or inner_spec in ('"tree"', '"linked"'):
+                return None
+            return f'("list", {inner_spec})'
+        if str(typ) in self.STRESS_SPECS:
+            return f'"{self.STRESS_SPECS[str(typ)]}"'
+        return None
 
     def generate_solution_code(self, signature: Signature) -> Code:
         if isinstance(signature, InteractiveProblemSignature):
@@ -134,30 +885,45 @@ def evaluate(msg: str, a, b):
         # Convert C++ code to Python code.
         solution_code = self.generate_solution_code(signature)
 
-        def to_str(val: Any) -> str:
-            if isinstance(val, list):
-                return "[" + ", ".join(to_str(x) for x in val) + "]"
-            if isinstance(val, str):
-                return f'"{val}"'
-            if isinstance(val, bool):  # bool is a subtype of int
-                return "True" if val else "False"
-            if isinstance(val, (int, float)):
-                return str(val)
-            assert False
-
-        def to_tree(parent: List[Optional[int]]) -> str:
-            return f"_construct_tree([{', '.join('None' if x is None else str(x) for x in parent)}])"
-
-        def to_val(val: Any, type_name: str) -> str:
-            if self._convert_cpp_type(type_name) == "TreeNode":
-                return to_tree(val)
-            return to_str(val)
+        def to_str(val: Any, type_name: Union[str, CppType, None] = None) -> str:
+            return python_literal(val, type_name)
+
+        def to_literal(val: Any, type_name: str) -> Tuple[str, str]:
+            # Return the literal for a value, and code that builds the value from the literal (with `{}` standing for
+            # the literal). Trees and linked lists are built from their list representation.
+            typ = parse_cpp_type(type_name)
+            if typ.is_tree:
+                return f"[{', '.join('None' if x is None else str(x) for x in val)}]", "_construct_tree({})"
+            if typ.is_linked_list:
+                return to_str(val), "_construct_list({})"
+            return to_str(val, typ), "{}"
+
+        # Long literals that occur more than once in the examples are declared once as module-level constants.
+        pool = ConstantPool("_CONST_{}", self.POOL_MIN_LENGTH)
+        literals: Dict[Tuple[int, str], Tuple[str, str]] = {}
+
+        def example_literal(val: Any, type_name: str) -> Tuple[str, str]:
+            key = (id(val), type_name)
+            if key not in literals:
+                literals[key] = to_literal(val, type_name)
+            return literals[key]
+
+        def to_val(val: Any, type_name: str, is_input: bool = False) -> str:
+            literal, builder = example_literal(val, type_name)
+            name = pool.get(type(val).__name__, literal)
+            if name is None:
+                return builder.format(literal)
+            if is_input and builder == "{}" and isinstance(val, list):
+                # Solutions may modify their arguments, so shared lists are copied.
+                return f"_clone({name})"
+            return builder.format(name)
 
         def to_args(input: Dict[str, Any], func_sig: FunctionSignature) -> List[str]:
             # Return list of assignments.
             assignments = []
             for type_name, arg_name in func_sig.arguments:
-                assignments.append(assign(f"{func_sig.name}_{arg_name}", to_val(input[arg_name], type_name)))
+                assignments.append(assign(f"{func_sig.name}_{arg_name}",
+                                          to_val(input[arg_name], type_name, is_input=True)))
             return assignments
 
         def call(func_name: str, args: List[str]) -> str:
@@ -169,32 +935,69 @@ def evaluate(msg: str, a, b):
         def assign(obj_name: str, value: str) -> str:
             return f"{obj_name} = {value}"
 
+        def replay_kind(type_name: str) -> str:
+            typ = parse_cpp_type(type_name)
+            return "tree" if typ.is_tree else "linked" if typ.is_linked_list else "value"
+
+        for val, type_name in self.example_values(signature):
+            pool.add(type(val).__name__, example_literal(val, type_name)[0])
+
+        # Custom test cases are read from `in.txt` after the examples, or from the given path with `custom <path>`.
+        custom_main_code = [
+            '    if len(sys.argv) > 1 and sys.argv[1] == "custom":',
+            "        sys.exit(_run_custom(sys.argv[2] if len(sys.argv) > 2 else _custom_input_path(__file__), "
+            "custom_case))"]
+
         # Generate test code as a function per example.
         test_functions = []
         instance_name = "_sol"
         if isinstance(signature, InteractiveProblemSignature):
             func_map: Dict[str, FunctionSignature] = {func_sig.name: func_sig for func_sig in signature.functions}
+            replay = self.use_replay(signature)
+            # Generate a method table that lists the kinds of arguments and return values of each function. Long
+            # examples, and custom test cases, are replayed through the table.
+            methods = []
+            for func_sig in signature.functions:
+                arg_kinds = ", ".join(to_str(replay_kind(type_name)) for type_name, _ in func_sig.arguments)
+                void = func_sig.name == signature.class_name or func_sig.return_type == "void"
+                ret_kind = "void" if void else replay_kind(func_sig.return_type)
+                methods.append(f"    {to_str(func_sig.name)}: ([{arg_kinds}], {to_str(ret_kind)}),")
+            test_functions.append(["_METHODS = {", *methods, "}"])
             for idx, example in enumerate(signature.examples):
+                if replay:
+                    data = "[" + ",".join(self.replay_data(signature, example)) + "]"
+                    test_functions.append([
+                        f"def eval_example_{idx}():",
+                        f"    _replay({to_str(f'{problem.name} - Example {idx}')}, {signature.class_name}, _METHODS, "
+                        f"{data!r})"])
+                    continue
                 statements = []
                 for ex_idx, ex in enumerate(example):
                     func_sig = func_map[ex.function]
-                    statements.extend(to_args(ex.input, func_sig))
                     args = [f"{func_sig.name}_{arg_name}" for _, arg_name in func_sig.arguments]
                     if ex.function == signature.class_name:
+                        statements.extend(to_args(ex.input, func_sig))
                         ctor_stmt = ctor(signature.class_name, instance_name, args)
                         statements.append(ctor_stmt)
                     else:
                         ret_name = f"_ret{ex_idx}"
                         if func_sig.return_type != "void":
                             ret_ans_var = f"_ret_ans{ex_idx}"
+                            timer_name = f"_timer{ex_idx}"
+                            memory_name = f"_memory{ex_idx}"
                             stmts = [
                                 assign(ret_ans_var, to_val(ex.output, func_sig.return_type)),
+                                assign(memory_name, "_Memory()"),
+                                *to_args(ex.input, func_sig),
+                                f"{memory_name}.start()",
+                                assign(timer_name, "_Timer()"),
                                 assign(ret_name, f"{instance_name}.{call(ex.function, args)}"),
                                 call("evaluate", [to_str(f"{problem.name} - Example {idx} - Interaction {ex_idx}"),
-                                                  ret_ans_var, ret_name]),
+                                                  ret_ans_var, ret_name, f"{timer_name}.elapsed_us()", memory_name]),
                             ]
                             statements.extend(stmts)
                         else:
+                            statements.extend(to_args(ex.input, func_sig))
                             stmt = f"{instance_name}.{call(ex.function, args)}"
                             statements.append(stmt)
                 test_fn = [
@@ -202,9 +1005,19 @@ def evaluate(msg: str, a, b):
                     *["    " + line for line in statements]]
                 test_functions.append(test_fn)
 
+            # Custom test cases consist of a list of function names followed by a list of argument lists, as on
+            # LeetCode, optionally followed by the list of expected outputs.
+            test_functions.append([
+                "def custom_case(_in: _Reader, _out: Optional[_Reader], _name: str):",
+                "    " + call("_run_example", ["_name", "_custom_replay", "_name", signature.class_name, "_METHODS",
+                                               "_in", "_out"])])
+
             main_code = [
                 "def main():",
-                *["    " + f"eval_example_{idx}()" for idx in range(len(signature.examples))],
+                *custom_main_code,
+                *["    " + call("_run_example", [to_str(f"{problem.name} - Example {idx}"), f"eval_example_{idx}"])
+                  for idx in range(len(signature.examples))],
+                "    _run_custom(_custom_input_path(__file__), custom_case)",
                 "",
                 "",
                 "if __name__ == '__main__':",
@@ -212,17 +1025,23 @@ def evaluate(msg: str, a, b):
         else:
             func_sig = signature.function
             for idx, example in enumerate(signature.examples):
-                statements = []
+                ret_name = "_ret"
+                ret_ans_var = "_ret_ans"
+                # The expected answer is constructed first, so that heap usage of the arguments can be measured.
+                statements = [
+                    assign(ret_ans_var, to_val(example.output, func_sig.return_type)),
+                    assign("_memory", "_Memory()"),
+                ]
                 for type_name, arg_name in func_sig.arguments:
-                    stmt = assign(arg_name, to_val(example.input[arg_name], type_name))
+                    stmt = assign(arg_name, to_val(example.input[arg_name], type_name, is_input=True))
                     statements.append(stmt)
                 args = [arg_name for _, arg_name in func_sig.arguments]
-                ret_name = "_ret"
-                ret_ans_var = "_ret_ans"
                 stmts = [
-                    assign(ret_ans_var, to_val(example.output, func_sig.return_type)),
+                    "_memory.start()",
+                    assign("_timer", "_Timer()"),
                     assign(ret_name, f"{instance_name}.{call(func_sig.name, args)}"),
-                    call("evaluate", [to_str(f"{problem.name} - Example {idx}"), ret_ans_var, ret_name]),
+                    call("evaluate", [to_str(f"{problem.name} - Example {idx}"), ret_ans_var, ret_name,
+                                      "_timer.elapsed_us()", "_memory"]),
                 ]
                 statements.extend(stmts)
 
@@ -231,14 +1050,81 @@ def evaluate(msg: str, a, b):
                     *["    " + line for line in statements]]
                 test_functions.append(test_fn)
 
+            # Generate stress test and benchmark code, which run the solution on random inputs. Stress tests compare
+            # the solution against a brute-force version, while benchmarks time the solution on growing input sizes.
+            random_specs = [self._stress_spec(type_name) for type_name, _ in func_sig.arguments]
+            if all(spec is not None for spec in random_specs):
+                arg_names = [arg_name for _, arg_name in func_sig.arguments]
+                construct_args = []
+                for arg_idx, (arg_name, spec) in enumerate(zip(arg_names, random_specs)):
+                    builder = {'"tree"': "_construct_tree", '"linked"': "_construct_list"}.get(spec, "_clone")
+                    construct_args.append(assign(arg_name, f"{builder}(_args[{arg_idx}])"))
+                brute_force_code = ["class BruteForce:"] + solution_code[1:]
+                random_code = [
+                    "# Implement a brute-force solution here, and run `python <problem>.py stress [iterations]` to",
+                    "# compare the solutions on random inputs.",
+                    *brute_force_code,
+                    "",
+                    "",
+                    "def stress_check(_args, _verbose: bool) -> bool:",
+                    *["    " + line for line in construct_args],
+                    "    " + assign("_ret", f"Solution().{call(func_sig.name, arg_names)}"),
+                    *["    " + line for line in construct_args],
+                    "    " + assign("_ret_ans", f"BruteForce().{call(func_sig.name, arg_names)}"),
+                    "    if _verbose:",
+                    f"        _print_stress_input([{', '.join(to_str(name) for name in arg_names)}], _args)",
+                    '        print(f"Expected (brute force): {_ret_ans!r}")',
+                    '        print(f"Received: {_ret!r}")',
+                    "    return _equal(_ret_ans, _ret)",
+                    "",
+                    "",
+                    "def bench_run(_args) -> int:",
+                    *["    " + line for line in construct_args],
+                    "    _sol = Solution()",
+                    "    _start = time.perf_counter_ns()",
+                    "    " + f"_sol.{call(func_sig.name, arg_names)}",
+                    "    return time.perf_counter_ns() - _start"]
+                test_functions.append(random_code)
+                specs = f"[{', '.join(random_specs)}]"
+                stress_call = f"sys.exit({call('_stress', [specs, 'stress_check', 'iterations'])})"
+                bench_call = f"sys.exit({call('_bench', [specs, 'bench_run', 'min_n', 'max_n'])})"
+            else:
+                stress_call = bench_call = ('sys.exit("Random inputs are not supported for the argument types of '
+                                            'this problem")')
+
+            # Custom test cases list the arguments of each case in order, as on LeetCode, optionally followed by the
+            # expected output.
+            arg_kinds = ", ".join(to_str(replay_kind(type_name)) for type_name, _ in func_sig.arguments)
+            ret_kind = "void" if func_sig.return_type == "void" else replay_kind(func_sig.return_type)
+            test_functions.append([
+                "def custom_case(_in: _Reader, _out: Optional[_Reader], _name: str):",
+                "    " + call("_run_example", ["_name", "_custom_call", "_name", f"Solution().{func_sig.name}",
+                                               f"[{arg_kinds}]", to_str(ret_kind), "_in", "_out"])])
+
             main_code = [
                 "def main():",
+                *custom_main_code,
+                '    if len(sys.argv) > 1 and sys.argv[1] == "stress":',
+                "        iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 1000",
+                f"        {stress_call}",
+                '    if len(sys.argv) > 1 and sys.argv[1] == "bench":',
+                "        min_n = int(sys.argv[2]) if len(sys.argv) > 2 else 1000",
+                "        max_n = int(sys.argv[3]) if len(sys.argv) > 3 else 100000",
+                f"        {bench_call}",
                 "    _sol = Solution()",
-                *[f"    eval_example_{idx}(_sol)" for idx in range(len(signature.examples))],
+                *["    " + call("_run_example", [to_str(f"{problem.name} - Example {idx}"), f"eval_example_{idx}",
+                                              instance_name])
+                  for idx in range(len(signature.examples))],
+                "    _run_custom(_custom_input_path(__file__), custom_case)",
                 "",
                 "",
                 "if __name__ == '__main__':",
                 "    main()"]
 
+        constants = pool.constants()
+        if len(constants) > 0:
+            test_functions.insert(0, ["# Values shared by several examples.",
+                                      *[f"{name} = {literal}" for name, _, literal in constants]])
+
         test_code = self.list_join(test_functions + [main_code], ["", ""])
         return solution_code, test_code
@@ -0,0 +1,130 @@
+import functools
+import re
+from typing import List, NamedTuple, Tuple
+
+__all__ = [
+    "CppType",
+    "parse_cpp_type",
+]
+
+# Identifiers (possibly qualified, e.g. `std::vector`), numbers (template arguments of `array`), and punctuation.
+_TOKEN_REGEX = re.compile(r"\s*([A-Za-z_]\w*(?:\s*::\s*[A-Za-z_]\w*)*|\d+|[<>,*&])")
+_QUALIFIERS = {"const", "volatile"}
+_PUNCTUATION = {"<", ">", ",", "*", "&"}
+
+
+class CppType(NamedTuple):
+    r"""A parsed C++ type expression. For instance, ``const vector<pair<int, string>> &`` is parsed into a type named
+    ``vector`` with a single template argument (a ``pair`` of ``int`` and ``string``), which is ``const`` and a
+    reference. ``const`` anywhere outside template arguments applies to the whole type, which is enough for the types in
+    LeetCode signatures.
+    """
+    name: str  # name of the type without the `std::` prefix, e.g. "vector", "long long", or "TreeNode"
+    args: Tuple['CppType', ...] = ()  # template arguments
+    pointers: int = 0  # levels of pointers
+    const: bool = False
+    reference: bool = False
+
+    @property
+    def value_type(self) -> 'CppType':
+        r"""The type without ``const`` and references, i.e., the type of variables that store values of this type."""
+        if not self.const and not self.reference:
+            return self
+        return self._replace(const=False, reference=False)
+
+    @property
+    def is_vector(self) -> bool:
+        return self.name == "vector" and len(self.args) == 1 and self.pointers == 0
+
+    @property
+    def element(self) -> 'CppType':
+        r"""The element type of a ``vector``."""
+        if not self.is_vector:
+            raise ValueError(f"'{self}' is not a vector type")
+        return self.args[0]
+
+    @property
+    def is_tree(self) -> bool:
+        return self.name == "TreeNode" and self.pointers == 1
+
+    @property
+    def is_linked_list(self) -> bool:
+        return self.name == "ListNode" and self.pointers == 1
+
+    def __str__(self) -> str:
+        spelling = self.name
+        if len(self.args) > 0:
+            spelling += "<" + ", ".join(str(arg) for arg in self.args) + ">"
+        spelling += "*" * self.pointers
+        if self.const:
+            spelling = "const " + spelling
+        if self.reference:
+            spelling += "&"
+        return spelling
+
+
+def _tokenize(type_name: str) -> List[str]:
+    tokens = []
+    pos = 0
+    while pos < len(type_name):
+        match = _TOKEN_REGEX.match(type_name, pos)
+        if match is None:
+            if type_name[pos:].strip() == "":
+                break
+            raise ValueError(f"Invalid C++ type '{type_name}'")
+        tokens.append(re.sub(r"\s+", "", match.group(1)))
+        pos = match.end()
+    return tokens
+
+
+def _parse(tokens: List[str], pos: int, type_name: str) -> Tuple[CppType, int]:
+    const = False
+    words = []
+    # Qualifiers and the (possibly multi-word) name, e.g. `const unsigned long long`.
+    while pos < len(tokens) and tokens[pos] not in _PUNCTUATION:
+        if tokens[pos] in _QUALIFIERS:
+            const = const or tokens[pos] == "const"
+        else:
+            words.append(tokens[pos][len("std::"):] if tokens[pos].startswith("std::") else tokens[pos])
+        pos += 1
+    if len(words) == 0:
+        raise ValueError(f"Invalid C++ type '{type_name}'")
+    args = []
+    if pos < len(tokens) and tokens[pos] == "<":
+        while True:
+            arg, pos = _parse(tokens, pos + 1, type_name)
+            args.append(arg)
+            if pos < len(tokens) and tokens[pos] == ",":
+                continue
+            if pos < len(tokens) and tokens[pos] == ">":
+                pos += 1
+                break
+            raise ValueError(f"Invalid C++ type '{type_name}'")
+    pointers = 0
+    reference = False
+    while pos < len(tokens) and tokens[pos] in ("*", "&", "const", "volatile"):
+        if tokens[pos] == "*":
+            pointers += 1
+        elif tokens[pos] == "&":
+            reference = True
+        elif tokens[pos] == "const":
+            const = True
+        pos += 1
+    return CppType(" ".join(words), tuple(args), pointers, const, reference), pos
+
+
+@functools.lru_cache(maxsize=1024)
+def parse_cpp_type(type_name: str) -> CppType:
+    r"""Parse a C++ type expression, such as ``const vector<vector<int>>&`` or ``TreeNode *``. Results are cached, since
+    the same types are looked up for every value in every example.
+
+    :param type_name: The type expression.
+    :return: The parsed type.
+    :raises ValueError: If the type expression is malformed.
+    """
+    tokens = _tokenize(type_name)
+    typ, pos = _parse(tokens, 0, type_name)
+    if pos != len(tokens):
+        raise ValueError(f"Invalid C++ type '{type_name}'")
+    return typ
+
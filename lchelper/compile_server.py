@@ -0,0 +1,166 @@
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, IO, List, NamedTuple, Optional, Sequence, Tuple
+
+from lchelper.runner import CXX_FLAGS, ProblemTarget, SUPPORT_HEADERS, compile_problem, find_problems, \
+    precompile_header
+
+__all__ = [
+    "CompileResponse",
+    "CompileServer",
+    "serve_compile_requests",
+]
+
+
+class CompileResponse(NamedTuple):
+    r"""Result of a compile request."""
+    target: ProblemTarget
+    success: bool
+    output: str  # compiler output
+    latency: float  # seconds from receiving the request until the binary is ready
+    cached: bool  # whether the binary was already up-to-date, so nothing was compiled
+    cold_latency: Optional[float] = None  # seconds taken by a cold compiler invocation, if requested
+
+
+class CompileServer:
+    r"""A long-running compile service for generated C++ projects.
+
+    The support headers (``_boilerplate.hpp`` and ``_testing.h``) are header-only and mostly templates instantiated by
+    the solution, so they are kept warm as precompiled headers instead of object files. Each request then only compiles
+    the solution translation unit. The server remembers a digest of the sources and flags used for each binary, and
+    answers requests for unchanged problems without invoking the compiler at all, unless the binary was rebuilt by
+    someone else in the meantime.
+
+    The server is thread-safe, and requests for different problems are compiled concurrently.
+    """
+
+    def __init__(self, cxx: str = "g++", cxx_flags: Sequence[str] = ()):
+        r"""Create the server.
+
+        :param cxx: The C++ compiler to use.
+        :param cxx_flags: Extra flags passed to the C++ compiler.
+        """
+        self.cxx = cxx
+        self.cxx_flags = list(cxx_flags)
+        # binary path -> (digest of the inputs it was built from, modification time of the binary)
+        self._builds: Dict[str, Tuple[str, int]] = {}
+        self._locks: Dict[str, threading.Lock] = {}  # binary path -> lock held while building the binary
+        self._lock = threading.Lock()
+
+    def _digest(self, target: ProblemTarget) -> str:
+        directory = os.path.dirname(target.source_path)
+        digest = hashlib.sha1("\0".join([self.cxx, *CXX_FLAGS, *self.cxx_flags]).encode())
+        for path in [target.source_path, *(os.path.join(directory, header) for header in SUPPORT_HEADERS)]:
+            if os.path.exists(path):
+                with open(path, "rb") as f:
+                    digest.update(f.read())
+        return digest.hexdigest()
+
+    def _target_lock(self, target: ProblemTarget) -> threading.Lock:
+        with self._lock:
+            return self._locks.setdefault(target.binary_path, threading.Lock())
+
+    def warm(self, targets: Sequence[ProblemTarget]) -> List[str]:
+        r"""Precompile the support headers of problems in parallel, so that the first request for each problem is fast.
+
+        :param targets: The problems to prepare. Problems in languages other than C++ are ignored.
+        :return: A list of error messages for problems whose headers could not be precompiled.
+        """
+        cpp_targets = [target for target in targets if target.lang == "cpp"]
+        if len(cpp_targets) == 0:
+            return []
+        with ThreadPoolExecutor(max_workers=len(cpp_targets)) as executor:
+            results = list(executor.map(lambda target: precompile_header(target, self.cxx, self.cxx_flags),
+                                        cpp_targets))
+        return [f"Failed to precompile headers for problem '{target.name}':\n{output}"
+                for target, (success, output) in zip(cpp_targets, results) if not success]
+
+    def compile(self, target: ProblemTarget, compare_cold: bool = False) -> CompileResponse:
+        r"""Compile a problem, reusing the precompiled support headers.
+
+        :param target: The problem to compile.
+        :param compare_cold: If ``True``, also time a cold compiler invocation on a copy of the problem that does not
+            use precompiled headers. The cold compilation is not included in the latency of the request.
+        :return: The response to the request.
+        """
+        start_time = time.perf_counter()
+        with self._target_lock(target):
+            digest = self._digest(target)
+            cached = (target.lang == "cpp" and os.path.exists(target.binary_path) and
+                      self._builds.get(target.binary_path) == (digest, os.stat(target.binary_path).st_mtime_ns))
+            if cached:
+                success, output = True, ""
+            else:
+                if target.lang == "cpp":
+                    precompile_header(target, self.cxx, self.cxx_flags)  # only rebuilds if the headers changed
+                success, output = compile_problem(target, self.cxx, self.cxx_flags)
+                if success and target.lang == "cpp":
+                    self._builds[target.binary_path] = (digest, os.stat(target.binary_path).st_mtime_ns)
+                else:
+                    self._builds.pop(target.binary_path, None)
+        latency = time.perf_counter() - start_time
+        cold_latency = self.compile_cold(target) if compare_cold and target.lang == "cpp" else None
+        return CompileResponse(target, success, output, latency, cached, cold_latency)
+
+    def compile_cold(self, target: ProblemTarget) -> float:
+        r"""Time a cold compilation of a problem, as done by a plain ``g++`` invocation. The code file and support
+        headers are copied to a temporary folder, so that neither the precompiled headers nor the binary are touched.
+
+        :param target: The problem to compile.
+        :return: The compile time in seconds.
+        """
+        directory = os.path.dirname(target.source_path)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for path in [target.source_path, *(os.path.join(directory, header) for header in SUPPORT_HEADERS)]:
+                if os.path.exists(path):
+                    shutil.copy(path, temp_dir)
+            source_path = os.path.join(temp_dir, os.path.basename(target.source_path))
+            command = [self.cxx, *CXX_FLAGS, *self.cxx_flags, "-o", os.path.splitext(source_path)[0], source_path]
+            start_time = time.perf_counter()
+            subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            return time.perf_counter() - start_time
+
+
+def serve_compile_requests(server: CompileServer, project_paths: Sequence[str], requests: IO[str],
+                           responses: IO[str], compare_cold: bool = False) -> None:
+    r"""Answer compile requests read line-by-line from a stream, until the stream is closed.
+
+    Each request is the name of a problem (e.g. ``A_two_sum`` or ``A``) or the path to its code file. Each response is
+    written as a single line of JSON, with the keys ``problem``, ``success``, ``cached``, ``latency`` (in seconds),
+    ``cold_latency`` (only if ``compare_cold`` is set), and ``output`` (compiler output). Unknown problems are answered
+    with ``success`` set to ``false`` and an ``error`` message.
+
+    :param server: The server that compiles the problems.
+    :param project_paths: Paths to the projects whose problems are served.
+    :param requests: The stream to read requests from.
+    :param responses: The stream to write responses to.
+    :param compare_cold: If ``True``, also report the latency of a cold compiler invocation for each request.
+    """
+    targets = {}
+    for project_path in project_paths:
+        for target in find_problems(project_path):
+            targets[target.name] = targets[target.name.split("_", 1)[0]] = target
+            targets[os.path.abspath(target.source_path)] = target
+
+    for line in requests:
+        request = line.strip()
+        if request == "":
+            continue
+        target = targets.get(request, targets.get(os.path.abspath(request)))
+        if target is None:
+            response = {"problem": request, "success": False, "error": f"Unknown problem '{request}'"}
+        else:
+            result = server.compile(target, compare_cold)
+            response = {"problem": target.name, "success": result.success, "cached": result.cached,
+                        "latency": round(result.latency, 4), "output": result.output}
+            if result.cold_latency is not None:
+                response["cold_latency"] = round(result.cold_latency, 4)
+        responses.write(json.dumps(response) + "\n")
+        responses.flush()
@@ -0,0 +1,76 @@
+import math
+import re
+from typing import Callable, List, NamedTuple, Tuple
+
+__all__ = [
+    "ComplexityEstimate",
+    "parse_benchmark",
+    "estimate_complexity",
+]
+
+_BENCHMARK_REGEX = re.compile(r"^Benchmark n=(?P<n>\d+) time_ns=(?P<time>\d+)", re.MULTILINE)
+
+# Candidate complexity classes, in increasing order of growth.
+COMPLEXITY_CLASSES: List[Tuple[str, Callable[[float], float]]] = [
+    ("1", lambda n: 1.0),
+    ("log n", lambda n: math.log(n)),
+    ("n", lambda n: n),
+    ("n log n", lambda n: n * math.log(n)),
+    ("n^2", lambda n: n ** 2),
+    ("n^2 log n", lambda n: n ** 2 * math.log(n)),
+    ("n^3", lambda n: n ** 3),
+]
+
+
+class ComplexityEstimate(NamedTuple):
+    r"""Empirical time complexity of a solution."""
+    exponent: float  # slope of the log-log fit, i.e. time grows as n^exponent
+    complexity: str  # the best-fitting complexity class, e.g. "n log n"
+    projected_time: float  # projected running time in seconds at the maximum input size
+
+
+def parse_benchmark(output: str) -> List[Tuple[int, float]]:
+    r"""Collect the measurements printed by the generated benchmark code.
+
+    :param output: Output of the test program run in benchmark mode.
+    :return: A list of (input size, running time in seconds).
+    """
+    return [(int(match.group("n")), int(match.group("time")) / 1e9) for match in _BENCHMARK_REGEX.finditer(output)]
+
+
+def estimate_complexity(points: List[Tuple[int, float]], max_n: int) -> ComplexityEstimate:
+    r"""Estimate the time complexity of a solution from running times on inputs of different sizes.
+
+    The exponent is the slope of a least-squares fit of log-time against log-size. Each complexity class is fit with a
+    single constant factor in log space, and the class with the smallest squared error is picked. Timer noise dominates
+    for very fast runs, so points shorter than a microsecond are ignored if there are enough other points.
+
+    :param points: A list of (input size, running time in seconds), as returned by :func:`parse_benchmark`.
+    :param max_n: The maximum input size allowed by the problem constraints, used for projecting the running time.
+    :return: The estimated complexity.
+    """
+    valid_points = [(n, t) for n, t in points if n > 1 and t >= 1e-6]
+    if len(valid_points) >= 2:
+        points = valid_points
+    points = [(n, max(t, 1e-9)) for n, t in points if n > 1]
+    if len(points) < 2:
+        raise ValueError("At least two measurements on different input sizes are required")
+
+    log_n = [math.log(n) for n, _ in points]
+    log_t = [math.log(t) for _, t in points]
+    mean_log_n = sum(log_n) / len(points)
+    mean_log_t = sum(log_t) / len(points)
+    var_log_n = sum((x - mean_log_n) ** 2 for x in log_n)
+    if var_log_n == 0:
+        raise ValueError("At least two measurements on different input sizes are required")
+    exponent = sum((x - mean_log_n) * (y - mean_log_t) for x, y in zip(log_n, log_t)) / var_log_n
+
+    best = None
+    for name, fn in COMPLEXITY_CLASSES:
+        residuals = [y - math.log(fn(n)) for (n, _), y in zip(points, log_t)]
+        log_factor = sum(residuals) / len(residuals)
+        error = sum((r - log_factor) ** 2 for r in residuals)
+        if best is None or error < best[0]:
+            best = (error, name, math.exp(log_factor) * fn(max_n))
+    _, complexity, projected_time = best
+    return ComplexityEstimate(exponent, complexity, projected_time)
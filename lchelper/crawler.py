@@ -1,6 +1,9 @@
+import contextlib
 import http.cookiejar
 import os
-from typing import List
+import queue
+import threading
+from typing import Iterator, List, Optional
 
 from selenium import webdriver
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
@@ -10,6 +13,8 @@ from selenium.webdriver.support.wait import WebDriverWait
 
 from lchelper.common import Problem, User
 from lchelper.logging import log
+from lchelper.tracing import trace_span
+from lchelper.utils import site_url
 
 __all__ = [
     "get_users",
@@ -17,6 +22,7 @@ __all__ = [
     "update_cookie",
     "get_problem",
     "get_problems",
+    "BrowserPool",
 ]
 
 COOKIE_FOLDER = "cookies/"
@@ -42,6 +48,16 @@ def get_cookie_path(username: str, site: str) -> str:
 
 
 def check_login(browser, site: str, timeout: int = 10) -> bool:
+    with trace_span("check_login", "crawler", site=site):
+        return _check_login(browser, site, timeout)
+
+
+def _visit(browser, url: str) -> None:
+    with trace_span("browser.get", "crawler", url=url):
+        browser.get(url)
+
+
+def _check_login(browser, site: str, timeout: int) -> bool:
     try:
         if site == "leetcode":
             WebDriverWait(browser, timeout).until(
@@ -63,7 +79,7 @@ def update_cookie(username: str, site: str) -> None:
     browser.set_window_position(0, 0)
     browser.set_window_size(800, 600)
     browser.switch_to.window(browser.window_handles[0])
-    url = f"https://{site}.com/accounts/login/"
+    url = f"{site_url(site)}/accounts/login/"
     browser.get(url)
     browser.implicitly_wait(10)
 
@@ -109,7 +125,12 @@ def update_cookie(username: str, site: str) -> None:
     jar.save(cookie_path, ignore_discard=True, ignore_expires=True)
 
 
-def get_problem(problem_url: str, site: str, cookie_path: str) -> Problem:
+def _create_browser():
+    with trace_span("browser.start", "crawler"):
+        return _start_browser()
+
+
+def _start_browser():
     options = webdriver.FirefoxOptions()
     options.add_argument("headless")
     browser = webdriver.Firefox(service_log_path=os.path.devnull, options=options)
@@ -117,36 +138,43 @@ def get_problem(problem_url: str, site: str, cookie_path: str) -> Problem:
     browser.maximize_window()
     # browser.set_window_size(3840, 600)  # a wide enough window so code does not get wrapped
     browser.implicitly_wait(10)
+    return browser
+
+
+def get_problem(problem_url: str, site: str, cookie_path: str) -> Problem:
+    browser = _create_browser()
 
     log("Loading LeetCode problem page...")
-    browser.get(problem_url)
+    _visit(browser, problem_url)
     cookie_jar = http.cookiejar.LWPCookieJar(cookie_path)
     cookie_jar.load(ignore_discard=True, ignore_expires=True)
     for c in cookie_jar:
         browser.add_cookie({"name": c.name, 'value': c.value, 'path': c.path})
     # visit again to refresh page with cookies added
-    browser.get(problem_url)
+    _visit(browser, problem_url)
 
     if not check_login(browser, site, timeout=10):
         browser.quit()
         print(f"Cookie '{cookie_path}' might have expired. Please try logging in again")
         exit(1)
 
-    browser.get(problem_url)
-    try:
-        # Page during contest; editor located below statement.
-        statement_css_selector = "div[class='content__u3I1 question-content__JfgR']"
-        if '/challenge/card' in problem_url:
-            statement_css_selector = "div[class='question-description__3U1T']"
-        code_css_selector = "pre.CodeMirror-line"
-        log(f"start find element")
-        statement = browser.find_element_by_css_selector(statement_css_selector).text
-        log(f"statement:{statement}")
-    except (TimeoutException, NoSuchElementException):
-        # Page after contest; statement and editor in vertically split panes.
-        statement_css_selector = "div[data-key='description-content'] div.content__1Y2H"
-        code_css_selector = "div.monaco-scrollable-element div.view-line"
-        statement = browser.find_element_by_css_selector(statement_css_selector).text
+    _visit(browser, problem_url)
+    with trace_span("find_statement", "crawler", problem=problem_url) as span_args:
+        try:
+            # Page during contest; editor located below statement.
+            statement_css_selector = "div[class='content__u3I1 question-content__JfgR']"
+            if '/challenge/card' in problem_url:
+                statement_css_selector = "div[class='question-description__3U1T']"
+            code_css_selector = "pre.CodeMirror-line"
+            log("Finding problem statement", "debug")
+            statement = browser.find_element_by_css_selector(statement_css_selector).text
+            log("Statement: %s", "debug", statement)
+        except (TimeoutException, NoSuchElementException):
+            # Page after contest; statement and editor in vertically split panes.
+            span_args["fallback"] = True  # the implicit wait for the first selector expired
+            statement_css_selector = "div[data-key='description-content'] div.content__1Y2H"
+            code_css_selector = "div.monaco-scrollable-element div.view-line"
+            statement = browser.find_element_by_css_selector(statement_css_selector).text
     examples = [
         elem.text for elem in browser.find_elements_by_css_selector("pre:not([class])") if elem.text]
     # TODO: Should make sure C++ is selected!
@@ -164,37 +192,90 @@ def get_problem(problem_url: str, site: str, cookie_path: str) -> Problem:
     return problem
 
 
-def get_problems(contest_url: str, site: str, cookie_path: str) -> List[Problem]:
+class BrowserPool:
+    r"""A pool of headless browsers shared by concurrent crawls. Browsers are started lazily, at most ``size`` of them
+    are alive at a time, and each is reused by later crawls instead of starting a new browser for every contest.
+
+    Use the pool as a context manager to close all browsers on exit::
+
+        with BrowserPool(2) as pool:
+            problems = get_problems(contest_url, site, cookie_path, pool=pool)
+    """
+
+    def __init__(self, size: int = 1):
+        if size < 1:
+            raise ValueError("Pool size must be positive")
+        self.size = size
+        self._idle: "queue.LifoQueue" = queue.LifoQueue()
+        self._browsers = []
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def acquire(self) -> Iterator:
+        r"""Borrow a browser from the pool, waiting until one is available. A browser is started if there are no idle
+        ones. The browser is returned to the pool when the context exits.
+        """
+        with self._slots:
+            try:
+                browser = self._idle.get_nowait()
+            except queue.Empty:
+                browser = _create_browser()
+                with self._lock:
+                    self._browsers.append(browser)
+            try:
+                yield browser
+            finally:
+                self._idle.put(browser)
+
+    def close(self) -> None:
+        r"""Quit all browsers started by the pool."""
+        with self._lock:
+            browsers, self._browsers = self._browsers, []
+        for browser in browsers:
+            browser.quit()
+        self._idle = queue.LifoQueue()
+
+    def __enter__(self) -> 'BrowserPool':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+def get_problems(contest_url: str, site: str, cookie_path: str, pool: Optional[BrowserPool] = None) -> List[Problem]:
     r"""Obtain the list of problems in a contest, given its URL.
 
     :param contest_url: URL to the contest page.
     :param site: LeetCode site name.
     :param cookie_path: Path to the cookie to use for signing in.
+    :param pool: If specified, a browser is borrowed from the pool instead of starting a new one.
     :return: A list of problem descriptions.
     """
     if not os.path.exists(cookie_path):
         raise ValueError(f"No cookies file found at path '{cookie_path}'. Please login first")
+    with trace_span("get_problems", "crawler", url=contest_url):
+        if pool is not None:
+            with pool.acquire() as browser:
+                return _crawl_contest(browser, contest_url, site, cookie_path)
+        browser = _create_browser()
+        try:
+            return _crawl_contest(browser, contest_url, site, cookie_path)
+        finally:
+            browser.quit()
 
-    options = webdriver.FirefoxOptions()
-    options.add_argument("headless")
-    browser = webdriver.Firefox(service_log_path=os.path.devnull, options=options)
-    browser.set_window_position(0, 0)
-    browser.maximize_window()
-    # browser.set_window_size(3840, 600)  # a wide enough window so code does not get wrapped
-    browser.implicitly_wait(10)
 
-    log("Loading LeetCode contest page...")
-    browser.get(contest_url)  # visit the page first to update the domain, and then set cookies
+def _crawl_contest(browser, contest_url: str, site: str, cookie_path: str) -> List[Problem]:
+    log(f"Loading LeetCode contest page {contest_url}...")
+    _visit(browser, contest_url)  # visit the page first to update the domain, and then set cookies
     cookie_jar = http.cookiejar.LWPCookieJar(cookie_path)
     cookie_jar.load(ignore_discard=True, ignore_expires=True)
     for c in cookie_jar:
         browser.add_cookie({"name": c.name, 'value': c.value, 'path': c.path})
-    browser.get(contest_url)  # visit again to refresh page with cookies added
+    _visit(browser, contest_url)  # visit again to refresh page with cookies added
 
     if not check_login(browser, site, timeout=10):
-        browser.quit()
-        print(f"Cookie '{cookie_path}' might have expired. Please try logging in again")
-        exit(1)
+        raise RuntimeError(f"Cookie '{cookie_path}' might have expired. Please try logging in again")
 
     elem = browser.find_element_by_css_selector("ul.contest-question-list")
     links = elem.find_elements_by_tag_name("a")
@@ -203,27 +284,29 @@ def get_problems(contest_url: str, site: str, cookie_path: str) -> List[Problem]
 
     parsed_problems = []
     for idx, (problem_url, problem_name) in enumerate(problem_paths):
-        browser.get(problem_url)
-        try:
-            # Page during contest; editor located below statement.
-            statement_css_selector = "div.question-content"
-            code_css_selector = "pre.CodeMirror-line"
-            statement = browser.find_element_by_css_selector(statement_css_selector).text
-        except (TimeoutException, NoSuchElementException):
-            # Page after contest; statement and editor in vertically split panes.
-            statement_css_selector = "div[data-key='description-content'] div.content__1Y2H"
-            code_css_selector = "div.monaco-scrollable-element div.view-line"
-            statement = browser.find_element_by_css_selector(statement_css_selector).text
-        examples = [
-            elem.text for elem in browser.find_elements_by_css_selector("pre:not([class])") if elem.text]
-        # TODO: Should make sure C++ is selected!
-        code = [elem.text for elem in browser.find_elements_by_css_selector(code_css_selector)]
         problem_name = '_'.join(problem_name.lower().split(' '))
+        with trace_span("crawl_problem", "crawler", problem=problem_name):
+            _visit(browser, problem_url)
+            with trace_span("find_statement", "crawler", problem=problem_name) as span_args:
+                try:
+                    # Page during contest; editor located below statement.
+                    statement_css_selector = "div.question-content"
+                    code_css_selector = "pre.CodeMirror-line"
+                    statement = browser.find_element_by_css_selector(statement_css_selector).text
+                except (TimeoutException, NoSuchElementException):
+                    # Page after contest; statement and editor in vertically split panes.
+                    span_args["fallback"] = True  # the implicit wait for the first selector expired
+                    statement_css_selector = "div[data-key='description-content'] div.content__1Y2H"
+                    code_css_selector = "div.monaco-scrollable-element div.view-line"
+                    statement = browser.find_element_by_css_selector(statement_css_selector).text
+            examples = [
+                elem.text for elem in browser.find_elements_by_css_selector("pre:not([class])") if elem.text]
+            # TODO: Should make sure C++ is selected!
+            code = [elem.text for elem in browser.find_elements_by_css_selector(code_css_selector)]
         problem = Problem(problem_url, problem_name, statement, examples, code)
         parsed_problems.append(problem)
         log(f"Parsed problem ({idx + 1}/{len(problem_paths)}): {problem_name}")
 
-    browser.quit()
-    log("All problems successfully crawled", "success")
+    log(f"All problems successfully crawled from {contest_url}", "success")
 
     return parsed_problems
@@ -0,0 +1,200 @@
+import contextlib
+import io
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+from typing import Callable, Dict, Iterator, List, Optional
+
+from lchelper.logging import log
+
+__all__ = [
+    "DEFAULT_SOCKET_PATH",
+    "daemon_available",
+    "serve_daemon",
+    "forward_to_daemon",
+    "stop_daemon",
+]
+
+DEFAULT_SOCKET_PATH = os.environ.get("LCHELPER_DAEMON_SOCKET",
+                                     os.path.join(os.path.expanduser("~"), ".lchelper", "daemon.sock"))
+
+# Environment variables of the client that are forwarded to the daemon.
+FORWARDED_ENV_PREFIXES = ("LCHELPER_", "CXX")
+
+# A command handler takes the command line arguments, the working directory of the client, and a stream for the output,
+# and returns the exit code.
+CommandHandler = Callable[[List[str], str, io.TextIOBase], int]
+
+
+def daemon_available() -> bool:
+    r"""Whether the platform supports the daemon, which communicates through Unix domain sockets."""
+    return hasattr(socket, "AF_UNIX")
+
+
+class _OutputStream(io.TextIOBase):
+    r"""A text stream that forwards everything written to it to the client, as ``{"output": ...}`` messages."""
+
+    def __init__(self, connection: socket.socket):
+        self._connection = connection
+        self._buffer: List[str] = []
+        self._closed = False  # whether the client went away
+
+    def writable(self) -> bool:
+        return True
+
+    def isatty(self) -> bool:
+        return False
+
+    def write(self, s: str) -> int:
+        self._buffer.append(s)
+        if "\n" in s:
+            self.flush()
+        return len(s)
+
+    def flush(self) -> None:
+        if len(self._buffer) > 0 and not self._closed:
+            data = "".join(self._buffer)
+            try:
+                _send(self._connection, {"output": data})
+            except OSError:
+                self._closed = True
+        self._buffer = []
+
+
+def _send(connection: socket.socket, message: dict) -> None:
+    connection.sendall((json.dumps(message) + "\n").encode())
+
+
+def _forwarded(key: str) -> bool:
+    return key.startswith(FORWARDED_ENV_PREFIXES)
+
+
+@contextlib.contextmanager
+def _client_environment(env: Dict[str, str]) -> Iterator[None]:
+    saved = {key: value for key, value in os.environ.items() if _forwarded(key)}
+    for key in saved:
+        del os.environ[key]
+    os.environ.update({key: value for key, value in env.items() if _forwarded(key)})
+    try:
+        yield
+    finally:
+        for key in [key for key in os.environ if _forwarded(key)]:
+            del os.environ[key]
+        os.environ.update(saved)
+
+
+def serve_daemon(handler: CommandHandler, socket_path: str = DEFAULT_SOCKET_PATH) -> None:
+    r"""Run the daemon in the current thread until a ``shutdown`` request is received.
+
+    Each client connection carries one request, which is a line of JSON: either
+    ``{"argv": [...], "cwd": ..., "env": {...}}`` to run a command, or ``{"shutdown": true}`` to stop the daemon. The
+    environment variables in ``env`` (see :data:`FORWARDED_ENV_PREFIXES`) replace those of the daemon while the command
+    runs. Output of the command is streamed back as ``{"output": ...}`` messages, followed by ``{"exit": <code>}``, one
+    JSON object per line.
+
+    Commands change the working directory, the environment, and the standard output of the whole process, and share
+    all other state of the process, so requests are handled one at a time, in the order they arrive. Since any client
+    can run commands, only the owner of the daemon may connect to the socket.
+
+    :param handler: Function that runs a command.
+    :param socket_path: Path to the Unix domain socket to listen on.
+    """
+    if not daemon_available():
+        raise RuntimeError("The daemon requires Unix domain sockets, which are not supported on this platform")
+    if os.path.exists(socket_path):
+        connection = _connect(socket_path)
+        if connection is not None:
+            connection.close()
+            raise RuntimeError(f"A daemon is already listening on '{socket_path}'")
+        os.remove(socket_path)  # left behind by a daemon that did not shut down cleanly
+    os.makedirs(os.path.dirname(socket_path) or ".", exist_ok=True)
+    request_lock = threading.Lock()
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            line = self.rfile.readline()
+            if not line:  # the client disconnected without sending a request
+                return
+            request = json.loads(line)
+            if request.get("shutdown"):
+                _send(self.connection, {"exit": 0})
+                threading.Thread(target=server.shutdown, daemon=True).start()
+                return
+            output = _OutputStream(self.connection)
+            with request_lock, _client_environment(request.get("env", {})):
+                try:
+                    return_code = handler(request["argv"], request["cwd"], output)
+                except Exception as e:
+                    output.write(f"Daemon failed to handle request: {e!r}\n")
+                    return_code = 1
+            output.flush()
+            try:
+                _send(self.connection, {"exit": return_code})
+            except OSError:
+                pass
+
+    server = socketserver.ThreadingUnixStreamServer(socket_path, Handler)
+    server.daemon_threads = True
+    os.chmod(socket_path, 0o600)
+    log(f"Daemon listening on '{socket_path}'", "success")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+
+
+def _connect(socket_path: str) -> Optional[socket.socket]:
+    if not daemon_available() or not os.path.exists(socket_path):
+        return None
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.connect(socket_path)
+    except OSError:
+        connection.close()
+        return None
+    return connection
+
+
+def forward_to_daemon(argv: List[str], cwd: str, socket_path: str = DEFAULT_SOCKET_PATH) -> Optional[int]:
+    r"""Run a command in the daemon, if one is running, and print its output.
+
+    :param argv: Command line arguments, excluding the program name.
+    :param cwd: Working directory to run the command in.
+    :param socket_path: Path to the Unix domain socket of the daemon.
+    :return: Exit code of the command, or ``None`` if no daemon is running.
+    """
+    connection = _connect(socket_path)
+    if connection is None:
+        return None
+    with connection:
+        env = {key: value for key, value in os.environ.items() if _forwarded(key)}
+        _send(connection, {"argv": argv, "cwd": cwd, "env": env})
+        with connection.makefile("r") as responses:
+            for line in responses:
+                response = json.loads(line)
+                if "output" in response:
+                    sys.stdout.write(response["output"])
+                    sys.stdout.flush()
+                elif "exit" in response:
+                    return response["exit"]
+    raise RuntimeError("The daemon closed the connection before the command finished")
+
+
+def stop_daemon(socket_path: str = DEFAULT_SOCKET_PATH) -> bool:
+    r"""Stop the daemon, if one is running.
+
+    :param socket_path: Path to the Unix domain socket of the daemon.
+    :return: Whether a daemon was running.
+    """
+    connection = _connect(socket_path)
+    if connection is None:
+        return False
+    with connection:
+        _send(connection, {"shutdown": True})
+        connection.makefile("r").readline()
+    return True
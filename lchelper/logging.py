@@ -1,27 +1,140 @@
+import atexit
+import json
+import os
+import sys
+import threading
 import time
+from typing import Any, Dict, IO, List, Tuple, Union
 
 from termcolor import colored
 
 __all__ = [
     "log",
+    "set_log_level",
+    "get_log_level",
+    "add_json_log_sink",
+    "remove_json_log_sink",
+    "flush_logs",
 ]
 
 COLOR_MAP = {
+    "debug": "blue",
     "success": "green",
     "warning": "yellow",
     "error": "red",
     "info": "white",
 }
+LEVELS = {
+    "debug": 10,
+    "info": 20,
+    "success": 20,
+    "warning": 30,
+    "error": 40,
+}
+DEFAULT_LOG_LEVEL = os.environ.get("LCHELPER_LOG_LEVEL", "info")
+
+_lock = threading.Lock()
+_threshold = LEVELS.get(DEFAULT_LOG_LEVEL, LEVELS["info"])
+_json_sinks: List[Tuple[IO[str], int, bool]] = []  # (stream, threshold, whether the stream should be closed on exit)
+
+
+def set_log_level(level: str) -> None:
+    r"""Set the minimum level of messages written to the terminal. Messages below the level are dropped without being
+    formatted. The default level is ``info``, or the value of the ``LCHELPER_LOG_LEVEL`` environment variable.
+
+    :param level: The minimum logging level. Available options are ``debug``, ``info``, ``warning``, and ``error``.
+    """
+    global _threshold
+    if level not in LEVELS:
+        raise ValueError(f"Incorrect logging level '{level}'")
+    _threshold = LEVELS[level]
+
+
+def get_log_level() -> str:
+    return next(level for level, value in LEVELS.items() if value == _threshold)
+
+
+def add_json_log_sink(file: Union[str, IO[str]], level: str = "debug") -> IO[str]:
+    r"""Also write log messages to a file, with one JSON object per line. Each object contains the keys ``time`` (UNIX
+    timestamp), ``level``, and ``message``.
+
+    :param file: Path to the log file, or a writable stream.
+    :param level: The minimum level of messages written to the file, independent of the terminal level.
+    :return: The stream that messages are written to, which can be passed to :func:`remove_json_log_sink`.
+    """
+    if level not in LEVELS:
+        raise ValueError(f"Incorrect logging level '{level}'")
+    if isinstance(file, str):
+        stream, close = open(file, "a"), True
+    else:
+        stream, close = file, False
+    with _lock:
+        _json_sinks.append((stream, LEVELS[level], close))
+    return stream
+
+
+def remove_json_log_sink(stream: IO[str]) -> None:
+    r"""Stop writing log messages to a stream added by :func:`add_json_log_sink`. The stream is closed if it was opened
+    by :func:`add_json_log_sink`.
+    """
+    with _lock:
+        for idx, (sink, _, close) in enumerate(_json_sinks):
+            if sink is stream:
+                del _json_sinks[idx]
+                if close:
+                    stream.close()
+                else:
+                    stream.flush()
+                break
+
 
+def flush_logs() -> None:
+    r"""Flush buffered log messages. This is done automatically for warnings and errors, and when the program exits."""
+    with _lock:
+        sys.stdout.flush()
+        for stream, _, _ in _json_sinks:
+            stream.flush()
 
-def log(msg: str, level: str = "info") -> None:
+
+def _close_sinks() -> None:
+    flush_logs()
+    with _lock:
+        for stream, _, close in _json_sinks:
+            if close:
+                stream.close()
+        _json_sinks.clear()
+
+
+atexit.register(_close_sinks)
+
+
+def log(msg: str, level: str = "info", *args: Any) -> None:
     r"""Write a line of log with the specified logging level.
 
-    :param msg: Message to log.
-    :param level: Logging level. Available options are ``success``, ``warning``, ``error``, and ``info``.
+    Output is buffered, and only flushed immediately for warnings and errors. Messages below the current logging level
+    (see :func:`set_log_level`) are skipped without formatting them, so expensive messages should pass their arguments
+    separately instead of formatting them in advance, e.g. ``log("Input: %s", "debug", value)``.
+
+    :param msg: Message to log. If ``args`` are given, the message is a ``%``-style format string.
+    :param level: Logging level. Available options are ``debug``, ``success``, ``warning``, ``error``, and ``info``.
+    :param args: Arguments for the format string.
     """
-    if level not in COLOR_MAP:
+    value = LEVELS.get(level)
+    if value is None:
         raise ValueError(f"Incorrect logging level '{level}'")
-    # time_str = time.strftime("[%Y-%m-%d %H:%M:%S]")
-    # print(colored(time_str, COLOR_MAP[level]), msg, flush=True)
-    print(colored(msg, COLOR_MAP[level]), flush=True)
+    to_terminal = value >= _threshold
+    sinks = [stream for stream, threshold, _ in _json_sinks if value >= threshold] if _json_sinks else []
+    if not to_terminal and len(sinks) == 0:
+        return
+    if args:
+        msg = msg % args
+    with _lock:
+        if to_terminal:
+            sys.stdout.write(colored(msg, COLOR_MAP[level]) + "\n")
+            if value >= LEVELS["warning"]:
+                sys.stdout.flush()
+        if len(sinks) > 0:
+            record: Dict[str, Any] = {"time": time.time(), "level": level, "message": msg}
+            line = json.dumps(record) + "\n"
+            for stream in sinks:
+                stream.write(line)
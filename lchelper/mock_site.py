@@ -0,0 +1,171 @@
+import html
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+from lchelper.common import Problem
+
+__all__ = [
+    "make_mock_problems",
+    "MockLeetCodeSite",
+]
+
+_MOCK_CODE = [
+    "class Solution {",
+    "public:",
+    "    vector<int> {name}(vector<int>& nums, int k) {",
+    "        ",
+    "    }",
+    "};",
+]
+
+
+def make_mock_problems(count: int, example_size: int = 10, examples: int = 3, seed: int = 0) -> List[Problem]:
+    r"""Create problems for the mock site. Each problem takes an array and an integer, and returns an array.
+
+    :param count: Number of problems.
+    :param example_size: Length of arrays in the examples.
+    :param examples: Number of examples in each problem.
+    :param seed: Random seed for generating the examples.
+    :return: A list of problem descriptions, in the same format as those returned by the crawler.
+    """
+    rand = random.Random(seed)
+    problems = []
+    for idx in range(count):
+        name = f"mock_problem_{idx + 1}"
+        func_name = f"solve{idx + 1}"
+        problem_examples = []
+        for _ in range(examples):
+            nums = [rand.randint(-10 ** 9, 10 ** 9) for _ in range(example_size)]
+            output = [rand.randint(-10 ** 9, 10 ** 9) for _ in range(example_size)]
+            problem_examples.append(f"Input: nums = [{','.join(map(str, nums))}], k = {rand.randint(1, 100)}\n"
+                                    f"Output: [{','.join(map(str, output))}]")
+        code = [line.replace("{name}", func_name) for line in _MOCK_CODE]
+        statement = f"Given an integer array nums and an integer k, return the answer for problem {idx + 1}."
+        problems.append(Problem("", name, statement, problem_examples, code))
+    return problems
+
+
+_PAGE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"><title>{title}</title></head>
+<body>
+<nav>{navbar}</nav>
+{body}
+</body>
+</html>
+"""
+# Login indicators checked by the crawler, for both LeetCode and LeetCode-CN.
+_NAVBAR = ('<div id="navbar-right-container"><div><a class="ant-dropdown-link">mock-user</a></div></div>'
+           '<div data-cypress="NavbarMenuIconItem"><span>mock-user</span></div>')
+
+
+class MockLeetCodeSite:
+    r"""A local HTTP server that mimics the contest pages of LeetCode, using the same DOM structure (and CSS selectors)
+    that the crawler relies on. This allows running ``get`` end-to-end without network access or a real account.
+
+    The site serves these pages:
+
+    - ``/contest/<contest-name>``: The list of problems in ``ul.contest-question-list``.
+    - ``/contest/<contest-name>/problems/<problem-slug>/``: The problem statement and examples in
+      ``div.question-content``, and the code template as ``pre.CodeMirror-line`` elements.
+
+    Pages only show the login indicator when the request carries a cookie, like the real site. Point the crawler to the
+    mock site by setting the ``LCHELPER_SITE_URL`` environment variable to :attr:`url`.
+    """
+
+    def __init__(self, contests: Dict[str, List[Problem]], host: str = "127.0.0.1", port: int = 0):
+        r"""Create the mock site. The server is not started until :meth:`start` is called.
+
+        :param contests: Mapping from contest names (e.g. ``"weekly-contest-1"``) to problems in the contest.
+        :param host: The host to listen on.
+        :param port: The port to listen on. A free port is picked if ``0``.
+        """
+        self.contests = contests
+        self.host = host
+        self.port = port
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        r"""Base URL of the site, without a trailing slash."""
+        if self._server is None:
+            raise ValueError("The mock site is not started")
+        return f"http://{self.host}:{self._server.server_address[1]}"
+
+    def render(self, path: str, logged_in: bool = True) -> Optional[str]:
+        r"""Render the page at the given path.
+
+        :param path: Path of the page, e.g. ``"/contest/weekly-contest-1"``.
+        :param logged_in: Whether to show the login indicator.
+        :return: The HTML of the page, or ``None`` if the page does not exist.
+        """
+        parts = [part for part in path.split("?")[0].split("/") if part]
+        if len(parts) < 2 or parts[0] != "contest" or parts[1] not in self.contests:
+            return None
+        contest_name, problems = parts[1], self.contests[parts[1]]
+        if len(parts) == 2:
+            links = "\n".join(
+                f'<li><a href="/contest/{contest_name}/problems/{_slug(problem)}/">'
+                f'{html.escape(_title(problem))}</a></li>' for problem in problems)
+            body = f'<ul class="contest-question-list">\n{links}\n</ul>'
+            title = contest_name
+        elif len(parts) == 4 and parts[2] == "problems":
+            problem = next((problem for problem in problems if _slug(problem) == parts[3]), None)
+            if problem is None:
+                return None
+            examples = "\n".join(f"<p><strong>Example {idx + 1}:</strong></p>\n<pre>{html.escape(example)}</pre>"
+                                 for idx, example in enumerate(problem.examples))
+            code = "\n".join(f'<pre class="CodeMirror-line">{html.escape(line) or " "}</pre>' for line in problem.code)
+            body = (f'<div class="question-content">\n<p>{html.escape(problem.statement)}</p>\n{examples}\n</div>\n'
+                    f'<div class="CodeMirror-code">\n{code}\n</div>')
+            title = _title(problem)
+        else:
+            return None
+        return _PAGE_TEMPLATE.format(title=html.escape(title), navbar=_NAVBAR if logged_in else "", body=body)
+
+    def start(self) -> 'MockLeetCodeSite':
+        r"""Start serving in a background thread."""
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                page = site.render(self.path, logged_in=self.headers.get("Cookie") is not None)
+                data = (page if page is not None else "Not Found").encode()
+                self.send_response(200 if page is not None else 404)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format: str, *args) -> None:
+                pass  # do not print a line for every request
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        r"""Stop the server."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = self._thread = None
+
+    def __enter__(self) -> 'MockLeetCodeSite':
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+
+def _title(problem: Problem) -> str:
+    return problem.name.replace("_", " ").title()
+
+
+def _slug(problem: Problem) -> str:
+    return problem.name.replace("_", "-")
@@ -3,11 +3,17 @@ from typing import Any, Dict, List, Tuple, Union
 
 from lchelper.common import *
 from lchelper.logging import log
+from lchelper.tracing import trace_span
 
 __all__ = [
     "parse_problem",
 ]
 
+# Parsed signatures of recently parsed problems, which are reused when a long-running process (such as the daemon)
+# generates code for the same problem again. Signatures must not be modified.
+MAX_CACHED_SIGNATURES = 256
+_signature_cache: Dict[Tuple[Any, ...], Union[ProblemSignature, InteractiveProblemSignature]] = {}
+
 
 def parse_vardef(s: str) -> Tuple[str, str]:
     r"""Given a variable definition, return the type and identifier name. For instance:
@@ -73,6 +79,18 @@ def parse_value(s: str) -> Tuple[Any, str]:
 def parse_problem(problem: Problem, site: str = "leetcode") -> Union[ProblemSignature, InteractiveProblemSignature]:
     r"""Parse the problem given the raw contents crawled from the web.
     """
+    key = (site, problem.name, tuple(problem.examples), tuple(problem.code))
+    signature = _signature_cache.get(key)
+    if signature is None:
+        with trace_span("parse_problem", "parser", problem=problem.name):
+            signature = _parse_problem(problem, site)
+        if len(_signature_cache) >= MAX_CACHED_SIGNATURES:
+            del _signature_cache[next(iter(_signature_cache))]  # evict the oldest entry
+        _signature_cache[key] = signature
+    return signature
+
+
+def _parse_problem(problem: Problem, site: str) -> Union[ProblemSignature, InteractiveProblemSignature]:
 
     def find_example_section(s: str, cur_tag: str, next_tag: str, colon: str = ":", ignore_error: bool = False) -> str:
         r"""Find the part in the example that is between two tags. If ``next_tag`` does not exist, then find the part
@@ -163,7 +181,8 @@ def parse_problem(problem: Problem, site: str = "leetcode") -> Union[ProblemSign
                         assert False
                 elif idx != 0:
                     log(f"Problem \"{problem.name}\": Argument {idx + 1} is unnamed in example {ex_id + 1}", "warning")
-                log(f'[debug] input_str:{input_str}')
+                log("Problem \"%s\": Parsing argument %d of example %d from: %s", "debug",
+                    problem.name, idx + 1, ex_id + 1, input_str)
                 try:
                     input_val, input_str = parse_value(input_str)
                     input_vals[name] = input_val
@@ -0,0 +1,516 @@
+import contextlib
+import math
+import os
+import re
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+__all__ = [
+    "ProblemTarget",
+    "Verdict",
+    "ResourceLimits",
+    "ResourceUsage",
+    "RunResult",
+    "find_problems",
+    "precompile_header",
+    "compile_problem",
+    "run_problem",
+    "run_problem_limited",
+    "classify_limits",
+    "process_problem",
+    "parse_verdicts",
+    "DEFAULT_MEMORY_RATIO",
+    "is_memory_heavy",
+    "run_project",
+    "format_summary",
+]
+
+CXX_FLAGS = ["-std=c++17", "-O2", "-DJONATHAN", "-DLEETCODE_LOCAL"]
+# Support headers included by generated C++ code. `_testing.h` includes `_boilerplate.hpp`, so precompiling the former
+# covers both.
+SUPPORT_HEADERS = ["_testing.h", "_boilerplate.hpp"]
+LANGUAGE_EXTENSIONS = {
+    ".cc": "cpp",
+    ".py": "python",
+}
+
+_PROBLEM_DIR_REGEX = re.compile(r"^[A-Z]_(.+)$")
+_ANSI_ESCAPE_REGEX = re.compile(r"\x1b\[[0-9;]*m")
+_VERDICT_REGEX = re.compile(r"^(?P<label>.*?)\s*\[(?P<verdict>OK|WRONG|TLE)\]"
+                            r"(?:\s*\((?P<time>\d+) us\))?"
+                            r"(?:\s*\[MEM peak (?P<peak>\d+) B, (?P<allocs>\d+) allocs, input (?P<input>\d+) B\])?"
+                            r"(?P<slow>\s*\[SLOW\])?")
+
+# Examples are flagged when the peak heap usage of the solution exceeds `ratio * input + MEMORY_SLACK_BYTES`. The slack
+# keeps small examples from being flagged for fixed-size allocations.
+DEFAULT_MEMORY_RATIO = 16.0
+MEMORY_SLACK_BYTES = 64 * 1024
+
+# Output of programs that failed to allocate memory, which is how exceeding the address-space limit shows up.
+_OUT_OF_MEMORY_REGEX = re.compile(r"std::bad_alloc|\bMemoryError\b")
+
+
+class ProblemTarget(NamedTuple):
+    r"""A problem code file found in a generated project."""
+    name: str  # name of the problem folder, e.g. "A_two_sum"
+    lang: str  # "cpp" or "python"
+    source_path: str
+    binary_path: Optional[str]  # path to the compiled executable, ``None`` for interpreted languages
+
+
+class Verdict(NamedTuple):
+    r"""Result of a single example, as printed by the generated testing code."""
+    label: str
+    verdict: str  # "OK", "WRONG", or "TLE"
+    time_us: Optional[int]  # running time of the solution in microseconds, if reported
+    slow: bool  # whether the running time exceeded the per-example time budget
+    peak_bytes: Optional[int] = None  # peak heap usage of the solution in bytes, if memory was measured
+    allocs: Optional[int] = None  # number of heap allocations made by the solution, if memory was measured
+    input_bytes: Optional[int] = None  # heap usage of the input arguments in bytes, if memory was measured
+
+
+class ResourceLimits(NamedTuple):
+    r"""Limits on the resources used by a test program, enforced with ``setrlimit``. Fields that are ``None`` are not
+    limited. The memory limit applies to the address space of the program, so allocations beyond the limit fail, as
+    they do on the judge.
+    """
+    cpu_time: Optional[float] = None  # CPU time in seconds
+    wall_time: Optional[float] = None  # wall time in seconds
+    memory: Optional[int] = None  # address space in bytes
+    stack: Optional[int] = None  # stack size in bytes
+
+    @property
+    def enabled(self) -> bool:
+        return any(limit is not None for limit in self)
+
+
+class ResourceUsage(NamedTuple):
+    r"""Resources used by a test program, as reported by the OS and the program itself when the program exits."""
+    cpu_time: float  # user and system CPU time in seconds
+    wall_time: float  # in seconds
+    # Peak resident set size of the program in bytes, as reported by the generated testing code at exit. ``None`` if it
+    # was not reported, e.g. because the program crashed or the platform is not Linux. It is not taken from `wait4`,
+    # since Linux carries the peak over across `exec`, which would make it at least the size of the process that started
+    # the program.
+    max_rss: Optional[int]
+
+
+class RunResult(NamedTuple):
+    r"""Results of compiling and running a single problem."""
+    target: ProblemTarget
+    compiled: bool
+    compile_time: float  # in seconds
+    run_time: float  # in seconds
+    return_code: Optional[int]  # ``None`` if the problem was not run
+    verdicts: List[Verdict]
+    output: str  # combined compiler or program output
+    usage: Optional[ResourceUsage] = None  # ``None`` if the problem was not run under resource limits
+    limits: Optional[ResourceLimits] = None
+
+    @property
+    def passed(self) -> bool:
+        return (self.compiled and self.return_code == 0 and len(self.verdicts) > 0 and
+                all(v.verdict == "OK" for v in self.verdicts))
+
+    @property
+    def limit_verdict(self) -> Optional[str]:
+        r"""``"TLE"``, ``"MLE"``, or ``"RE"`` if the problem was run under resource limits and failed. See
+        :func:`classify_limits`.
+        """
+        if not self.compiled or self.usage is None or self.limits is None:
+            return None
+        return classify_limits(self.return_code, self.output, self.usage, self.limits)
+
+
+def _find_source(directory: str, name: str) -> Optional[Tuple[str, str]]:
+    for ext, lang in LANGUAGE_EXTENSIONS.items():
+        path = os.path.join(directory, name + ext)
+        if os.path.isfile(path):
+            return path, lang
+    return None
+
+
+def find_problems(project_path: str) -> List[ProblemTarget]:
+    r"""Find problems in a generated project. Problems in contest projects are stored in folders named with an
+    uppercase letter and the problem name (e.g. ``A_two_sum/two_sum.cc``), while single-problem projects store the code
+    file directly under the project folder.
+
+    :param project_path: Path to the project folder.
+    :return: A list of problems, sorted by name.
+    """
+    if not os.path.isdir(project_path):
+        raise ValueError(f"Project folder '{project_path}' does not exist")
+    targets = []
+    for entry in sorted(os.listdir(project_path)):
+        directory = os.path.join(project_path, entry)
+        match = _PROBLEM_DIR_REGEX.match(entry)
+        if match is None or not os.path.isdir(directory):
+            continue
+        found = _find_source(directory, match.group(1))
+        if found is not None:
+            source_path, lang = found
+            targets.append(_make_target(entry, lang, source_path))
+    if len(targets) == 0:
+        # Single-problem project: the folder is named "<problem>_<lang>" and contains "<problem>.<ext>".
+        name = os.path.basename(os.path.normpath(project_path)).rsplit("_", 1)[0].replace("-", "_")
+        found = _find_source(project_path, name)
+        if found is not None:
+            source_path, lang = found
+            targets.append(_make_target(name, lang, source_path))
+    return targets
+
+
+def _make_target(name: str, lang: str, source_path: str) -> ProblemTarget:
+    binary_path = os.path.splitext(source_path)[0] if lang == "cpp" else None
+    return ProblemTarget(name, lang, source_path, binary_path)
+
+
+def _pch_path(target: ProblemTarget) -> str:
+    return os.path.join(os.path.dirname(target.source_path), SUPPORT_HEADERS[0] + ".gch")
+
+
+def _pch_is_stale(target: ProblemTarget) -> bool:
+    # GCC uses a precompiled header whenever it is found next to the header, without checking whether it is up-to-date.
+    pch_mtime = os.path.getmtime(_pch_path(target))
+    directory = os.path.dirname(target.source_path)
+    return any(os.path.getmtime(os.path.join(directory, header)) > pch_mtime
+               for header in SUPPORT_HEADERS if os.path.exists(os.path.join(directory, header)))
+
+
+def precompile_header(target: ProblemTarget, cxx: str = "g++", cxx_flags: Sequence[str] = ()) -> Tuple[bool, str]:
+    r"""Precompile the support headers of a C++ problem, which make up most of its compile time. The precompiled header
+    is stored next to ``_testing.h`` and is used automatically by later compilations with the same flags. Nothing is
+    done if an up-to-date precompiled header exists.
+
+    :param target: The problem whose headers to precompile.
+    :param cxx: The C++ compiler to use.
+    :param cxx_flags: Extra flags passed to the C++ compiler, which must match those used for compiling the problem.
+    :return: A tuple of (whether precompilation succeeded, compiler output).
+    """
+    header_path = os.path.join(os.path.dirname(target.source_path), SUPPORT_HEADERS[0])
+    if target.lang != "cpp" or not os.path.exists(header_path):
+        return False, ""
+    if os.path.exists(_pch_path(target)) and not _pch_is_stale(target):
+        return True, ""
+    command = [cxx, *CXX_FLAGS, *cxx_flags, "-x", "c++-header", "-o", _pch_path(target), header_path]
+    proc = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)
+    return proc.returncode == 0, proc.stdout
+
+
+def compile_problem(target: ProblemTarget, cxx: str = "g++", cxx_flags: Sequence[str] = ()) -> Tuple[bool, str]:
+    r"""Compile the code for a problem. Python code is only checked for syntax errors. C++ compilation reuses the
+    precompiled support header created by :func:`precompile_header`, if it exists and is up-to-date.
+
+    :param target: The problem to compile.
+    :param cxx: The C++ compiler to use.
+    :param cxx_flags: Extra flags passed to the C++ compiler.
+    :return: A tuple of (whether compilation succeeded, compiler output).
+    """
+    if target.lang == "cpp" and os.path.exists(_pch_path(target)) and _pch_is_stale(target):
+        os.remove(_pch_path(target))
+    if target.lang == "python":
+        command = [sys.executable, "-m", "py_compile", target.source_path]
+    else:
+        command = [cxx, *CXX_FLAGS, *cxx_flags, "-o", target.binary_path, target.source_path]
+    proc = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)
+    return proc.returncode == 0, proc.stdout
+
+
+def _run_command(target: ProblemTarget, args: Sequence[str],
+                 env: Optional[Dict[str, str]]) -> Tuple[List[str], Dict[str, str]]:
+    if target.lang == "python":
+        command = [sys.executable, os.path.basename(target.source_path), *args]
+    else:
+        command = [os.path.abspath(target.binary_path), *args]
+    proc_env = os.environ.copy()
+    proc_env.update(env or {})
+    return command, proc_env
+
+
+def run_problem(target: ProblemTarget, args: Sequence[str] = (), env: Optional[Dict[str, str]] = None,
+                timeout: Optional[float] = None) -> Tuple[Optional[int], str]:
+    r"""Run the tests for a compiled problem.
+
+    :param target: The problem to run.
+    :param args: Extra command line arguments for the test program.
+    :param env: Extra environment variables for the test program.
+    :param timeout: Wall-time limit in seconds. The program is killed if it does not finish in time.
+    :return: A tuple of (return code, program output). Return code is ``None`` if the program timed out.
+    """
+    command, proc_env = _run_command(target, args, env)
+    try:
+        proc = subprocess.run(command, cwd=os.path.dirname(target.source_path) or None, env=proc_env,
+                              stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True,
+                              timeout=timeout)
+    except subprocess.TimeoutExpired as e:
+        output = e.stdout or ""
+        if isinstance(output, bytes):
+            output = output.decode(errors="replace")
+        return None, output
+    return proc.returncode, proc.stdout
+
+
+def _limit_command(command: List[str], limits: ResourceLimits) -> List[str]:
+    # Limits are set by a shell that then executes the program, instead of in a `preexec_fn`, which is not safe to use
+    # while other threads are running.
+    settings = []
+    if limits.cpu_time is not None:
+        # The program receives SIGXCPU at the soft limit, and is killed at the hard limit if it ignores the signal.
+        seconds = max(1, math.ceil(limits.cpu_time))
+        settings += [f"ulimit -S -t {seconds}", f"ulimit -H -t {seconds + 1}"]
+    if limits.memory is not None:
+        settings.append(f"ulimit -v {max(1, limits.memory // 1024)}")
+    if limits.stack is not None:
+        settings.append(f"ulimit -s {max(1, limits.stack // 1024)}")
+    script = " && ".join(settings + ['exec "$@"'])
+    return ["/bin/sh", "-c", script, "sh", *command]
+
+
+def run_problem_limited(target: ProblemTarget, limits: ResourceLimits, args: Sequence[str] = (),
+                        env: Optional[Dict[str, str]] = None) -> Tuple[Optional[int], str, ResourceUsage]:
+    r"""Run the tests for a compiled problem under resource limits, and measure the resources it used. CPU time,
+    address space, and stack size are limited with ``ulimit`` (i.e., ``setrlimit``) before executing the program, and
+    usage is collected with ``wait4``, so problems can be run concurrently from multiple threads. The peak resident set
+    size is written by the generated testing code to the file named by the ``LCHELPER_RSS_FILE`` environment variable.
+    Only supported on POSIX systems.
+
+    :param target: The problem to run.
+    :param limits: The resource limits. The program is killed if it exceeds the wall-time limit.
+    :param args: Extra command line arguments for the test program.
+    :param env: Extra environment variables for the test program.
+    :return: A tuple of (return code, program output, resource usage). Return code is ``None`` if the program was
+        killed for exceeding the wall-time limit, and the negated signal number if it was killed by a signal.
+    """
+    if os.name != "posix":
+        raise ValueError("Resource limits are only supported on POSIX systems")
+    command, proc_env = _run_command(target, args, env)
+    fd, rss_path = tempfile.mkstemp(prefix="lchelper-rss-")
+    os.close(fd)
+    proc_env["LCHELPER_RSS_FILE"] = rss_path
+    try:
+        start_time = time.perf_counter()
+        proc = subprocess.Popen(_limit_command(command, limits), cwd=os.path.dirname(target.source_path) or None,
+                                env=proc_env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        chunks: List[bytes] = []
+        reader = threading.Thread(target=lambda: chunks.append(proc.stdout.read()), daemon=True)
+        reader.start()
+        lock = threading.Lock()
+        timed_out = False
+
+        def _kill() -> None:
+            nonlocal timed_out
+            with lock:
+                if proc.returncode is None:  # the process has not been reaped, so its pid is not reused
+                    timed_out = True
+                    proc.kill()
+
+        timer = None
+        if limits.wall_time is not None:
+            timer = threading.Timer(limits.wall_time, _kill)
+            timer.start()
+        _, status, rusage = os.wait4(proc.pid, 0)
+        with lock:
+            proc.returncode = -os.WTERMSIG(status) if os.WIFSIGNALED(status) else os.WEXITSTATUS(status)
+        wall_time = time.perf_counter() - start_time
+        if timer is not None:
+            timer.cancel()
+        reader.join()
+        proc.stdout.close()
+        output = b"".join(chunks).decode(errors="replace")
+        with open(rss_path) as f:
+            max_rss = f.read().strip()
+    finally:
+        os.remove(rss_path)
+    usage = ResourceUsage(rusage.ru_utime + rusage.ru_stime, wall_time, int(max_rss) if max_rss else None)
+    return (None if timed_out else proc.returncode), output, usage
+
+
+def classify_limits(return_code: Optional[int], output: str, usage: ResourceUsage,
+                    limits: ResourceLimits) -> Optional[str]:
+    r"""Classify the outcome of a program run under resource limits, the way the judge would.
+
+    - ``"TLE"`` if the program exceeded the wall-time limit, or was stopped for exceeding the CPU-time limit.
+    - ``"MLE"`` if a memory limit was set, and the program failed to allocate memory (``std::bad_alloc`` in C++,
+      ``MemoryError`` in Python).
+    - ``"RE"`` for other non-zero exits, including crashes due to stack overflow.
+
+    :param return_code: Return code of the program, as returned by :func:`run_problem_limited`.
+    :param output: Output of the program.
+    :param usage: Resources used by the program.
+    :param limits: The resource limits the program was run under.
+    :return: The classification, or ``None`` if the program exited normally.
+    """
+    if return_code is None:
+        return "TLE"
+    if limits.cpu_time is not None and (usage.cpu_time >= limits.cpu_time or return_code == -signal.SIGXCPU or
+                                        (return_code == -signal.SIGKILL and usage.cpu_time >= limits.cpu_time * 0.9)):
+        return "TLE"
+    if return_code == 0:
+        return None
+    if limits.memory is not None and _OUT_OF_MEMORY_REGEX.search(output) is not None:
+        return "MLE"
+    return "RE"
+
+
+def process_problem(target: ProblemTarget, cxx: str = "g++", cxx_flags: Sequence[str] = (), args: Sequence[str] = (),
+                    env: Optional[Dict[str, str]] = None, timeout: Optional[float] = None,
+                    compile_slots: Optional[threading.Semaphore] = None,
+                    limits: Optional[ResourceLimits] = None) -> RunResult:
+    r"""Compile and run a single problem.
+
+    :param target: The problem to process.
+    :param cxx: The C++ compiler to use.
+    :param cxx_flags: Extra flags passed to the C++ compiler.
+    :param args: Extra command line arguments for the test program.
+    :param env: Extra environment variables for the test program.
+    :param timeout: Wall-time limit in seconds for the test program.
+    :param compile_slots: If specified, a slot is held from the semaphore while compiling.
+    :param limits: If specified, the test program is run under these resource limits with
+        :func:`run_problem_limited`. ``timeout`` is used if no wall-time limit is set.
+    :return: The result of the problem.
+    """
+    with compile_slots or contextlib.nullcontext():
+        start_time = time.perf_counter()
+        compiled, compile_output = compile_problem(target, cxx, cxx_flags)
+        compile_time = time.perf_counter() - start_time
+    if not compiled:
+        return RunResult(target, False, compile_time, 0.0, None, [], compile_output)
+    if limits is not None and limits.enabled:
+        if limits.wall_time is None:
+            limits = limits._replace(wall_time=timeout)
+        return_code, output, usage = run_problem_limited(target, limits, args, env)
+        return RunResult(target, True, compile_time, usage.wall_time, return_code, parse_verdicts(output), output,
+                         usage, limits)
+    start_time = time.perf_counter()
+    return_code, output = run_problem(target, args, env, timeout)
+    run_time = time.perf_counter() - start_time
+    return RunResult(target, True, compile_time, run_time, return_code, parse_verdicts(output), output)
+
+
+def parse_verdicts(output: str) -> List[Verdict]:
+    r"""Collect the ``[OK]``, ``[WRONG]``, and ``[TLE]`` results printed by the generated ``test()`` or ``evaluate()``
+    functions, along with the running time and whether the example exceeded the time budget.
+    """
+    def _int(value: Optional[str]) -> Optional[int]:
+        return int(value) if value is not None else None
+
+    verdicts = []
+    for line in _ANSI_ESCAPE_REGEX.sub("", output).split("\n"):
+        match = _VERDICT_REGEX.match(line)
+        if match is not None:
+            verdicts.append(Verdict(match.group("label"), match.group("verdict"), _int(match.group("time")),
+                                    match.group("slow") is not None, _int(match.group("peak")),
+                                    _int(match.group("allocs")), _int(match.group("input"))))
+    return verdicts
+
+
+def is_memory_heavy(verdict: Verdict, ratio: float = DEFAULT_MEMORY_RATIO) -> bool:
+    r"""Check whether the peak heap usage of an example grows out of proportion to the size of its input, i.e., whether
+    it exceeds ``ratio`` times the heap usage of the input arguments plus a fixed slack.
+
+    :param verdict: The example result, as returned by :func:`parse_verdicts`.
+    :param ratio: Maximum allowed ratio between peak heap usage and input size.
+    :return: Whether the example is flagged. Examples without memory measurements are never flagged.
+    """
+    if verdict.peak_bytes is None or verdict.input_bytes is None:
+        return False
+    return verdict.peak_bytes > ratio * verdict.input_bytes + MEMORY_SLACK_BYTES
+
+
+def run_project(project_path: str, jobs: Optional[int] = None, cxx: str = "g++", cxx_flags: Sequence[str] = (),
+                args: Sequence[str] = (), env: Optional[Dict[str, str]] = None,
+                timeout: Optional[float] = None, limits: Optional[ResourceLimits] = None) -> List[RunResult]:
+    r"""Compile and run all problems in a generated project.
+
+    Compilation is limited to ``jobs`` concurrent compiler processes, similar to the jobserver in ``make -j``. Each
+    problem is run as soon as it finishes compiling, so test programs run concurrently with each other and with the
+    remaining compilations.
+
+    :param project_path: Path to the project folder.
+    :param jobs: Maximum number of concurrent compiler processes. Defaults to the number of CPUs.
+    :param cxx: The C++ compiler to use.
+    :param cxx_flags: Extra flags passed to the C++ compiler.
+    :param args: Extra command line arguments for the test programs.
+    :param env: Extra environment variables for the test programs.
+    :param timeout: Wall-time limit in seconds for each test program.
+    :param limits: If specified, each test program is run under these resource limits. See :func:`process_problem`.
+    :return: A list of results, one for each problem, in the same order as :func:`find_problems`.
+    """
+    targets = find_problems(project_path)
+    compile_slots = threading.BoundedSemaphore(jobs or os.cpu_count() or 1)
+
+    def _process(target: ProblemTarget) -> RunResult:
+        return process_problem(target, cxx, cxx_flags, args, env, timeout, compile_slots, limits)
+
+    if len(targets) == 0:
+        return []
+    with ThreadPoolExecutor(max_workers=len(targets)) as executor:
+        return list(executor.map(_process, targets))
+
+
+def _status(result: RunResult) -> str:
+    if not result.compiled:
+        return "COMPILE ERROR"
+    limit_verdict = result.limit_verdict
+    if limit_verdict == "TLE":
+        return "TIME LIMIT EXCEEDED"
+    if limit_verdict == "MLE":
+        return "MEMORY LIMIT EXCEEDED"
+    if result.return_code is None:
+        return "TIMEOUT"
+    if result.return_code != 0:
+        return f"RUNTIME ERROR ({result.return_code})"
+    if len(result.verdicts) == 0:
+        return "NO TESTS"
+    return "PASSED" if result.passed else "FAILED"
+
+
+def _usage_columns(result: RunResult) -> Tuple[str, str]:
+    if result.usage is None:
+        return "-", "-"
+    limits = result.limits or ResourceLimits()
+    cpu = f"{result.usage.cpu_time:.2f}s"
+    if limits.cpu_time is not None:
+        cpu += f"/{limits.cpu_time:g}s"
+    rss = f"{result.usage.max_rss / 2 ** 20:.1f}MB" if result.usage.max_rss is not None else "-"
+    if limits.memory is not None:
+        rss += f"/{limits.memory / 2 ** 20:g}MB"
+    return cpu, rss
+
+
+def format_summary(results: List[RunResult], memory_ratio: float = DEFAULT_MEMORY_RATIO) -> List[str]:
+    r"""Format the results as a table, one row per problem.
+
+    :param results: Results returned by :func:`run_project`.
+    :param memory_ratio: Ratio between peak heap usage and input size above which examples are counted in the ``MEM``
+        column. See :func:`is_memory_heavy`.
+    :return: Lines of the table. If problems were run under resource limits, the ``CPU`` and ``RSS`` columns show their
+        CPU time and peak resident set size, along with the limits.
+    """
+    limited = any(result.usage is not None for result in results)
+    header = ("Problem", "Lang", "Compile", "Run", "OK", "WRONG", "TLE", "SLOW", "MEM", "Max Time", "Max Mem",
+              *(("CPU", "RSS") if limited else ()), "Status")
+    rows = [header]
+    for result in results:
+        num_ok = sum(v.verdict == "OK" for v in result.verdicts)
+        times = [v.time_us for v in result.verdicts if v.time_us is not None]
+        peaks = [v.peak_bytes for v in result.verdicts if v.peak_bytes is not None]
+        rows.append((
+            result.target.name, result.target.lang,
+            f"{result.compile_time:.2f}s", f"{result.run_time:.2f}s" if result.compiled else "-",
+            str(num_ok), str(sum(v.verdict == "WRONG" for v in result.verdicts)),
+            str(sum(v.verdict == "TLE" for v in result.verdicts)), str(sum(v.slow for v in result.verdicts)),
+            str(sum(is_memory_heavy(v, memory_ratio) for v in result.verdicts)) if len(peaks) > 0 else "-",
+            f"{max(times)}us" if len(times) > 0 else "-", f"{max(peaks)}B" if len(peaks) > 0 else "-",
+            *(_usage_columns(result) if limited else ()),
+            _status(result)))
+    widths = [max(len(row[col]) for row in rows) for col in range(len(header))]
+    lines = ["  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip() for row in rows]
+    lines.insert(1, "  ".join("-" * width for width in widths))
+    return lines
@@ -0,0 +1,134 @@
+import contextlib
+import json
+import os
+import threading
+import time
+from typing import Any, ContextManager, Dict, Iterator, List, NamedTuple
+
+__all__ = [
+    "Span",
+    "enable_tracing",
+    "disable_tracing",
+    "tracing_enabled",
+    "trace_span",
+    "get_spans",
+    "write_trace",
+    "TRACE_FORMATS",
+]
+
+TRACE_FORMATS = ["json", "chrome"]
+
+
+class Span(NamedTuple):
+    r"""A timed phase of the program."""
+    name: str  # name of the phase, e.g. "browser.get"
+    category: str  # the module that recorded the span, e.g. "crawler"
+    start: float  # in seconds, relative to when tracing was enabled
+    duration: float  # in seconds
+    thread_id: int
+    args: Dict[str, Any]  # details about the span, e.g. the problem name
+
+
+_enabled = False
+_origin = 0.0
+_spans: List[Span] = []
+_lock = threading.Lock()
+
+
+def enable_tracing() -> None:
+    r"""Start recording spans. Spans are not recorded by default, in which case :func:`trace_span` only costs a function
+    call and a flag check.
+    """
+    global _enabled, _origin
+    with _lock:
+        if not _enabled:
+            _enabled = True
+            _origin = time.perf_counter()
+
+
+def disable_tracing() -> None:
+    r"""Stop recording spans, and discard the recorded spans."""
+    global _enabled
+    with _lock:
+        _enabled = False
+        _spans.clear()
+
+
+def tracing_enabled() -> bool:
+    return _enabled
+
+
+@contextlib.contextmanager
+def _record(name: str, category: str, args: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    start_time = time.perf_counter()
+    try:
+        yield args
+    finally:
+        end_time = time.perf_counter()
+        span = Span(name, category, start_time - _origin, end_time - start_time, threading.get_ident(), args)
+        with _lock:
+            _spans.append(span)
+
+
+class _DisabledSpan:
+    def __enter__(self) -> Dict[str, Any]:
+        return {}
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        pass
+
+
+_DISABLED_SPAN = _DisabledSpan()
+
+
+def trace_span(name: str, category: str = "", **args: Any) -> ContextManager[Dict[str, Any]]:
+    r"""Time a phase of the program, if tracing is enabled. Use as a context manager::
+
+        with trace_span("parse_problem", "parser", problem=problem.name) as span_args:
+            ...
+            span_args["interactive"] = True  # details can be added while the span is running
+
+    :param name: Name of the phase.
+    :param category: The module or component the phase belongs to.
+    :param args: Details about the span, which must be JSON-serializable.
+    :return: A context manager that yields the (mutable) dictionary of details.
+    """
+    if not _enabled:
+        return _DISABLED_SPAN
+    return _record(name, category, args)
+
+
+def get_spans() -> List[Span]:
+    r"""Return the recorded spans, sorted by start time."""
+    with _lock:
+        return sorted(_spans, key=lambda span: span.start)
+
+
+def write_trace(path: str, trace_format: str = "json") -> None:
+    r"""Write the recorded spans to a file.
+
+    :param path: Path to the output file.
+    :param trace_format: Format of the output file. Supported formats are:
+
+        - ``"json"``: A list of spans, each an object with the same fields as :class:`Span`. Times are in seconds.
+        - ``"chrome"``: The Chrome trace event format, which can be loaded in ``chrome://tracing`` or Perfetto. Each
+          thread is shown as a separate track.
+    """
+    spans = get_spans()
+    if trace_format == "json":
+        data: Any = [span._asdict() for span in spans]
+    elif trace_format == "chrome":
+        data = {"traceEvents": [{
+            "name": span.name,
+            "cat": span.category,
+            "ph": "X",  # complete event, with a start time and duration
+            "ts": span.start * 1e6,
+            "dur": span.duration * 1e6,
+            "pid": os.getpid(),
+            "tid": span.thread_id,
+            "args": span.args,
+        } for span in spans], "displayTimeUnit": "ms"}
+    else:
+        raise ValueError(f"Unsupported trace format '{trace_format}'. Supported formats are: {TRACE_FORMATS}")
+    with open(path, "w") as f:
+        json.dump(data, f, indent=1, default=str)
@@ -1,10 +1,14 @@
+import os
+import re
 import sys
-from typing import Any, Dict, NamedTuple, Optional, Type, TypeVar
+from typing import Any, Dict, List, NamedTuple, Optional, Type, TypeVar
 
 __all__ = [
     "to_dict",
     "from_dict",
     "remove_affix",
+    "expand_range",
+    "site_url",
     "register_excepthook",
 ]
 
@@ -29,6 +33,29 @@ def remove_affix(s: str, prefix: Optional[str] = None, suffix: Optional[str] = N
     return s
 
 
+_RANGE_REGEX = re.compile(r"^(?P<prefix>.*?)(?P<start>\d+)\.\.(?P<end>\d+)(?P<suffix>/?)$")
+
+
+def expand_range(s: str) -> List[str]:
+    r"""Expand a numbered range, e.g. ``"weekly-contest-150..152"`` expands to ``["weekly-contest-150",
+    "weekly-contest-151", "weekly-contest-152"]``. Strings without a range are returned as-is.
+    """
+    match = _RANGE_REGEX.match(s)
+    if match is None:
+        return [s]
+    start, end = int(match.group("start")), int(match.group("end"))
+    if start > end:
+        raise ValueError(f"Invalid range '{s}': {start} is greater than {end}")
+    return [f"{match.group('prefix')}{idx}{match.group('suffix')}" for idx in range(start, end + 1)]
+
+
+def site_url(site: str) -> str:
+    r"""Return the base URL of a LeetCode site, e.g. ``"https://leetcode.com"``. The URL can be overridden with the
+    ``LCHELPER_SITE_URL`` environment variable, for instance to crawl a local mock site.
+    """
+    return os.environ.get("LCHELPER_SITE_URL") or f"https://{site}.com"
+
+
 def register_excepthook():
     def excepthook(type, value, traceback):
         if type is KeyboardInterrupt:
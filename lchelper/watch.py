@@ -0,0 +1,95 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+from lchelper.logging import log
+from lchelper.runner import ProblemTarget, RunResult, SUPPORT_HEADERS, find_problems, precompile_header, process_problem
+
+__all__ = [
+    "watched_files",
+    "watch_project",
+]
+
+_Stamp = Tuple[Tuple[str, int], ...]  # modification times of watched files
+
+
+def watched_files(target: ProblemTarget) -> Sequence[str]:
+    r"""Return the files whose changes trigger a rebuild of the problem: the code file, custom test cases in ``in.txt``,
+    and the support files generated alongside the code.
+
+    :param target: The problem to watch.
+    :return: A list of paths. Paths may not exist.
+    """
+    directory = os.path.dirname(target.source_path)
+    files = [target.source_path, os.path.join(directory, "in.txt")]
+    if target.lang == "cpp":
+        files.extend(os.path.join(directory, header) for header in SUPPORT_HEADERS)
+    else:
+        files.append(os.path.join(os.path.dirname(os.path.abspath(directory)), "_runtime.py"))
+    return files
+
+
+def _stamp(target: ProblemTarget) -> _Stamp:
+    stamp = []
+    for path in watched_files(target):
+        try:
+            stamp.append((path, os.stat(path).st_mtime_ns))
+        except OSError:
+            pass
+    return tuple(stamp)
+
+
+def _scan(project_path: str) -> Dict[str, Tuple[ProblemTarget, _Stamp]]:
+    return {target.name: (target, _stamp(target)) for target in find_problems(project_path)}
+
+
+def watch_project(project_path: str, on_result: Callable[[RunResult], None], cxx: str = "g++",
+                  cxx_flags: Sequence[str] = (), args: Sequence[str] = (), env: Optional[Dict[str, str]] = None,
+                  timeout: Optional[float] = None, interval: float = 0.1,
+                  should_stop: Callable[[], bool] = lambda: False) -> None:
+    r"""Watch a generated project, and recompile and rerun a problem whenever one of its files is saved.
+
+    Files are polled by comparing modification times, which only takes a few ``stat`` calls per problem. A change is
+    processed once the files stay unchanged for one polling interval, so that partially written files are not
+    compiled. Support headers of C++ problems are precompiled before watching starts, which makes up most of the time
+    saved on each rebuild.
+
+    :param project_path: Path to the project folder.
+    :param on_result: Function called with the result of each rebuild.
+    :param cxx: The C++ compiler to use.
+    :param cxx_flags: Extra flags passed to the C++ compiler.
+    :param args: Extra command line arguments for the test programs.
+    :param env: Extra environment variables for the test programs.
+    :param timeout: Wall-time limit in seconds for each test program.
+    :param interval: Polling interval in seconds.
+    :param should_stop: Function called after each polling interval. Watching stops when it returns ``True``.
+    """
+    known = _scan(project_path)
+    cpp_targets = [target for target, _ in known.values() if target.lang == "cpp"]
+    if len(cpp_targets) > 0:
+        start_time = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=len(cpp_targets)) as executor:
+            results = list(executor.map(lambda target: precompile_header(target, cxx, cxx_flags), cpp_targets))
+        for target, (success, output) in zip(cpp_targets, results):
+            if not success:
+                log(f"Failed to precompile headers for problem '{target.name}':\n{output}", "warning")
+        log(f"Precompiled headers in {time.perf_counter() - start_time:.2f}s")
+
+    pending: Dict[str, _Stamp] = {}  # changed problems, waiting for their files to settle
+    while not should_stop():
+        time.sleep(interval)
+        current = _scan(project_path)
+        for name, (target, stamp) in current.items():
+            if name in known and known[name][1] == stamp and name not in pending:
+                continue
+            if pending.get(name) != stamp:
+                pending[name] = stamp
+                continue
+            # The files did not change during the last interval.
+            del pending[name]
+            if target.lang == "cpp":
+                precompile_header(target, cxx, cxx_flags)  # only rebuilds if the support headers changed
+            on_result(process_problem(target, cxx, cxx_flags, args, env, timeout))
+            current[name] = (target, _stamp(target))
+        known = current
@@ -1,8 +1,12 @@
 import argparse
+import contextlib
+import io
 import os
 import pickle
 import sys
-from typing import Any, Dict, List, Optional, NoReturn
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterator, List, Optional, NoReturn, Tuple
 from urllib.parse import urlparse
 
 import lchelper
@@ -10,9 +14,11 @@ import lchelper.utils
 
 PROGRAM = "python main.py"
 CACHE_FILE = "contest_problems.pkl"
+# Commands that can be forwarded to the daemon, if the client opts in with `--daemon` or `LCHELPER_USE_DAEMON=1`.
+DAEMON_COMMANDS = ["get", "getp", "run"]
 
 
-def parse_args():
+def parse_args(argv: Optional[List[str]] = None):
     class CustomParser(argparse.ArgumentParser):
         def error(self, message: str) -> NoReturn:
             self.print_help(sys.stderr)
@@ -21,6 +27,24 @@ def parse_args():
 
     parser = CustomParser()
     parser.add_argument("--debug", action="store_true", default=False)
+    parser.add_argument("--daemon", dest="use_daemon", action="store_true",
+                        help=f"Forward the {', '.join(DAEMON_COMMANDS)} commands to the running daemon (see the "
+                             f"`daemon` command), if any. Also enabled by the LCHELPER_USE_DAEMON=1 environment "
+                             f"variable")
+    parser.add_argument("--no-daemon", dest="use_daemon", action="store_false",
+                        help="Run the command in this process, even if LCHELPER_USE_DAEMON=1 is set")
+    parser.set_defaults(use_daemon=os.environ.get("LCHELPER_USE_DAEMON") == "1")
+    parser.add_argument("--log-level", dest="log_level", choices=["debug", "info", "warning", "error"], default=None,
+                        help="Minimum level of log messages to print (default: info, or the LCHELPER_LOG_LEVEL "
+                             "environment variable)")
+    parser.add_argument("--log-json", dest="log_json", metavar="PATH", default=None,
+                        help="Also write log messages of all levels to the specified file, one JSON object per line")
+    parser.add_argument("--trace", dest="trace_path", metavar="PATH", default=None,
+                        help="Record the time spent in each phase (e.g. starting the browser, loading pages, parsing "
+                             "and generating code for each problem), and write the spans to the specified file")
+    parser.add_argument("--trace-format", dest="trace_format", choices=lchelper.TRACE_FORMATS, default="json",
+                        help="Format of the trace: a JSON list of spans, or the Chrome trace event format that can "
+                             "be loaded in chrome://tracing or Perfetto (default: %(default)s)")
     subparsers = parser.add_subparsers(dest="command")
 
     parser_login = subparsers.add_parser("login", help="Log in using your LeetCode account")
@@ -41,7 +65,13 @@ def parse_args():
     parser_get.add_argument("-p", "--prefix", dest="prefix", default=None,
                             help="Prefix for project folders, if not specified, the contest name (e.g. "
                                  "\"weekly-contest-162\") if used")
-    parser_get.add_argument("url", help="URL to the contest page, or the contest name (e.g. \"weekly-contest-162\")")
+    parser_get.add_argument("-j", "--jobs", dest="jobs", type=int, default=2,
+                            help="Maximum number of contests to download concurrently (default: %(default)s)")
+    parser_get.add_argument("--list", dest="list_file", default=None,
+                            help="Path to a file listing contest URLs or names to download, one per line")
+    parser_get.add_argument("urls", nargs="*", metavar="url",
+                            help="URL to the contest page, or the contest name (e.g. \"weekly-contest-162\"). Use a "
+                                 "range (e.g. \"weekly-contest-150..200\") to download multiple contests")
 
     parser_getp = subparsers.add_parser("getp", help="Download LeetCode problem and generate testing code")
     parser_getp.add_argument("-u", "--username", dest="username", default=None,
@@ -55,125 +85,342 @@ def parse_args():
                             help="The path to store generated projects")
     parser_getp.add_argument("url", help="URL to the contest page")
 
-    args = parser.parse_args()
+    parser_run = subparsers.add_parser("run", help="Compile and run tests for all problems in generated projects")
+    parser_run.add_argument("-j", "--jobs", dest="jobs", type=int, default=None,
+                            help="Maximum number of concurrent compiler processes, defaults to the number of CPUs")
+    parser_run.add_argument("--cxx", dest="cxx", default=os.environ.get("CXX", "g++"),
+                            help="The C++ compiler to use")
+    parser_run.add_argument("--cxxflags", dest="cxx_flags", default="",
+                            help="Extra flags passed to the C++ compiler")
+    parser_run.add_argument("--timeout", dest="timeout", type=float, default=None,
+                            help="Wall-time limit in seconds for running the tests of each problem")
+    parser_run.add_argument("--cpu-limit", dest="cpu_limit", type=float, default=None,
+                            help="CPU-time limit in seconds for the tests of each problem, problems exceeding it are "
+                                 "reported as TLE")
+    parser_run.add_argument("--memory-limit", dest="memory_limit", type=int, default=None,
+                            help="Address-space limit in MB for the tests of each problem, problems failing to "
+                                 "allocate memory are reported as MLE")
+    parser_run.add_argument("--stack-limit", dest="stack_limit", type=int, default=None,
+                            help="Stack size limit in MB for the tests of each problem, stack overflows are reported "
+                                 "as RE")
+    parser_run.add_argument("--budget", dest="budget", type=int, default=None,
+                            help="Per-example time budget in microseconds, examples running longer are flagged as "
+                                 "[SLOW]")
+    parser_run.add_argument("--time-limit", dest="time_limit", type=float, default=None,
+                            help="Per-example time limit in seconds for Python solutions, examples running longer are "
+                                 "aborted and reported as [TLE]")
+    parser_run.add_argument("--profile", dest="profile", choices=["cprofile", "tracemalloc"], default=None,
+                            help="Profile each example of Python solutions and print a hotspot summary")
+    parser_run.add_argument("--full-output", dest="full_output", action="store_true", default=False,
+                            help="Print the full expected and received values of every example, instead of only the "
+                                 "first mismatch")
+    parser_run.add_argument("--memory", dest="memory", action="store_true", default=False,
+                            help="Measure peak heap usage and allocation count of each example, and flag examples "
+                                 "whose memory grows out of proportion to the input size")
+    parser_run.add_argument("--memory-ratio", dest="memory_ratio", type=float, default=lchelper.DEFAULT_MEMORY_RATIO,
+                            help="Flag examples whose peak heap usage exceeds this many times the heap usage of the "
+                                 "input arguments (default: %(default)s)")
+    parser_run.add_argument("--stress", dest="stress", metavar="ITERATIONS", type=int, default=None,
+                            help="Instead of running examples, compare solutions against the brute-force versions on "
+                                 "the specified number of random inputs")
+    parser_run.add_argument("--bench", dest="bench", metavar=("MIN_N", "MAX_N"), type=int, nargs=2, default=None,
+                            help="Instead of running examples, time the solutions on random inputs with sizes growing "
+                                 "from MIN_N to MAX_N, and estimate their time complexity")
+    parser_run.add_argument("--cases", dest="cases", metavar="PATH", default=None,
+                            help="Instead of running examples, run the custom test cases in the specified file or "
+                                 "directory, resolved relative to each problem folder")
+    parser_run.add_argument("--max-n", dest="max_n", type=int, default=100000,
+                            help="The maximum input size allowed by the problem constraints, used for projecting the "
+                                 "running time in benchmarks (default: %(default)s)")
+    parser_run.add_argument("-v", "--verbose", action="store_true", default=False,
+                            help="Print the output of problems that did not pass")
+    parser_run.add_argument("project", nargs="+", help="Paths to the generated projects")
+
+    parser_watch = subparsers.add_parser("watch", help="Recompile and rerun tests for problems in a generated project "
+                                                       "whenever their code is saved")
+    parser_watch.add_argument("--cxx", dest="cxx", default=os.environ.get("CXX", "g++"),
+                              help="The C++ compiler to use")
+    parser_watch.add_argument("--cxxflags", dest="cxx_flags", default="",
+                              help="Extra flags passed to the C++ compiler, e.g. '-O0' for faster compilation")
+    parser_watch.add_argument("--timeout", dest="timeout", type=float, default=None,
+                              help="Wall-time limit in seconds for running the tests of each problem")
+    parser_watch.add_argument("--interval", dest="interval", type=float, default=0.1,
+                              help="Interval in seconds between checks for changes (default: %(default)s)")
+    parser_watch.add_argument("project", help="Path to the generated project")
+
+    parser_serve = subparsers.add_parser("compile-server",
+                                         help="Serve compile requests for problems in generated projects, read from "
+                                              "standard input line-by-line, and report the latency of each request")
+    parser_serve.add_argument("--cxx", dest="cxx", default=os.environ.get("CXX", "g++"),
+                              help="The C++ compiler to use")
+    parser_serve.add_argument("--cxxflags", dest="cxx_flags", default="",
+                              help="Extra flags passed to the C++ compiler")
+    parser_serve.add_argument("--compare-cold", dest="compare_cold", action="store_true", default=False,
+                              help="Also report the latency of a cold compiler invocation for each request")
+    parser_serve.add_argument("projects", nargs="+", metavar="project", help="Paths to the generated projects")
+
+    parser_daemon = subparsers.add_parser(
+        "daemon", help="Start a daemon that keeps downloaded problems, code generators, and browser sessions in "
+                       f"memory, and serves the {', '.join(DAEMON_COMMANDS)} commands for clients that pass --daemon")
+    parser_daemon.add_argument("--socket", dest="socket", default=lchelper.DEFAULT_SOCKET_PATH,
+                               help="Path to the Unix domain socket to listen on (default: %(default)s)")
+    parser_daemon.add_argument("--stop", action="store_true", default=False,
+                               help="Stop the running daemon instead of starting one")
+
+    args = parser.parse_args(argv)
     if not args.command:
         parser.print_help(sys.stderr)
     return args
 
 
+def select_user(username: Optional[str], site: Optional[str]) -> lchelper.User:
+    r"""Select the logged-in user to download problems with. Exit with an error message if no user, or more than one
+    user, matches the username and site.
+    """
+    available_users = lchelper.get_users()
+    if len(available_users) == 0:
+        print(f"You're not logged in. Please run `{PROGRAM} login <username>` first.")
+        exit(1)
+
+    candidates = user_candidates = available_users
+    if username is not None:
+        candidates = user_candidates = [user for user in candidates if user.username == username]
+    if site is not None:
+        candidates = [user for user in candidates if user.site == site]
+    # If there exist multiple candidates with different usernames, raise an error to avoid ambiguity.
+    if len(set(user.username for user in candidates)) > 1:
+        print(f"You have logged in with multiple accounts: {', '.join(repr(s) for s in candidates)}.\n"
+              f"Please select the user using the `-u <username>` flag.")
+        exit(1)
+    if len(candidates) == 0:
+        if username is not None:
+            if len(user_candidates) > 0:
+                print(f"The specified user '{username}' is not from the site '{site}'.\n"
+                      f"Please log in with a user from '{site}' by running "
+                      f"`{PROGRAM} login -s {site} <username>`.")
+            else:
+                print(f"The specified user '{username}' is not logged in.\n"
+                      f"Please log in by running `{PROGRAM} login {username}` first.")
+        else:
+            print(f"There are no users from the site '{site}'.\n"
+                  f"Please log in with a user from '{site}' by running `{PROGRAM} login -s {site} <username>`.")
+        exit(1)
+
+    return candidates[0]
+
+
+class Session:
+    r"""State shared across commands. Each CLI invocation uses a fresh session, while the daemon keeps a single session
+    alive, so that downloaded problems, code generators, and signed-in browsers are reused across requests.
+    """
+
+    def __init__(self, persistent: bool = False):
+        self.persistent = persistent
+        self._caches: Dict[str, Tuple[float, Dict[Any, Any]]] = {}  # path -> (modification time, contents)
+        self._codegens: Dict[str, 'lchelper.codegen.CodeGen'] = {}
+        self._pool: Optional['lchelper.BrowserPool'] = None
+
+    def load_cache(self) -> Dict[Any, Any]:
+        r"""Load the downloaded problems in the cache file of the working directory. The contents are kept in memory
+        and only loaded again if the file is modified.
+        """
+        path = os.path.abspath(CACHE_FILE)
+        mtime = os.path.getmtime(path) if os.path.exists(path) else None
+        if path in self._caches and self._caches[path][0] == mtime:
+            return self._caches[path][1]
+        info = {}
+        if mtime is not None:
+            with lchelper.trace_span("load_cache", "main"), open(path, "rb") as f:
+                info = pickle.load(f)
+        self._caches[path] = (mtime, info)
+        return info
+
+    def save_cache(self, info: Dict[Any, Any]) -> None:
+        path = os.path.abspath(CACHE_FILE)
+        with lchelper.trace_span("save_cache", "main"), open(path, "wb") as f:
+            pickle.dump(info, f)
+        self._caches[path] = (os.path.getmtime(path), info)
+
+    def codegen(self, lang: str) -> 'lchelper.codegen.CodeGen':
+        if lang not in self._codegens:
+            self._codegens[lang] = lchelper.create_codegen(lang)
+        return self._codegens[lang]
+
+    @contextlib.contextmanager
+    def browser_pool(self, size: int) -> Iterator['lchelper.BrowserPool']:
+        r"""A pool of browsers with at least ``size`` browsers. Browsers in a persistent session stay open (and signed
+        in) after the command finishes.
+        """
+        if not self.persistent:
+            with lchelper.BrowserPool(size) as pool:
+                yield pool
+            return
+        if self._pool is None or self._pool.size < size:
+            if self._pool is not None:
+                self._pool.close()
+            self._pool = lchelper.BrowserPool(size)
+        yield self._pool
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+
+
 def main():
     args = parse_args()
     if args.debug:
         lchelper.utils.register_excepthook()
 
+    if args.command in DAEMON_COMMANDS and args.use_daemon:
+        return_code = lchelper.forward_to_daemon(sys.argv[1:], os.getcwd())
+        if return_code is not None:
+            sys.exit(return_code)
+        lchelper.log(f"No daemon is listening on '{lchelper.DEFAULT_SOCKET_PATH}', running the command in this process",
+                     "warning")
+    if args.command == "daemon":
+        if args.stop:
+            if not lchelper.stop_daemon(args.socket):
+                lchelper.log(f"No daemon is listening on '{args.socket}'", "warning")
+            return
+        session = Session(persistent=True)
+        try:
+            lchelper.serve_daemon(lambda argv, cwd, output: handle_request(argv, cwd, output, session), args.socket)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            session.close()
+        return
+    execute(args, Session())
+
+
+def handle_request(argv: List[str], cwd: str, output: io.TextIOBase, session: Session) -> int:
+    r"""Run a command forwarded to the daemon, with its output redirected to the client."""
+    old_cwd, old_level = os.getcwd(), lchelper.get_log_level()
+    try:
+        with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+            os.chdir(cwd)
+            args = parse_args(argv)
+            if args.command not in DAEMON_COMMANDS:
+                print(f"The `{args.command}` command cannot be run by the daemon.")
+                return 1
+            execute(args, session)
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    finally:
+        os.chdir(old_cwd)
+        lchelper.set_log_level(old_level)
+    return 0
+
+
+def execute(args, session: Session) -> None:
+    if args.log_level is not None:
+        lchelper.set_log_level(args.log_level)
+    log_sink = lchelper.add_json_log_sink(args.log_json) if args.log_json is not None else None
+
+    try:
+        if args.trace_path is None:
+            run_command(args, session)
+            return
+        lchelper.enable_tracing()
+        try:
+            with lchelper.trace_span(args.command or "help", "main"):
+                run_command(args, session)
+        finally:
+            lchelper.write_trace(args.trace_path, args.trace_format)
+            lchelper.disable_tracing()
+            lchelper.log(f"Trace written to: {args.trace_path}")
+    finally:
+        if log_sink is not None:
+            lchelper.remove_json_log_sink(log_sink)
+
+
+def run_command(args, session: Session) -> None:
     if args.command == "login":
         print(f"Logging in using account '{args.username}'...")
         lchelper.update_cookie(args.username, args.site)
         print(f"Cookies for user '{args.username}' saved.")
 
     elif args.command == "get":
-        if os.path.exists(CACHE_FILE):
-            with open(CACHE_FILE, "rb") as f:
-                info = pickle.load(f)
-        else:
-            info = {}
-
-        url_parse = urlparse(args.url)
-        if url_parse.netloc != "":  # URL instead of name
-            contest_name = args.url.rstrip('/').split('/')[-1]  # use the final URL segment as contest name
-            site: Optional[str] = lchelper.utils.remove_affix(url_parse.netloc, "www.", ".com")
-        else:
-            contest_name = args.url
-            site = None
-
-        cached_problems: Optional[List[Dict[str, Any]]] = None
-        if not args.no_cache:
-            if (site, contest_name) in info:
-                cached_problems = info[site, contest_name]
-
-        if cached_problems is None:
-            available_users = lchelper.get_users()
-            if len(available_users) == 0:
-                print(f"You're not logged in. Please run `{PROGRAM} login <username>` first.")
-                exit(1)
-
-            candidates = user_candidates = available_users
-            if args.username is not None:
-                candidates = user_candidates = [user for user in candidates if user.username == args.username]
-            if site is not None:
-                candidates = [user for user in candidates if user.site == site]
-            # If there exist multiple candidates with different usernames, raise an error to avoid ambiguity.
-            if len(set(user.username for user in candidates)) > 1:
-                print(f"You have logged in with multiple accounts: {', '.join(repr(s) for s in candidates)}.\n"
-                      f"Please select the user using the `-u <username>` flag.")
-                exit(1)
-            if len(candidates) == 0:
-                if args.username is not None:
-                    if len(user_candidates) > 0:
-                        print(f"The specified user '{args.username}' is not from the site '{site}'.\n"
-                              f"Please log in with a user from '{site}' by running "
-                              f"`{PROGRAM} login -s {site} <username>`.")
-                    else:
-                        print(f"The specified user '{args.username}' is not logged in.\n"
-                              f"Please log in by running `{PROGRAM} login {args.username}` first.")
+        contest_urls = list(args.urls)
+        if args.list_file is not None:
+            with open(args.list_file) as f:
+                contest_urls.extend(line.strip() for line in f if line.strip() and not line.startswith("#"))
+        contests: List[Tuple[Optional[str], str]] = []  # (site, contest name)
+        for contest_url in contest_urls:
+            for url in lchelper.utils.expand_range(contest_url):
+                url_parse = urlparse(url)
+                if url_parse.netloc != "":  # URL instead of name
+                    contest_name = url.rstrip('/').split('/')[-1]  # use the final URL segment as contest name
+                    site = lchelper.utils.remove_affix(url_parse.netloc, "www.", ".com")
+                    contests.append((site, contest_name))
                 else:
-                    print(f"There are no users from the site '{site}'.\n"
-                          f"Please log in with a user from '{site}' by running `{PROGRAM} login -s {site} <username>`.")
-                exit(1)
+                    contests.append((None, url))
+        if len(contests) == 0:
+            print("No contests specified. Please provide contest URLs or names, or a list file with `--list`.")
+            exit(1)
+        if args.prefix is not None and len(contests) > 1:
+            print("The `-p` flag can only be used when downloading a single contest.")
+            exit(1)
 
-            user = candidates[0]
-            cookie_path = lchelper.get_cookie_path(user.username, user.site)
-            url = f"https://{user.site}.com/contest/{contest_name}"
-            lchelper.log(f"User: {user}, URL: {url}")
+        info = session.load_cache()
 
-            problems = lchelper.get_problems(url, user.site, cookie_path)
+        def create_projects(site: Optional[str], contest_name: str, problems: List[lchelper.Problem]) -> None:
+            for lang in args.lang:
+                codegen = session.codegen(lang)
+                project_path = os.path.join(args.output, f"{(args.prefix or contest_name)}_{lang}")
+                with lchelper.trace_span("create_project", "main", contest=contest_name, language=lang):
+                    codegen.create_project(project_path, problems, site, debug=args.debug)
+                lchelper.log(f"Project in language '{lang}' stored at: {project_path}", "success")
 
-            info[site, contest_name] = [lchelper.utils.to_dict(p) for p in problems]
-        else:
-            problems = [lchelper.utils.from_dict(lchelper.Problem, p) for p in cached_problems]
+        to_download = []
+        for site, contest_name in dict.fromkeys(contests):  # remove duplicates while keeping the order
+            if not args.no_cache and (site, contest_name) in info:
+                problems = [lchelper.utils.from_dict(lchelper.Problem, p) for p in info[site, contest_name]]
+                create_projects(site, contest_name, problems)
+            else:
+                to_download.append((site, contest_name))
+        if len(to_download) == 0:
+            return
 
-        for lang in args.lang:
-            codegen = lchelper.create_codegen(lang)
-            project_path = os.path.join(args.output, f"{(args.prefix or contest_name)}_{lang}")
-            codegen.create_project(project_path, problems, site, debug=args.debug)
-            lchelper.log(f"Project in language '{lang}' stored at: {project_path}", "success")
+        users: Dict[Optional[str], lchelper.User] = {}
+        for site, _ in to_download:
+            if site not in users:
+                users[site] = select_user(args.username, site)
+
+        def download(site: Optional[str], contest_name: str, pool: lchelper.BrowserPool) -> List[lchelper.Problem]:
+            user = users[site]
+            cookie_path = lchelper.get_cookie_path(user.username, user.site)
+            url = f"{lchelper.utils.site_url(user.site)}/contest/{contest_name}"
+            lchelper.log(f"User: {user}, URL: {url}")
+            return lchelper.get_problems(url, user.site, cookie_path, pool=pool)
+
+        # Contests are downloaded concurrently, and projects are generated as soon as each download finishes.
+        jobs = min(args.jobs, len(to_download))
+        failed = False
+        with session.browser_pool(jobs) as pool, ThreadPoolExecutor(max_workers=jobs) as executor:
+            futures = {executor.submit(download, site, contest_name, pool): (site, contest_name)
+                       for site, contest_name in to_download}
+            for future in as_completed(futures):
+                site, contest_name = futures[future]
+                try:
+                    problems = future.result()
+                except Exception as e:
+                    lchelper.log(f"Failed to download contest '{contest_name}': {e}", "error")
+                    failed = True
+                    continue
+                info[site, contest_name] = [lchelper.utils.to_dict(p) for p in problems]
+                session.save_cache(info)
+                create_projects(site, contest_name, problems)
+        if failed:
+            exit(1)
     elif args.command == "getp":
         url_parse = urlparse(args.url)
         problem_name = args.url.rstrip('/').split('/')[-1]  # use the final URL segment as problem name
         site: Optional[str] = lchelper.utils.remove_affix(url_parse.netloc, "www.", ".com")
-        # get users
-        available_users = lchelper.get_users()
-        if len(available_users) == 0:
-            print(f"You're not logged in. Please run `{PROGRAM} login <username>` first.")
-            exit(1)
-
-        candidates = user_candidates = available_users
-        if args.username is not None:
-            candidates = user_candidates = [user for user in candidates if user.username == args.username]
-        if site is not None:
-            candidates = [user for user in candidates if user.site == site]
-        # If there exist multiple candidates with different usernames, raise an error to avoid ambiguity.
-        if len(set(user.username for user in candidates)) > 1:
-            print(f"You have logged in with multiple accounts: {', '.join(repr(s) for s in candidates)}.\n"
-                  f"Please select the user using the `-u <username>` flag.")
-            exit(1)
-        if len(candidates) == 0:
-            if args.username is not None:
-                if len(user_candidates) > 0:
-                    print(f"The specified user '{args.username}' is not from the site '{site}'.\n"
-                          f"Please log in with a user from '{site}' by running "
-                          f"`{PROGRAM} login -s {site} <username>`.")
-                else:
-                    print(f"The specified user '{args.username}' is not logged in.\n"
-                          f"Please log in by running `{PROGRAM} login {args.username}` first.")
-            else:
-                print(f"There are no users from the site '{site}'.\n"
-                      f"Please log in with a user from '{site}' by running `{PROGRAM} login -s {site} <username>`.")
-            exit(1)
-
-        user = candidates[0]
+        user = select_user(args.username, site)
         cookie_path = lchelper.get_cookie_path(user.username, user.site)
-        url = f"https://{user.site}.com/problems/{problem_name}"
+        url = f"{lchelper.utils.site_url(user.site)}/problems/{problem_name}"
         if 'challenge/card' in args.url:
             url = args.url
         lchelper.log(f"User: {user}, URL: {url}")
@@ -181,11 +428,107 @@ def main():
         problem = lchelper.get_problem(url, user.site, cookie_path)
 
         for lang in args.lang:
-            codegen = lchelper.create_codegen(lang)
+            codegen = session.codegen(lang)
             problem_name = '-'.join(problem.name.strip().lower().split(' '))
             project_path = os.path.join(args.output, f"{problem_name}_{lang}")
-            codegen.create_project_single_problem(project_path, problem, site, debug=args.debug)
+            with lchelper.trace_span("create_project", "main", problem=problem.name, language=lang):
+                codegen.create_project_single_problem(project_path, problem, site, debug=args.debug)
             lchelper.log(f"Project in language '{lang}' stored at: {project_path}", "success")
+    elif args.command == "run":
+        all_passed = True
+        env = {}
+        if args.budget is not None:
+            env["LCHELPER_TIME_BUDGET_US"] = str(args.budget)
+        if args.time_limit is not None:
+            env["LCHELPER_TIME_LIMIT"] = str(args.time_limit)
+        if args.profile is not None:
+            env["LCHELPER_PROFILE"] = args.profile
+        if args.full_output:
+            env["LCHELPER_FULL_OUTPUT"] = "1"
+        cxx_flags = args.cxx_flags.split()
+        if args.memory:
+            env["LCHELPER_MEMORY"] = "1"
+            cxx_flags.append("-DLCHELPER_MEMORY")
+        run_args = []
+        if args.stress is not None:
+            cxx_flags.append("-DLCHELPER_STRESS")
+            run_args = ["stress", str(args.stress)]
+        elif args.bench is not None:
+            cxx_flags.append("-DLCHELPER_BENCH")
+            run_args = ["bench", *map(str, args.bench)]
+        elif args.cases is not None:
+            run_args = ["custom", args.cases]
+        limits = lchelper.ResourceLimits(
+            cpu_time=args.cpu_limit, wall_time=args.timeout,
+            memory=args.memory_limit * 2 ** 20 if args.memory_limit is not None else None,
+            stack=args.stack_limit * 2 ** 20 if args.stack_limit is not None else None)
+        if limits._replace(wall_time=None).enabled and os.name != "posix":
+            lchelper.log("Resource limits are only supported on POSIX systems", "error")
+            exit(1)
+        for project_path in args.project:
+            results = lchelper.run_project(project_path, jobs=args.jobs, cxx=args.cxx, cxx_flags=cxx_flags,
+                                           args=run_args, env=env, timeout=args.timeout,
+                                           limits=limits if limits._replace(wall_time=None).enabled else None)
+            if len(results) == 0:
+                lchelper.log(f"No problems found in project '{project_path}'", "warning")
+                continue
+            lchelper.log(f"Project: {project_path}")
+            if args.bench is not None:
+                for result in results:
+                    points = lchelper.parse_benchmark(result.output)
+                    if len(points) < 2:
+                        all_passed = False
+                        lchelper.log(f"Problem '{result.target.name}': benchmark failed", "error")
+                        print(result.output.rstrip("\n"))
+                        continue
+                    estimate = lchelper.estimate_complexity(points, args.max_n)
+                    lchelper.log(f"Problem '{result.target.name}': O({estimate.complexity}), "
+                                 f"exponent {estimate.exponent:.2f}, projected time at n={args.max_n}: "
+                                 f"{estimate.projected_time * 1000:.2f} ms")
+                    if args.verbose:
+                        for n, t in points:
+                            print(f"    n={n}: {t * 1000:.3f} ms")
+                continue
+            for line in lchelper.format_summary(results, args.memory_ratio):
+                print(line)
+            for result in results:
+                if not result.passed:
+                    all_passed = False
+                for verdict in result.verdicts:
+                    if lchelper.is_memory_heavy(verdict, args.memory_ratio):
+                        lchelper.log(f"Problem '{result.target.name}', {verdict.label}: peak memory "
+                                     f"{verdict.peak_bytes} bytes in {verdict.allocs} allocations, for "
+                                     f"{verdict.input_bytes} bytes of input", "warning")
+                if args.profile is not None or ((args.verbose or args.stress is not None) and not result.passed):
+                    lchelper.log(f"Output of problem '{result.target.name}':", "warning")
+                    print(result.output.rstrip("\n"))
+        if not all_passed:
+            exit(1)
+    elif args.command == "watch":
+        def on_result(result: lchelper.RunResult) -> None:
+            print(f"[{time.strftime('%H:%M:%S')}] {result.target.name}: "
+                  f"compiled in {result.compile_time:.2f}s, ran in {result.run_time:.2f}s")
+            print(result.output.rstrip("\n"))
+            for line in lchelper.format_summary([result]):
+                print(line)
+
+        lchelper.log(f"Watching project '{args.project}', press Ctrl-C to stop")
+        try:
+            lchelper.watch_project(args.project, on_result, cxx=args.cxx, cxx_flags=args.cxx_flags.split(),
+                                   timeout=args.timeout, interval=args.interval)
+        except KeyboardInterrupt:
+            pass
+
+    elif args.command == "compile-server":
+        server = lchelper.CompileServer(args.cxx, args.cxx_flags.split())
+        start_time = time.perf_counter()
+        for message in server.warm([target for path in args.projects for target in lchelper.find_problems(path)]):
+            lchelper.log(message, "warning")
+        lchelper.log(f"Precompiled headers in {time.perf_counter() - start_time:.2f}s, waiting for requests")
+        try:
+            lchelper.serve_compile_requests(server, args.projects, sys.stdin, sys.stdout, args.compare_cold)
+        except KeyboardInterrupt:
+            pass
 
 
 if __name__ == '__main__':
@@ -1,10 +1,56 @@
+import contextlib
+import io
+import json
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
 import unittest
-from typing import Union, Dict, Optional, List
+import unittest.mock
+import urllib.request
+import zipfile
+from typing import Any, Union, Dict, Optional, List, Sequence, Tuple
 
 import lchelper.codegen
+import lchelper.codegen.base
+import lchelper.codegen.python
+import lchelper.compile_server
+import lchelper.complexity
+import lchelper.daemon
+import lchelper.logging
+import lchelper.mock_site
+import lchelper.runner
+import lchelper.tracing
+import lchelper.utils
+import lchelper.watch
+import main
 from lchelper.common import FunctionSignature, Example, ProblemSignature, Interaction, \
     InteractiveProblemSignature, Problem
 
+CXX = os.environ.get("CXX", "g++")
+requires_cxx = unittest.skipUnless(shutil.which(CXX) is not None and os.name == "posix",
+                                   f"C++ compiler '{CXX}' and POSIX resource limits required")
+
+
+def run_cpp_program(path: str, code: str, cxx_flags: Sequence[str] = (),
+                    stack: Optional[int] = None) -> Tuple[Optional[int], str]:
+    r"""Compile and run a C++ program that includes the testing header, under a one-minute time limit and an optional
+    stack limit in bytes. Returns the return code and the output of the program.
+    """
+    for name, content in [("_boilerplate.hpp", lchelper.codegen.base.Boilerplate_Code),
+                          ("_testing.h", lchelper.codegen.base.Testing_Code), ("main.cc", code)]:
+        with open(os.path.join(path, name), "w") as f:
+            f.write(content)
+    target = lchelper.runner.ProblemTarget("main", "cpp", os.path.join(path, "main.cc"), os.path.join(path, "main"))
+    compiled, output = lchelper.runner.compile_problem(target, CXX, cxx_flags)
+    assert compiled, output
+    limits = lchelper.runner.ResourceLimits(wall_time=60.0, stack=stack)
+    return_code, output, _ = lchelper.runner.run_problem_limited(target, limits)
+    return return_code, output
+
 
 class EndToEndTest(unittest.TestCase):
     def _test_problem_set(self, url: str, site: str = "leetcode", ignore_problems: Optional[List[int]] = None):
@@ -332,3 +378,573 @@ class ParseTest(unittest.TestCase):
                     -1),
             ])
         self._test_parse_problem(problem, signature)
+
+
+class RunnerTest(unittest.TestCase):
+    def test_parse_verdicts(self):
+        output = ("Example - 0\033[1;32m [OK]\033[0m\n"
+                  "Expected: 1\n"
+                  "two_sum - Example 1 [WRONG] (1200 us)\033[1;33m [SLOW]\033[0m exceeds budget of 1000 us\n"
+                  "Expected: [0, 1]\n"
+                  "Received: [1, 0]\n")
+        assert lchelper.runner.parse_verdicts(output) == [
+            lchelper.runner.Verdict("Example - 0", "OK", None, False),
+            lchelper.runner.Verdict("two_sum - Example 1", "WRONG", 1200, True),
+        ]
+
+    def test_memory_heavy(self):
+        output = ("Example - 0\033[1;32m [OK]\033[0m (3 us) [MEM peak 4194412 B, 5 allocs, input 108 B]\n"
+                  "Example - 1\033[1;32m [OK]\033[0m (2 us) [MEM peak 412 B, 3 allocs, input 108 B]\n")
+        verdicts = lchelper.runner.parse_verdicts(output)
+        assert verdicts[0] == lchelper.runner.Verdict("Example - 0", "OK", 3, False, 4194412, 5, 108)
+        assert [lchelper.runner.is_memory_heavy(v) for v in verdicts] == [True, False]
+
+    def test_classify_limits(self):
+        limits = lchelper.runner.ResourceLimits(cpu_time=1.0, memory=256 * 2 ** 20)
+        usage = lchelper.runner.ResourceUsage(0.1, 0.2, 20 * 2 ** 20)
+        classify = lchelper.runner.classify_limits
+        assert classify(0, "", usage, limits) is None
+        assert classify(None, "", usage, limits) == "TLE"
+        assert classify(-signal.SIGXCPU, "", usage._replace(cpu_time=0.98), limits) == "TLE"
+        assert classify(-signal.SIGABRT, "terminate called after throwing 'std::bad_alloc'", usage, limits) == "MLE"
+        assert classify(1, "MemoryError", usage, limits) == "MLE"
+        assert classify(-signal.SIGSEGV, "", usage, limits) == "RE"
+        assert classify(1, "MemoryError", usage, limits._replace(memory=None)) == "RE"
+
+    @unittest.skipUnless(os.name == "posix", "resource limits are only supported on POSIX systems")
+    def test_run_problem_limited(self):
+        with tempfile.TemporaryDirectory() as path:
+            source_path = os.path.join(path, "solve.py")
+            with open(source_path, "w") as f:
+                f.write("print('Example - 0 [OK] (3 us)')\n")
+            target = lchelper.runner.ProblemTarget("solve", "python", source_path, None)
+            limits = lchelper.runner.ResourceLimits(cpu_time=5.0, wall_time=10.0, memory=1024 * 2 ** 20)
+            return_code, output, usage = lchelper.runner.run_problem_limited(target, limits)
+        assert return_code == 0 and len(lchelper.runner.parse_verdicts(output)) == 1
+        # The program does not use the generated testing code, so its peak resident set size is not reported.
+        assert usage.max_rss is None and lchelper.runner.classify_limits(return_code, output, usage, limits) is None
+
+    @requires_cxx
+    @unittest.skipUnless(os.path.exists("/proc/self/status"), "peak resident set size is only reported on Linux")
+    def test_peak_rss_excludes_parent(self):
+        # The peak resident set size must not include the memory of this process, which started the program.
+        parent_memory = b"x" * (512 * 2 ** 20)
+        problem = Problem("", "total", "", ["Input: nums = [1,2]\nOutput: 3"], [
+            "class Solution {", "public:", "    int solve(vector<int>& nums) {", "        return 3;", "    }", "};"])
+        limits = lchelper.runner.ResourceLimits(wall_time=60.0)
+        with tempfile.TemporaryDirectory() as path:
+            for lang in ["cpp", "python"]:
+                project_path = os.path.join(path, lang)
+                lchelper.codegen.create_codegen(lang).create_project(project_path, [problem], "leetcode", debug=True)
+                target, = lchelper.runner.find_problems(project_path)
+                compiled, compile_output = lchelper.runner.compile_problem(target, CXX)
+                self.assertTrue(compiled, compile_output)
+                return_code, output, usage = lchelper.runner.run_problem_limited(target, limits)
+                self.assertEqual(return_code, 0, output)
+                self.assertGreater(usage.max_rss, 0)
+                self.assertLess(usage.max_rss, 128 * 2 ** 20)
+        del parent_memory
+
+    @requires_cxx
+    def test_compile_server(self):
+        server = lchelper.compile_server.CompileServer(CXX)
+
+        def serve(path: str, requests: List[str]) -> List[Dict[str, Any]]:
+            responses = io.StringIO()
+            lchelper.compile_server.serve_compile_requests(server, [path], io.StringIO("\n".join(requests)), responses)
+            return [json.loads(line) for line in responses.getvalue().splitlines()]
+
+        with tempfile.TemporaryDirectory() as path:
+            lchelper.codegen.create_codegen("cpp").create_project(
+                path, lchelper.mock_site.make_mock_problems(1, example_size=3), "leetcode")
+            target = lchelper.runner.find_problems(path)[0]
+            first, second, unknown = serve(path, ["A", target.name, "Z"])
+            with open(target.source_path, "a") as f:
+                f.write("// edited\n")
+            edited, = serve(path, [target.source_path])
+        self.assertTrue(first["success"] and not first["cached"])
+        self.assertTrue(second["success"] and second["cached"] and second["problem"] == target.name)
+        self.assertEqual(unknown, {"problem": "Z", "success": False, "error": "Unknown problem 'Z'"})
+        self.assertTrue(edited["success"] and not edited["cached"])
+
+    def test_watch_project(self):
+        results = []
+        polls = 0
+
+        def should_stop() -> bool:
+            nonlocal polls
+            polls += 1
+            if polls == 2:
+                # Simulate saving the code file between two polls.
+                stat = os.stat(source_path)
+                os.utime(source_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+            return polls > 6
+
+        with tempfile.TemporaryDirectory() as path:
+            problems = lchelper.mock_site.make_mock_problems(2, example_size=3)
+            lchelper.codegen.create_codegen("python").create_project(path, problems, "leetcode")
+            target = lchelper.runner.find_problems(path)[0]
+            source_path = target.source_path
+            self.assertIn(os.path.join(path, "_runtime.py"), lchelper.watch.watched_files(target))
+            lchelper.watch.watch_project(path, results.append, interval=0.01, should_stop=should_stop)
+        # Only the changed problem is rerun, and only once.
+        self.assertEqual([result.target.name for result in results], [target.name])
+        self.assertTrue(results[0].compiled and len(results[0].verdicts) == 3)
+
+
+class CodeGenTest(unittest.TestCase):
+    def test_stress_spec(self):
+        codegen = lchelper.codegen.PythonCodeGen()
+        assert codegen._stress_spec("vector<vector<int>>&") == '("list", ("list", "int"))'
+        assert codegen._stress_spec("const string &") == '"str"'
+        assert codegen._stress_spec("TreeNode*") == '"tree"'
+        assert codegen._stress_spec("vector<TreeNode*>") is None
+        assert codegen._stress_spec("unordered_map<int, int>") is None
+
+    def test_replay_interactions(self):
+        functions = [FunctionSignature("Counter", [], "void"), FunctionSignature("add", [("int", "x")], "int")]
+        problem = Problem("", "counter", "", [], ["class Counter {", "public:", "    Counter() {", "    }", "};"])
+
+        def test_code(lang: str, interactions: int) -> List[str]:
+            example = [Interaction("Counter", {}, None)] + [Interaction("add", {"x": 1}, idx + 1)
+                                                          for idx in range(interactions)]
+            signature = InteractiveProblemSignature("Counter", functions, [example])
+            return lchelper.codegen.create_codegen(lang).generate_code(problem, signature)[1]
+
+        for lang in ["cpp", "python"]:
+            code = test_code(lang, 1000)
+            self.assertEqual(len(code), len(test_code(lang, 100)))
+            self.assertTrue(any('"add",' in line for line in code))
+
+    def test_literals(self):
+        from lchelper.codegen.literals import cpp_literal, python_literal
+        self.assertEqual(cpp_literal([["a", "'"], []], "vector<vector<char>>&"), "{{'a', '\\''}, {}}")
+        self.assertEqual(cpp_literal(['say "hi"', None], "const vector<string> &"), '{"say \\"hi\\"", INT_MIN}')
+        self.assertEqual(cpp_literal([[1, None, 2]], "vector<TreeNode*>"), "{_construct_tree({1, NONE, 2})}")
+        self.assertEqual(python_literal([[True, 1.5], None]), "[[True, 1.5], None]")
+        deep = 1
+        for _ in range(10000):  # deeper than the recursion limit
+            deep = [deep]
+        self.assertEqual(python_literal(deep), "[" * 10000 + "1" + "]" * 10000)
+
+    def test_parse_cpp_type(self):
+        from lchelper.codegen.types import parse_cpp_type
+        typ = parse_cpp_type("const std::vector<pair<int, unordered_map<string, long long>>> &")
+        self.assertEqual(str(typ.value_type), "vector<pair<int, unordered_map<string, long long>>>")
+        self.assertTrue(typ.const and typ.reference)
+        self.assertEqual(typ.element.args[1].args[1].name, "long long")
+        self.assertTrue(parse_cpp_type("TreeNode *").is_tree)
+        self.assertIs(parse_cpp_type("vector<int>&"), parse_cpp_type("vector<int>&"))
+        self.assertEqual(lchelper.codegen.create_codegen("python")._convert_cpp_type("const map<string, int>&"),
+                         "Dict[str, int]")
+        with self.assertRaises(ValueError):
+            parse_cpp_type("vector<int")
+
+    def test_constant_pool(self):
+        nums = list(range(100))
+        signature = ProblemSignature(FunctionSignature("solve", [("vector<int>&", "nums"), ("int", "k")], "int"),
+                                     [Example({"nums": nums, "k": k}, k) for k in range(3)])
+        problem = Problem("", "pooled", "", [], [])
+        for lang, declaration, reference in [("cpp", "const vector<int> _const0 = {0, 1, 2", "nums = _const0;"),
+                                             ("python", "_CONST_0 = [0, 1, 2", "nums = _clone(_CONST_0)")]:
+            code = lchelper.codegen.create_codegen(lang).generate_code(problem, signature)[1]
+            self.assertEqual(sum(line.startswith(declaration) for line in code), 1)
+            self.assertEqual(sum(line.strip().endswith(reference) for line in code), 3)
+
+    def test_custom_cases(self):
+        runtime = {}
+        exec(lchelper.codegen.python.Runtime_Code, runtime)
+        runtime["_CHUNK_SIZE"] = 8  # force values to span several chunks
+        cases = []
+
+        def run_case(reader, out, name):
+            args = [reader.read(), reader.read()]
+            expected = runtime["_expected_output"](reader, out)
+            cases.append((name, args, expected.read() if expected is not None else None))
+
+        with tempfile.TemporaryDirectory() as path:
+            for name, content in [("1.in", "[1,\n2,3]\n2\nnums = [4], k = 5\n"), ("1.out", "12\n"),
+                                  ("2.txt", "Input: nums = [6],\nk = 7\nOutput: 42\n[8] 9\n")]:
+                with open(os.path.join(path, name), "w") as f:
+                    f.write(content)
+            runtime["_run_custom"](path, run_case)
+            runtime["_run_custom"](os.path.join(path, "missing.txt"), run_case)
+        self.assertEqual([(name.split(" (")[0], args, expected) for name, args, expected in cases],
+                         [("Custom - 0", [[1, 2, 3], 2], 12), ("Custom - 1", [[4], 5], None),
+                          ("Custom - 2", [[6], 7], 42), ("Custom - 3", [[8], 9], None)])
+
+    @requires_cxx
+    def test_mismatch_report(self):
+        def problem(name: str, signature: str, body: str, example: str) -> Problem:
+            return Problem("", name, "", [example], ["class Solution {", "public:", f"    {signature} {{",
+                                                     f"        {body}", "    }", "};"])
+
+        problems = [
+            problem("grid", "vector<vector<int>> solve(vector<vector<int>>& grid)", "grid[1][2] = 0; return grid;",
+                    "Input: grid = [[1,2,3],[4,5,6]]\nOutput: [[1,2,3],[4,5,6]]"),
+            problem("length", "vector<int> solve(vector<int>& nums)", "nums.pop_back(); return nums;",
+                    "Input: nums = [1,2,3]\nOutput: [1,2,3]"),
+            problem("tree", "TreeNode* solve(TreeNode* root)", "root->right->val = 5; return root;",
+                    "Input: root = [1,2,4]\nOutput: [1,2,4]"),
+        ]
+        with tempfile.TemporaryDirectory() as path:
+            lchelper.codegen.create_codegen("cpp").create_project(path, problems, "leetcode", debug=True)
+            results = lchelper.runner.run_project(path, cxx=CXX, timeout=60.0)
+        outputs = {result.target.name: result.output for result in results}
+        self.assertTrue(all(result.compiled for result in results), outputs)
+        self.assertIn("First mismatch at [1][2]: expected {4, 5, 6}, received {4, 5, 0}", outputs["A_grid"])
+        self.assertIn("First mismatch at the top level: expected length 3, received length 2, extra elements {1, 2, 3}",
+                      outputs["B_length"])
+        self.assertIn("First mismatch at [2] (level order): expected 4, received 5", outputs["C_tree"])
+
+    @requires_cxx
+    def test_cpp_custom_cases(self):
+        code = "\n".join([
+            '#include "_testing.h"',
+            "void run_case(_Reader &in, _Reader *out, const std::string &name) {",
+            "    std::vector<std::vector<int>> grid;",
+            "    std::string s;",
+            "    TreeNode *root;",
+            "    std::vector<bool> flags;",
+            "    _read(in, grid);",
+            "    _read(in, s);",
+            "    _read(in, root);",
+            "    _read(in, flags);",
+            '    std::cerr << name << ": ";',
+            "    print(grid);",
+            "    std::cerr << \" <\" << s << \"> \";",
+            "    _print_bounded(root);",
+            '    std::cerr << " ";',
+            "    print(flags);",
+            "    if (_Reader *expected = _expected_output(in, out)) {",
+            "        int value;",
+            "        _read(*expected, value);",
+            '        std::cerr << " -> " << value;',
+            "    }",
+            "    std::cerr << std::endl;",
+            "    delete root;",
+            "}",
+            "int main() {",
+            '    for (const char *path : {"cases.txt", "cases", "bad.txt"}) _run_custom(path, run_case);',
+            "    return 0;",
+            "}",
+        ])
+        files = {
+            "cases.txt": ('Input: grid = [[1,2],[3]], s = "a\\"b\\\\c\\t", root = [1,null,2], flags = [true,false]\n'
+                          "Output: 7\n"
+                          "[[ ], [4,\n"
+                          "  5]]\n"
+                          '"x,y" [] [false]\n'),
+            "cases/1.in": '[[6]] "" [3,4] []\n[] "z" [5] [true]\n',
+            "cases/1.out": "8\n9\n",
+            "cases/.hidden": "not a case\n",
+            "bad.txt": '[[1]]\n"s"\n[1]\n[true,maybe]\n',
+        }
+        with tempfile.TemporaryDirectory() as path:
+            os.makedirs(os.path.join(path, "cases"))
+            for name, content in files.items():
+                with open(os.path.join(path, name), "w") as f:
+                    f.write(content)
+            return_code, output = run_cpp_program(path, code)
+        self.assertEqual(return_code, 1, output)
+        case_dir = os.path.join("cases", "1.in")
+        self.assertEqual(output.splitlines(), [
+            'Custom - 0: {{1, 2}, {3}} <a"b\\c\t> [1,null,2] {true, false} -> 7',
+            "Custom - 1: {{}, {4, 5}} <x,y> [] {false}",
+            f"Custom - 0 ({case_dir}): {{{{6}}}} <> [3,4] {{}} -> 8",
+            f"Custom - 1 ({case_dir}): {{}} <z> [5] {{true}} -> 9",
+            "bad.txt:4: expected a boolean",
+        ])
+
+    @requires_cxx
+    def test_stress_shrink(self):
+        # The solution ignores elements of at least 3, so the smallest failing input is a single 3.
+        problem = Problem("", "total", "", ["Input: nums = [1,2]\nOutput: 3"], [
+            "class Solution {", "public:", "    int solve(vector<int>& nums) {",
+            "        int s = 0; for (int x : nums) s += x >= 3 ? 0 : x; return s;", "    }", "};"])
+        fixes = {"cpp": ("s += x >= 3 ? 0 : x;", "s += x;"),
+                 "python": ("pass", "return sum(nums)")}
+        with tempfile.TemporaryDirectory() as path:
+            for lang, (wrong, correct) in fixes.items():
+                project_path = os.path.join(path, lang)
+                lchelper.codegen.create_codegen(lang).create_project(project_path, [problem], "leetcode", debug=True)
+                target, = lchelper.runner.find_problems(project_path)
+                with open(target.source_path) as f:
+                    solution, brute_force = f.read().split("class BruteForce")
+                if lang == "python":
+                    solution = solution.replace(wrong, "return sum(x for x in nums if x < 3)", 1)
+                with open(target.source_path, "w") as f:
+                    f.write(solution + "class BruteForce" + brute_force.replace(wrong, correct, 1))
+                result, = lchelper.runner.run_project(project_path, cxx=CXX, cxx_flags=["-DLCHELPER_STRESS"],
+                                                      args=["stress", "100"], env={"LCHELPER_STRESS_SEED": "1"},
+                                                      timeout=60.0)
+                self.assertIn("minimized input", result.output, result.output)
+                self.assertIn("(seed 1)", result.output)
+                self.assertIn("nums = [3]", result.output)
+                self.assertNotEqual(result.return_code, 0)
+
+    @requires_cxx
+    def test_memory_excludes_comparison(self):
+        # The solution returns its input without allocating, so the allocations made when comparing trees and reporting
+        # the mismatch of the second example must not be counted.
+        problem = Problem("", "identity", "", ["Input: root = [1,2,3]\nOutput: [1,2,3]",
+                                               "Input: root = [1,2,3]\nOutput: [1,null,3]"], [
+            "class Solution {", "public:", "    TreeNode* solve(TreeNode* root) {", "        return root;", "    }", "};"])
+        with tempfile.TemporaryDirectory() as path:
+            lchelper.codegen.create_codegen("cpp").create_project(path, [problem], "leetcode", debug=True)
+            result, = lchelper.runner.run_project(path, cxx=CXX, cxx_flags=["-DLCHELPER_MEMORY"], timeout=60.0)
+        self.assertIn("[OK]", result.output)
+        self.assertIn("[WRONG]", result.output)
+        self.assertEqual(result.output.count("[MEM peak 0 B, 0 allocs"), 2, result.output)
+
+    @requires_cxx
+    def test_deep_nodes(self):
+        # Degenerate trees and lists are built, compared, and freed without recursion, with and without node pools.
+        code = "\n".join([
+            '#include "_testing.h"',
+            "int main() {",
+            "    const int n = 1000000;",
+            "    std::vector<int> tree_values = {0}, list_values = {0};",
+            "    for (int i = 1; i < n; ++i) {",
+            "        tree_values.insert(tree_values.end(), {i, NONE});",
+            "        list_values.push_back(i);",
+            "    }",
+            "    TreeNode *a = _construct_tree(tree_values), *b = _construct_tree(tree_values);",
+            "    TreeNode *leaf = b;",
+            "    while (leaf->left) leaf = leaf->left;",
+            "    leaf->val = -1;",
+            '    test("Tree", a, b, -1);',
+            "    delete a;",
+            "    delete b;",
+            "    ListNode *x = _construct_list(list_values), *y = _construct_list(list_values);",
+            "    ListNode *last = y;",
+            "    while (last->next) last = last->next;",
+            "    last->val = -1;",
+            '    test("List", x, y, -1);',
+            "    for (ListNode *head : {x, y})",
+            "        while (head) {",
+            "            ListNode *next = head->next;",
+            "            delete head;",
+            "            head = next;",
+            "        }",
+            "    return 0;",
+            "}",
+        ])
+        for cxx_flags in [[], ["-DLCHELPER_MEMORY"]]:
+            with tempfile.TemporaryDirectory() as path:
+                return_code, output = run_cpp_program(path, code, cxx_flags, stack=2 ** 20)
+            self.assertEqual(return_code, 0, output)
+            self.assertIn("First mismatch at [1999997] (level order): expected 999999, received -1", output)
+            self.assertIn("First mismatch at [999999]: expected 999999, received -1", output)
+
+    @unittest.skipUnless(hasattr(signal, "setitimer"), "interval timers required")
+    def test_time_limit_not_swallowed(self):
+        runtime = {}
+        exec(lchelper.codegen.python.Runtime_Code, runtime)
+        runtime["_TIME_LIMIT"] = 0.05
+
+        def solution():
+            deadline = time.monotonic() + 2
+            while time.monotonic() < deadline:
+                try:
+                    time.sleep(0.01)
+                except Exception:
+                    pass
+
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            runtime["_run_example"]("Example - 0", solution)
+        self.assertIn("Example - 0 [TLE] exceeds time limit of 0.05 s", output.getvalue())
+
+    def test_project_archive(self):
+        problems = lchelper.mock_site.make_mock_problems(2, example_size=3)
+        files = dict(lchelper.codegen.iter_project_files(problems, ["cpp", "python"], "leetcode", "contest"))
+        self.assertIn("contest_cpp/A_mock_problem_1/mock_problem_1.cc", files)
+        self.assertIn("contest_python/B_mock_problem_2/mock_problem_2.py", files)
+        self.assertIn("contest_python/_runtime.py", files)
+        data = lchelper.codegen.project_archive(problems, ["cpp", "python"], "leetcode", "contest")
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            self.assertEqual({name: archive.read(name) for name in archive.namelist()}, files)
+
+
+class UtilsTest(unittest.TestCase):
+    def test_expand_range(self):
+        expand_range = lchelper.utils.expand_range
+        self.assertEqual(expand_range("weekly-contest-150..152"),
+                         ["weekly-contest-150", "weekly-contest-151", "weekly-contest-152"])
+        self.assertEqual(expand_range("https://leetcode.com/contest/biweekly-contest-9..10/"),
+                         ["https://leetcode.com/contest/biweekly-contest-9/",
+                          "https://leetcode.com/contest/biweekly-contest-10/"])
+        self.assertEqual(expand_range("weekly-contest-183"), ["weekly-contest-183"])
+        self.assertEqual(expand_range("weekly-contest-7..7"), ["weekly-contest-7"])
+        with self.assertRaises(ValueError):
+            expand_range("weekly-contest-152..150")
+
+
+class ComplexityTest(unittest.TestCase):
+    def test_estimate_complexity(self):
+        import math
+        sizes = [1000, 2000, 5000, 10000, 20000, 50000]
+        quadratic = lchelper.complexity.estimate_complexity([(n, 1e-9 * n * n) for n in sizes], max_n=100000)
+        assert quadratic.complexity == "n^2"
+        assert abs(quadratic.exponent - 2) < 1e-6
+        assert abs(quadratic.projected_time - 10.0) < 1e-6
+        linearithmic = lchelper.complexity.estimate_complexity([(n, 1e-8 * n * math.log(n)) for n in sizes], 100000)
+        assert linearithmic.complexity == "n log n"
+
+    def test_parse_benchmark(self):
+        output = "Benchmark n=1000 time_ns=1500\nBenchmark n=2000 time_ns=3000\nBenchmark stopped\n"
+        assert lchelper.complexity.parse_benchmark(output) == [(1000, 1.5e-6), (2000, 3e-6)]
+
+
+class LoggingTest(unittest.TestCase):
+    def test_lazy_json_log(self):
+        class Expensive:
+            formatted = 0
+
+            def __str__(self):
+                Expensive.formatted += 1
+                return "value"
+
+        old_level = lchelper.logging.get_log_level()
+        lchelper.logging.set_log_level("warning")
+        try:
+            lchelper.logging.log("skipped %s", "debug", Expensive())
+            self.assertEqual(Expensive.formatted, 0)
+            stream = io.StringIO()
+            lchelper.logging.add_json_log_sink(stream, "info")
+            lchelper.logging.log("recorded %s", "info", Expensive())
+            lchelper.logging.log("skipped %s", "debug", Expensive())
+            self.assertEqual(Expensive.formatted, 1)
+            record = json.loads(stream.getvalue())
+            self.assertEqual((record["level"], record["message"]), ("info", "recorded value"))
+        finally:
+            lchelper.logging.set_log_level(old_level)
+            lchelper.logging._json_sinks.clear()
+
+
+class TracingTest(unittest.TestCase):
+    def test_nested_spans(self):
+        with lchelper.tracing.trace_span("ignored"):
+            pass
+        lchelper.tracing.enable_tracing()
+        try:
+            with lchelper.tracing.trace_span("outer", "main"):
+                with lchelper.tracing.trace_span("inner", "codegen", problem="A") as span_args:
+                    span_args["lines"] = 3
+            outer, inner = lchelper.tracing.get_spans()
+            with tempfile.TemporaryDirectory() as path:
+                trace_path = os.path.join(path, "trace.json")
+                lchelper.tracing.write_trace(trace_path, "chrome")
+                with open(trace_path) as f:
+                    chrome_trace = json.load(f)
+                lchelper.tracing.write_trace(trace_path, "json")
+                with open(trace_path) as f:
+                    json_trace = json.load(f)
+        finally:
+            lchelper.tracing.disable_tracing()
+
+        self.assertEqual((outer.name, inner.name), ("outer", "inner"))
+        self.assertEqual(inner.args, {"problem": "A", "lines": 3})
+        self.assertTrue(outer.start <= inner.start and inner.start + inner.duration <= outer.start + outer.duration)
+        events = chrome_trace["traceEvents"]
+        self.assertEqual([(event["name"], event["cat"], event["ph"]) for event in events],
+                         [("outer", "main", "X"), ("inner", "codegen", "X")])
+        self.assertTrue(all(event["pid"] == os.getpid() and event["tid"] == outer.thread_id for event in events))
+        self.assertTrue(events[0]["ts"] <= events[1]["ts"] and
+                        events[1]["ts"] + events[1]["dur"] <= events[0]["ts"] + events[0]["dur"])
+        self.assertEqual(events[1]["args"], {"problem": "A", "lines": 3})
+        self.assertEqual(json_trace, [span._asdict() for span in [outer, inner]])
+        self.assertEqual(lchelper.tracing.get_spans(), [])
+
+
+@unittest.skipUnless(lchelper.daemon.daemon_available(), "Unix domain sockets required")
+class DaemonTest(unittest.TestCase):
+    def test_forwarding_is_opt_in(self):
+        with unittest.mock.patch.dict(os.environ, {"LCHELPER_USE_DAEMON": ""}):
+            self.assertFalse(main.parse_args(["run", "project"]).use_daemon)
+            self.assertTrue(main.parse_args(["--daemon", "run", "project"]).use_daemon)
+        with unittest.mock.patch.dict(os.environ, {"LCHELPER_USE_DAEMON": "1"}):
+            self.assertTrue(main.parse_args(["run", "project"]).use_daemon)
+            self.assertFalse(main.parse_args(["--no-daemon", "run", "project"]).use_daemon)
+
+    def test_round_trip(self):
+        # The daemon runs in a separate process, so that forwarded environment variables really cross over.
+        daemon_code = "\n".join([
+            "import os, sys, lchelper.daemon",
+            "def handler(argv, cwd, output):",
+            "    output.write(f\"{argv} {cwd} {os.environ.get('LCHELPER_TEST_VALUE')}\\n\")",
+            "    return 3",
+            "lchelper.daemon.serve_daemon(handler, sys.argv[1])",
+        ])
+        env = {key: value for key, value in os.environ.items() if key != "LCHELPER_TEST_VALUE"}
+        with tempfile.TemporaryDirectory() as path:
+            socket_path = os.path.join(path, "daemon.sock")
+            process = subprocess.Popen([sys.executable, "-c", daemon_code, socket_path], env=env,
+                                       cwd=os.path.dirname(os.path.abspath(__file__)), stdout=subprocess.DEVNULL)
+            try:
+                # The socket is only accessible by its owner once the daemon is ready.
+                deadline = time.monotonic() + 30
+                while not (os.path.exists(socket_path) and os.stat(socket_path).st_mode & 0o777 == 0o600):
+                    self.assertLess(time.monotonic(), deadline, "daemon did not start")
+                    self.assertIsNone(process.poll(), "daemon exited")
+                    time.sleep(0.01)
+
+                def forward(value: Optional[str]) -> Tuple[Optional[int], str]:
+                    output = io.StringIO()
+                    client_env = dict(env, LCHELPER_TEST_VALUE=value) if value is not None else env
+                    with unittest.mock.patch.dict(os.environ, client_env, clear=True), \
+                            contextlib.redirect_stdout(output):
+                        return_code = lchelper.daemon.forward_to_daemon(["run", "project"], "/client", socket_path)
+                    return return_code, output.getvalue()
+
+                self.assertEqual(forward("forwarded"), (3, "['run', 'project'] /client forwarded\n"))
+                # Forwarded variables only apply to the request that carried them.
+                self.assertEqual(forward(None), (3, "['run', 'project'] /client None\n"))
+                self.assertTrue(lchelper.daemon.stop_daemon(socket_path))
+                self.assertEqual(process.wait(timeout=30), 0)
+            finally:
+                if process.poll() is None:
+                    process.kill()
+            self.assertFalse(os.path.exists(socket_path))
+            self.assertIsNone(lchelper.daemon.forward_to_daemon(["run", "project"], "/client", socket_path))
+
+
+class StartupTest(unittest.TestCase):
+    # Import time budget for commands that generate code from cached problems, in microseconds.
+    CACHED_RUN_BUDGET_US = 150000
+
+    def test_cached_run_startup(self):
+        # Import everything that `main.py get` uses when all contests are cached, and measure it with `-X importtime`.
+        code = "import main; lchelper = main.lchelper; [lchelper.create_codegen(lang) for lang in lchelper.LANGUAGES]"
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=os.path.dirname(__file__) or None,
+                              stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True, check=True)
+        modules = []
+        for line in proc.stderr.split("\n"):
+            if line.startswith("import time:") and not line.startswith("import time: self"):
+                _, cumulative, name = line[len("import time:"):].split("|")
+                modules.append((name, int(cumulative)))
+        names = [name.strip() for name, _ in modules]
+        self.assertFalse(any(name.split(".")[0] == "selenium" for name in names))
+        # Top-level imports made after the interpreter started up, i.e. after `site`.
+        user_imports = modules[names.index("site") + 1:]
+        total_us = sum(cumulative for name, cumulative in user_imports if not name.startswith("  "))
+        self.assertLess(total_us, self.CACHED_RUN_BUDGET_US)
+
+
+class MockSiteTest(unittest.TestCase):
+    def test_mock_site(self):
+        problems = lchelper.mock_site.make_mock_problems(2, example_size=3)
+        with lchelper.mock_site.MockLeetCodeSite({"weekly-contest-1": problems}) as site:
+            contest_page = urllib.request.urlopen(site.url + "/contest/weekly-contest-1").read().decode()
+            self.assertIn('<ul class="contest-question-list">', contest_page)
+            self.assertIn('href="/contest/weekly-contest-1/problems/mock-problem-2/">Mock Problem 2</a>', contest_page)
+            self.assertNotIn("ant-dropdown-link", contest_page)  # not logged in without cookies
+            request = urllib.request.Request(site.url + "/contest/weekly-contest-1/problems/mock-problem-1/",
+                                             headers={"Cookie": "LEETCODE_SESSION=mock"})
+            problem_page = urllib.request.urlopen(request).read().decode()
+            self.assertIn("ant-dropdown-link", problem_page)
+            self.assertIn('<div class="question-content">', problem_page)
+            self.assertEqual(problem_page.count('<pre class="CodeMirror-line">'), len(problems[0].code))
+        signature = lchelper.parse_problem(problems[0])
+        self.assertEqual(len(signature.examples), 3)